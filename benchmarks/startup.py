@@ -0,0 +1,95 @@
+"""Cold-start benchmark for the crowe-codex CLI.
+
+Runs each subcommand in a fresh interpreter under ``python -X importtime``
+and compares the time spent importing modules for it (interpreter start-up
+excluded) against a per-subcommand budget. Exits non-zero when any
+subcommand is over budget.
+
+    python benchmarks/startup.py [--runs 5] [--top 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+
+# Milliseconds of imports each subcommand may spend before doing any work.
+BUDGETS_MS = {
+    "--help": 80,
+    "pipeline --help": 80,
+    "security-audit --help": 80,
+    "strategies": 120,
+    "marketplace": 150,
+}
+
+RUNNER = "import sys; from crowe_codex.cli import main; sys.argv[0] = 'crowe-codex'; main()"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level import made after start-up.
+
+    Start-up imports (``site`` and everything before it) are excluded, so
+    the result covers only what the command itself pulled in.
+    """
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if not match or match.group(3):
+            continue
+        name, cumulative = match.group(4), int(match.group(2))
+        if name == "site":
+            times.clear()
+        else:
+            times[name] = cumulative
+    return times
+
+
+def measure(command: str) -> tuple[dict[str, int], float]:
+    """Import times and wall-clock seconds for one cold run of ``command``."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUNNER, *command.split()],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"crowe-codex {command} failed:\n{proc.stderr[-2000:]}")
+    return import_times(proc.stderr), elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold runs per subcommand")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list")
+    args = parser.parse_args()
+
+    over = []
+    print(f"{'subcommand':<24}{'imports':>10}{'budget':>9}{'wall':>9}  heaviest")
+    for command, budget in BUDGETS_MS.items():
+        # Best of several runs: noise only ever adds time.
+        runs = [measure(command) for _ in range(args.runs)]
+        times, _ = min(runs, key=lambda run: sum(run[0].values()))
+        wall = min(elapsed for _, elapsed in runs)
+        total_ms = sum(times.values()) / 1000
+        heaviest = sorted(times, key=times.__getitem__, reverse=True)[: args.top]
+        flag = "" if total_ms <= budget else "  OVER"
+        print(
+            f"{command:<24}{total_ms:>8.1f}ms{budget:>7}ms{wall * 1000:>7.0f}ms  "
+            f"{', '.join(heaviest)}{flag}"
+        )
+        if flag:
+            over.append(command)
+
+    if over:
+        print(f"\nover budget: {', '.join(over)}", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,20 @@
 """crowe-codex: Cross-vendor adversarial AI code verification engine."""
 
+from typing import TYPE_CHECKING
+
+from crowe_codex._lazy import lazy_exports
+
 __version__ = "2.0.0"
 
-from crowe_codex.core.engine import DualEngine
-from crowe_codex.core.result import ConfidenceReport, PipelineResult
+if TYPE_CHECKING:
+    from crowe_codex.core.engine import DualEngine
+    from crowe_codex.core.result import ConfidenceReport, PipelineResult
+
+# Imported on first access, so the CLI starts without loading the engine.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "DualEngine": "crowe_codex.core.engine",
+    "ConfidenceReport": "crowe_codex.core.result",
+    "PipelineResult": "crowe_codex.core.result",
+})
 
 __all__ = ["DualEngine", "ConfidenceReport", "PipelineResult"]
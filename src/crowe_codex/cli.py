@@ -2,16 +2,59 @@
 
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Coroutine, Iterator
+from typing import TYPE_CHECKING, Any, TypedDict
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 from crowe_codex import __version__
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+
+    from crowe_codex.core.agent import Agent
+    from crowe_codex.core.deadline import Deadline
+    from crowe_codex.core.engine import DualEngine
+    from crowe_codex.security.compliance import ComplianceReport
+    from crowe_codex.security.owasp import OWASPReport
+    from crowe_codex.security.threat_model import ThreatModel
+
+
+class _LazyConsole:
+    """The rich Console, built on first use so ``--help`` never imports rich."""
+
+    _console: Console | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+
+def _run(coro: Coroutine[Any, Any, None]) -> None:
+    import asyncio
+
+    asyncio.run(coro)
+
+
+def _panel(*args: Any, **kwargs: Any) -> Panel:
+    from rich.panel import Panel
+
+    return Panel(*args, **kwargs)
+
+
+def _table(*args: Any, **kwargs: Any) -> Table:
+    from rich.table import Table
+
+    return Table(*args, **kwargs)
+
 
 STRATEGY_NAMES = [
     "adversarial",
@@ -26,7 +69,18 @@ STRATEGY_NAMES = [
 
 @click.group()
 @click.version_option(version=__version__, prog_name="crowe-codex")
-def main() -> None:
+@click.option("--no-cache", is_flag=True,
+              help="Bypass the local response cache and stage memoization")
+@click.option("--no-stream", is_flag=True, help="Print only final results, not live tokens")
+@click.option("--deadline", type=float, default=None, metavar="SECONDS",
+              help="Wall-clock budget per run; returns the best partial result when exceeded")
+@click.option("--local", is_flag=True,
+              help="Run in this process even when a `crowe-codex serve` daemon is up")
+@click.option("--resume", default=None, metavar="RUN_ID",
+              help="Resume a failed or timed-out run, replaying its finished stages")
+def main(
+    no_cache: bool, no_stream: bool, deadline: float | None, local: bool, resume: str | None,
+) -> None:
     """crowe-codex: Cross-vendor adversarial AI code verification engine."""
     pass
 
@@ -35,45 +89,51 @@ def main() -> None:
 @click.argument("task")
 @click.option("--rounds", "-r", default=1, help="Number of adversarial rounds")
 @click.option("--target", "-t", default=".", help="Target directory")
-def adversarial(task: str, rounds: int, target: str) -> None:
+@click.option("--exchange", type=click.Choice(["full", "diff"]), default="full",
+              help="Exchange revised code as full text or as unified diffs")
+def adversarial(task: str, rounds: int, target: str, exchange: str) -> None:
     """Run adversarial code synthesis (build/attack/fuzz cycle)."""
-    console.print(Panel(f"[bold]Adversarial Synthesis[/bold]: {task}", style="red"))
+    console.print(_panel(f"[bold]Adversarial Synthesis[/bold]: {task}", style="red"))
     console.print(f"[dim]Rounds: {rounds} | Target: {target}[/dim]")
-    asyncio.run(_run_strategy("adversarial", task, rounds=rounds))
+    _dispatch("adversarial", task, rounds=rounds, code_exchange=exchange)
 
 
 @main.command()
 @click.argument("task")
-def consensus(task: str) -> None:
+@click.option("--threshold", default=0.95, show_default=True,
+              help="Agreement at which Claude's code is kept and the dispatch merge skipped")
+def consensus(task: str, threshold: float) -> None:
     """Run consensus mode (compare Claude vs Codex output)."""
-    console.print(Panel(f"[bold]Consensus Mode[/bold]: {task}", style="blue"))
-    asyncio.run(_run_strategy("consensus", task))
+    console.print(_panel(f"[bold]Consensus Mode[/bold]: {task}", style="blue"))
+    _dispatch("consensus", task, agreement_threshold=threshold)
 
 
 @main.command()
 @click.argument("task")
 @click.option("--iterations", "-i", default=2, help="Number of verify iterations")
-def verify(task: str, iterations: int) -> None:
+@click.option("--exchange", type=click.Choice(["full", "diff"]), default="full",
+              help="Exchange revised code as full text or as unified diffs")
+def verify(task: str, iterations: int, exchange: str) -> None:
     """Run verification loop (code/test cross-verification)."""
-    console.print(Panel(f"[bold]Verification Loop[/bold]: {task}", style="cyan"))
+    console.print(_panel(f"[bold]Verification Loop[/bold]: {task}", style="cyan"))
     console.print(f"[dim]Iterations: {iterations}[/dim]")
-    asyncio.run(_run_strategy("verification_loop", task, iterations=iterations))
+    _dispatch("verification_loop", task, iterations=iterations, code_exchange=exchange)
 
 
 @main.command()
 @click.argument("task")
 def pipeline(task: str) -> None:
     """Run sequential pipeline (architect -> build -> review -> dispatch)."""
-    console.print(Panel(f"[bold]Pipeline Mode[/bold]: {task}", style="magenta"))
-    asyncio.run(_run_strategy("pipeline", task))
+    console.print(_panel(f"[bold]Pipeline Mode[/bold]: {task}", style="magenta"))
+    _dispatch("pipeline", task)
 
 
 @main.command()
 @click.argument("task")
 def mesh(task: str) -> None:
     """Run cognitive mesh (all agents in parallel, merge best parts)."""
-    console.print(Panel(f"[bold]Cognitive Mesh[/bold]: {task}", style="yellow"))
-    asyncio.run(_run_strategy("cognitive_mesh", task))
+    console.print(_panel(f"[bold]Cognitive Mesh[/bold]: {task}", style="yellow"))
+    _dispatch("cognitive_mesh", task)
 
 
 @main.command()
@@ -82,9 +142,9 @@ def mesh(task: str) -> None:
 @click.option("--generations", "-g", default=2, help="Number of generations")
 def evolve(task: str, population: int, generations: int) -> None:
     """Run evolutionary generation (breed best code candidates)."""
-    console.print(Panel(f"[bold]Evolutionary Generation[/bold]: {task}", style="green"))
+    console.print(_panel(f"[bold]Evolutionary Generation[/bold]: {task}", style="green"))
     console.print(f"[dim]Population: {population} | Generations: {generations}[/dim]")
-    asyncio.run(_run_strategy("evolutionary", task, population=population, generations=generations))
+    _dispatch("evolutionary", task, population=population, generations=generations)
 
 
 @main.command()
@@ -93,8 +153,8 @@ def evolve(task: str, population: int, generations: int) -> None:
               type=click.Choice(["trivial", "standard", "security", "performance", "full", "audit"]))
 def auto(task: str, preset: str) -> None:
     """Auto-select the best strategy for the task (adaptive routing)."""
-    console.print(Panel(f"[bold]Auto Mode[/bold] ({preset}): {task}", style="green"))
-    asyncio.run(_run_strategy("adaptive_router", task))
+    console.print(_panel(f"[bold]Auto Mode[/bold] ({preset}): {task}", style="green"))
+    _dispatch("adaptive_router", task)
 
 
 @main.command(name="verify-deps")
@@ -102,9 +162,9 @@ def auto(task: str, preset: str) -> None:
 @click.option("--ecosystem", "-e", default="pypi", help="Package ecosystem (pypi, npm)")
 def verify_deps(deps: tuple[str, ...], ecosystem: str) -> None:
     """Verify supply chain safety of dependencies."""
-    console.print(Panel("[bold]Supply Chain Verification[/bold]", style="yellow"))
+    console.print(_panel("[bold]Supply Chain Verification[/bold]", style="yellow"))
     console.print(f"[dim]Checking {len(deps)} dependencies ({ecosystem})[/dim]")
-    asyncio.run(_run_supply_chain(list(deps), ecosystem))
+    _run(_run_supply_chain(list(deps), ecosystem))
 
 
 @main.command(name="security-audit")
@@ -117,18 +177,20 @@ def security_audit(
     owasp: bool, threats: bool,
 ) -> None:
     """Run a full security audit on code or a file."""
-    console.print(Panel("[bold]Security Audit[/bold]", style="yellow"))
+    if _resume_id() is not None:
+        raise click.UsageError("security-audit does not checkpoint its checks; drop --resume")
+    console.print(_panel("[bold]Security Audit[/bold]", style="yellow"))
     console.print(f"[dim]OWASP: {'ON' if owasp else 'OFF'} | Threats: {'ON' if threats else 'OFF'} | Compliance: {', '.join(compliance) or 'general'}[/dim]")
-    asyncio.run(_run_security_audit(code_or_file, list(compliance), owasp, threats))
+    _run(_run_security_audit(code_or_file, list(compliance), owasp, threats))
 
 
 async def _run_supply_chain(deps: list[str], ecosystem: str) -> None:
     """Run supply chain verification."""
-    from crowe_codex.core.engine import DualEngine
     from crowe_codex.security.supply_chain import SupplyChainVerifier
 
-    engine = DualEngine()
+    engine = _build_engine(stream=False)
     try:
+        await engine.detect()
         verifier = SupplyChainVerifier(engine._agents)
         result = await verifier.verify(deps, ecosystem)
         console.print(f"\n[bold]{result.summary}[/bold]")
@@ -139,6 +201,8 @@ async def _run_supply_chain(deps: list[str], ecosystem: str) -> None:
             console.print(f"\n[red]Slopsquatting suspects: {', '.join(result.slopsquatting_suspects)}[/red]")
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
+    finally:
+        await engine.aclose()
 
 
 async def _run_security_audit(
@@ -147,7 +211,9 @@ async def _run_security_audit(
 ) -> None:
     """Run a comprehensive security audit."""
     from pathlib import Path
-    from crowe_codex.core.engine import DualEngine
+
+    from crowe_codex.core.deadline import Deadline, DeadlineExceeded
+    from crowe_codex.core.usage import record_usage, total_usage
     from crowe_codex.security.attestation import AttestationGenerator
 
     # Read code from file or use as literal
@@ -155,30 +221,26 @@ async def _run_security_audit(
     if Path(code_or_file).exists():
         code = Path(code_or_file).read_text()
 
-    engine = DualEngine()
-    agents = engine._agents
-    owasp_report = None
-    threat_model = None
-    compliance_report = None
+    engine = _build_engine(stream=False)
+    reports: _AuditReports = {}
+    seconds = _deadline_seconds()
 
     try:
-        if run_owasp and agents:
-            from crowe_codex.security.owasp import OWASPScanner
-            scanner = OWASPScanner(agents)
-            owasp_report = await scanner.scan(code)
-            console.print(f"[bold]{owasp_report.summary}[/bold]")
-
-        if run_threats and agents:
-            from crowe_codex.security.threat_model import ThreatModelEngine
-            threat_engine = ThreatModelEngine(agents)
-            threat_model = await threat_engine.analyze(code)
-            console.print(f"[bold]{threat_model.summary}[/bold]")
-
-        if compliance_frameworks and agents:
-            from crowe_codex.security.compliance import ComplianceMapper
-            mapper = ComplianceMapper(agents)
-            compliance_report = await mapper.assess(code, frameworks=compliance_frameworks)
-            console.print(f"[bold]{compliance_report.summary}[/bold]")
+        await engine.detect()
+        agents = engine._agents
+        with record_usage() as usage:
+            try:
+                await _run_audit_checks(
+                    agents, code, compliance_frameworks, run_owasp, run_threats, reports,
+                    Deadline.after(seconds) if seconds is not None else None,
+                )
+            except DeadlineExceeded:
+                console.print(
+                    "[yellow]Deadline exceeded: attesting the checks that finished[/yellow]"
+                )
+        owasp_report = reports.get("owasp")
+        threat_model = reports.get("threats")
+        compliance_report = reports.get("compliance")
 
         gen = AttestationGenerator()
         attestation = gen.generate(
@@ -191,7 +253,7 @@ async def _run_security_audit(
         )
 
         # Print attestation report
-        table = Table(title="Security Attestation", show_lines=True)
+        table = _table(title="Security Attestation", show_lines=True)
         table.add_column("Check", style="cyan", width=25)
         table.add_column("Result", style="green", width=30)
 
@@ -207,15 +269,57 @@ async def _run_security_audit(
 
         console.print(table)
 
+        totals = total_usage(usage)
+        if totals["cache_read_tokens"] or totals["cache_creation_tokens"]:
+            console.print(
+                f"[dim]Prompt cache: {totals['cache_read_tokens']} tokens read, "
+                f"{totals['cache_creation_tokens']} written, "
+                f"{totals['input_tokens']} uncached[/dim]"
+            )
+
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         console.print("[dim]Ensure API keys are configured. Run: crowe-codex --help[/dim]")
+    finally:
+        await engine.aclose()
+
+
+class _AuditReports(TypedDict, total=False):
+    owasp: OWASPReport
+    threats: ThreatModel
+    compliance: ComplianceReport
+
+
+async def _run_audit_checks(
+    agents: dict[str, Agent], code: str, compliance_frameworks: list[str],
+    run_owasp: bool, run_threats: bool, reports: _AuditReports, deadline: Deadline | None,
+) -> None:
+    """Run the selected security checks, storing each report as it completes."""
+    import contextlib
+
+    async with deadline.scope() if deadline else contextlib.nullcontext():
+        if run_owasp and agents:
+            from crowe_codex.security.owasp import OWASPScanner
+            reports["owasp"] = await OWASPScanner(agents).scan(code)
+            console.print(f"[bold]{reports['owasp'].summary}[/bold]")
+
+        if run_threats and agents:
+            from crowe_codex.security.threat_model import ThreatModelEngine
+            reports["threats"] = await ThreatModelEngine(agents).analyze(code)
+            console.print(f"[bold]{reports['threats'].summary}[/bold]")
+
+        if compliance_frameworks and agents:
+            from crowe_codex.security.compliance import ComplianceMapper
+            reports["compliance"] = await ComplianceMapper(agents).assess(
+                code, frameworks=compliance_frameworks
+            )
+            console.print(f"[bold]{reports['compliance'].summary}[/bold]")
 
 
 @main.command()
 def strategies() -> None:
     """List all available strategies."""
-    table = Table(title="Available Strategies", show_lines=True)
+    table = _table(title="Available Strategies", show_lines=True)
     table.add_column("Strategy", style="cyan")
     table.add_column("Description", style="white")
     table.add_column("CLI Command", style="green")
@@ -245,7 +349,7 @@ def marketplace(query: str, tag: tuple[str, ...]) -> None:
     mp = StrategyMarketplace()
     results = mp.browse(query=query, tags=list(tag) if tag else None)
 
-    table = Table(title="Strategy Marketplace", show_lines=True)
+    table = _table(title="Strategy Marketplace", show_lines=True)
     table.add_column("Name", style="cyan", width=20)
     table.add_column("Description", style="white", width=45)
     table.add_column("Author", style="green", width=15)
@@ -268,9 +372,9 @@ def dashboard(team: str) -> None:
     store = DashboardStore(team_id=team)
     summary = store.get_summary()
 
-    console.print(Panel(f"[bold]Team Dashboard[/bold]: {team}", style="blue"))
+    console.print(_panel(f"[bold]Team Dashboard[/bold]: {team}", style="blue"))
 
-    table = Table(show_lines=True)
+    table = _table(show_lines=True)
     table.add_column("Metric", style="cyan", width=25)
     table.add_column("Value", style="green", width=20)
 
@@ -283,7 +387,7 @@ def dashboard(team: str) -> None:
     console.print(table)
 
     if summary["projects"]:
-        proj_table = Table(title="Projects", show_lines=True)
+        proj_table = _table(title="Projects", show_lines=True)
         proj_table.add_column("Project", style="cyan")
         proj_table.add_column("Latest Score", style="green")
         proj_table.add_column("Trend", style="yellow")
@@ -296,67 +400,147 @@ def dashboard(team: str) -> None:
         console.print(proj_table)
 
 
+@main.command()
+@click.option("--socket", "socket_file", default=None, metavar="PATH",
+              help="Unix socket to listen on (default: $CROWE_CODEX_SOCKET or ~/.crowe-codex/serve.sock)")
+def serve(socket_file: str | None) -> None:
+    """Keep a warm engine running; other commands forward to it."""
+    from pathlib import Path
+
+    from crowe_codex.server import CodexServer
+
+    server = CodexServer(path=Path(socket_file) if socket_file else None)
+    console.print(f"[dim]Serving on {server.path} (Ctrl-C to stop)[/dim]")
+    try:
+        _run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+class _TokenPrinter:
+    """Render streamed tokens live, labelling each switch between agents."""
+
+    def __init__(self) -> None:
+        self._current: str | None = None
+
+    def __call__(self, agent: str, chunk: str) -> None:
+        if agent != self._current:
+            console.print(f"\n[dim]── {agent} ──[/dim]")
+            self._current = agent
+        console.print(chunk, end="", markup=False, highlight=False, soft_wrap=True)
+
+
+def _build_engine(stream: bool = True) -> DualEngine:
+    """Build the engine for a CLI command, honouring the global flags."""
+    from crowe_codex.core.cache import ResponseCache
+    from crowe_codex.core.checkpoint import CheckpointStore
+    from crowe_codex.core.engine import DualEngine
+
+    ctx = click.get_current_context(silent=True)
+    params = ctx.find_root().params if ctx else {}
+    return DualEngine(
+        cache=None if params.get("no_cache") else ResponseCache(),
+        on_token=_TokenPrinter() if stream and not params.get("no_stream") else None,
+        checkpoints=CheckpointStore(),
+    )
+
+
+def _deadline_seconds() -> float | None:
+    """The global --deadline flag, if given."""
+    ctx = click.get_current_context(silent=True)
+    return ctx.find_root().params.get("deadline") if ctx else None
+
+
+def _resume_id() -> str | None:
+    """The global --resume flag, if given."""
+    ctx = click.get_current_context(silent=True)
+    return ctx.find_root().params.get("resume") if ctx else None
+
+
+def _print_resume_hint(run_id: object) -> None:
+    if run_id:
+        console.print(f"[dim]Finished stages are saved; resume with --resume {run_id}[/dim]")
+
+
+def _dispatch(strategy_name: str, task: str, **kwargs: Any) -> None:
+    """Run a strategy on the `serve` daemon when one is up, else in-process.
+
+    --no-cache runs always stay local: the daemon's cache is shared.
+    """
+    ctx = click.get_current_context(silent=True)
+    params = ctx.find_root().params if ctx else {}
+    if not params.get("local") and not params.get("no_cache"):
+        from crowe_codex.client import ServerClient, ServerUnavailable
+
+        stream = not params.get("no_stream")
+        events = ServerClient().run(
+            strategy_name, task, kwargs, deadline=params.get("deadline"), stream=stream,
+            resume=params.get("resume"),
+        )
+        try:
+            _print_events(events, stream)
+            return
+        except ServerUnavailable:
+            pass
+    _run(_run_strategy(strategy_name, task, **kwargs))
+
+
+def _print_events(events: Iterator[dict[str, Any]], stream: bool = True) -> None:
+    """Render a daemon run's event stream like an in-process run."""
+    from types import SimpleNamespace
+
+    tokens = _TokenPrinter()
+    for event in events:
+        kind = event.get("event")
+        if kind == "token":
+            tokens(event["agent"], event["chunk"])
+        elif kind == "stage" and stream:
+            console.print(
+                f"\n[dim]✓ {event['name']} ({event['agent']}, {event['seconds']:.1f}s)[/dim]"
+            )
+        elif kind == "error":
+            console.print(f"[red]Error: {event['error']}[/red]")
+            _print_resume_hint(event.get("run_id"))
+            console.print("[dim]Ensure API keys are configured for the serve daemon.[/dim]")
+        elif kind == "result":
+            data = event["result"]
+            result = SimpleNamespace(**{
+                **data, "confidence": SimpleNamespace(**data["confidence"]),
+            })
+            if data["metadata"].get("deadline_exceeded"):
+                console.print("\n[yellow]Deadline exceeded: showing partial results[/yellow]")
+            _print_result(result)
+            _print_resume_hint(data["metadata"].get("run_id"))
+
+
 async def _run_strategy(strategy_name: str, task: str, **kwargs) -> None:
     """Run a named strategy through the engine."""
-    from crowe_codex.core.engine import DualEngine
+    from crowe_codex.strategies.registry import build_strategy
 
-    engine = DualEngine()
-    strategy = _build_strategy(strategy_name, **kwargs)
+    engine = _build_engine()
+    strategy = build_strategy(strategy_name, **kwargs)
 
     try:
-        result = await engine.run(strategy, task=task)
+        result = await engine.run(
+            strategy, task=task, deadline=_deadline_seconds(), resume=_resume_id(),
+        )
+        if result.metadata.get("deadline_exceeded"):
+            console.print("\n[yellow]Deadline exceeded: showing partial results[/yellow]")
         _print_result(result)
+        _print_resume_hint(result.metadata.get("run_id"))
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
-        console.print("[dim]Ensure API keys are configured. Run: crowe-codex --help[/dim]")
-
+        from crowe_codex.core.checkpoint import checkpointed_run
 
-def _build_strategy(name: str, **kwargs):
-    """Instantiate a strategy by name."""
-    if name == "adversarial":
-        from crowe_codex.strategies.adversarial import Adversarial
-        return Adversarial(rounds=kwargs.get("rounds", 1))
-    elif name == "verification_loop":
-        from crowe_codex.strategies.verification import VerificationLoop
-        return VerificationLoop(iterations=kwargs.get("iterations", 2))
-    elif name == "pipeline":
-        from crowe_codex.strategies.pipeline_strategy import Pipeline
-        return Pipeline()
-    elif name == "cognitive_mesh":
-        from crowe_codex.strategies.mesh import CognitiveMesh
-        return CognitiveMesh()
-    elif name == "evolutionary":
-        from crowe_codex.strategies.evolutionary import Evolutionary
-        return Evolutionary(
-            population=kwargs.get("population", 3),
-            generations=kwargs.get("generations", 2),
-        )
-    elif name == "adaptive_router":
-        from crowe_codex.strategies.router import AdaptiveRouter
-        from crowe_codex.strategies.adversarial import Adversarial
-        from crowe_codex.strategies.consensus import Consensus
-        from crowe_codex.strategies.verification import VerificationLoop
-        from crowe_codex.strategies.mesh import CognitiveMesh
-        from crowe_codex.strategies.evolutionary import Evolutionary
-        from crowe_codex.strategies.pipeline_strategy import Pipeline
-
-        router = AdaptiveRouter(strategies={
-            "adversarial": Adversarial(),
-            "consensus": Consensus(),
-            "verification_loop": VerificationLoop(),
-            "pipeline": Pipeline(),
-            "cognitive_mesh": CognitiveMesh(),
-            "evolutionary": Evolutionary(),
-        })
-        return router
-    else:
-        from crowe_codex.strategies.consensus import Consensus
-        return Consensus()
+        _print_resume_hint(checkpointed_run(e))
+        console.print("[dim]Ensure API keys are configured. Run: crowe-codex --help[/dim]")
+    finally:
+        await engine.aclose()
 
 
 def _print_result(result) -> None:
     """Pretty-print a pipeline result."""
-    table = Table(title="crowe-codex Confidence Report", show_lines=True)
+    table = _table(title="crowe-codex Confidence Report", show_lines=True)
     table.add_column("Check", style="cyan", width=25)
     table.add_column("Status", style="green", width=15)
 
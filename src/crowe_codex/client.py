@@ -0,0 +1,91 @@
+"""Thin client for a running ``crowe-codex serve`` daemon.
+
+Stdlib only, so forwarding a command costs a socket round-trip rather than
+importing the engine, SDKs and asyncio.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+SOCKET_ENV = "CROWE_CODEX_SOCKET"
+
+
+def socket_path() -> Path:
+    """Where the daemon listens: $CROWE_CODEX_SOCKET, else ~/.crowe-codex/serve.sock."""
+    override = os.environ.get(SOCKET_ENV)
+    return Path(override) if override else Path.home() / ".crowe-codex" / "serve.sock"
+
+
+class ServerUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+class ServerClient:
+    """Sends one request per connection and reads back its event stream.
+
+    The protocol is newline-delimited JSON: the client writes a request
+    object, the server answers with event objects until a ``result`` or
+    ``error`` event, then closes the connection.
+    """
+
+    def __init__(self, path: Path | None = None, timeout: float | None = None) -> None:
+        self.path = path or socket_path()
+        self.timeout = timeout
+
+    def request(self, payload: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Yield the server's events for ``payload``.
+
+        Raises ServerUnavailable if nothing is listening, before any event.
+        """
+        sock = self._connect()
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode() + b"\n")
+            stream.flush()
+            for line in stream:
+                yield json.loads(line)
+
+    def ping(self) -> dict[str, Any] | None:
+        """The daemon's status, or None when none is running."""
+        try:
+            return next(self.request({"op": "ping"}), None)
+        except ServerUnavailable:
+            return None
+
+    def run(
+        self,
+        strategy: str,
+        task: str,
+        options: dict[str, Any] | None = None,
+        deadline: float | None = None,
+        stream: bool = True,
+        resume: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Run a named strategy on the daemon, yielding stage and token events."""
+        return self.request({
+            "op": "run",
+            "strategy": strategy,
+            "task": task,
+            "options": options or {},
+            "deadline": deadline,
+            "stream": stream,
+            "resume": resume,
+        })
+
+    def _connect(self) -> socket.socket:
+        if not hasattr(socket, "AF_UNIX") or not self.path.exists():
+            raise ServerUnavailable(str(self.path))
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.path))
+        except OSError as e:
+            sock.close()
+            # A socket file left behind by a daemon that died.
+            raise ServerUnavailable(str(self.path)) from e
+        return sock
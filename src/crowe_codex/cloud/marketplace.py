@@ -5,9 +5,12 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from crowe_codex.strategies.base import Strategy
-from crowe_codex.plugins.loader import PluginLoader, PluginRegistry
+if TYPE_CHECKING:
+    # Browsing listings needs neither; keeps `crowe-codex marketplace` light.
+    from crowe_codex.plugins.loader import PluginRegistry
+    from crowe_codex.strategies.base import Strategy
 
 
 @dataclass
@@ -223,6 +226,8 @@ class StrategyMarketplace:
 
     def install_from_registry(self, registry: PluginRegistry) -> int:
         """Register all marketplace strategies that are installed locally."""
+        from crowe_codex.plugins.loader import PluginLoader
+
         loader = PluginLoader()
         plugins = loader.discover()
         count = 0
@@ -2,10 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from crowe_codex.core.transport import TransportManager
+
+
+_current_task: ContextVar[str | None] = ContextVar("task", default=None)
+
+
+@contextmanager
+def task_scope(task: str) -> Iterator[None]:
+    """Make ``task`` visible to agents called inside the block (see current_task)."""
+    token = _current_task.set(task)
+    try:
+        yield
+    finally:
+        _current_task.reset(token)
+
+
+def current_task() -> str | None:
+    """The task of the pipeline run in progress, if any."""
+    return _current_task.get()
+
 
 class AgentConfig(BaseModel):
     """Configuration for an agent."""
@@ -22,17 +48,115 @@ class Agent(ABC):
 
     def __init__(self, config: AgentConfig) -> None:
         self.config = config
+        self.transport: TransportManager | None = None
 
     @abstractmethod
     async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
         """Execute a prompt and return the response."""
         ...
 
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        """Execute a prompt and yield the response incrementally.
+
+        Adapters with a streaming backend override this; the default yields
+        the whole completion as a single chunk.
+        """
+        yield await self.execute(prompt, context)
+
+    async def execute_many(
+        self, prompts: list[str], context: dict[str, object] | None = None
+    ) -> list[str]:
+        """Execute independent prompts and return the responses in order.
+
+        Adapters with a provider batch API override this (see
+        ``supports_batches``); the default runs the prompts concurrently.
+        """
+        return list(await asyncio.gather(*(self.execute(p, context) for p in prompts)))
+
+    def supports_batches(self) -> bool:
+        """Whether ``execute_many`` submits through a provider batch API."""
+        return False
+
     @abstractmethod
     async def is_available(self) -> bool:
         """Check if this agent is currently available."""
         ...
 
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        """Return the parameters that determine this agent's output for a prompt."""
+        return {"provider": self.config.provider, "model": self.config.model}
+
+    def prepare(self, task: str) -> None:
+        """Called when a run's task is known, before any stage executes.
+
+        Adapters may start warming up for the task in the background; the
+        default does nothing.
+        """
+
+    def is_cacheable(self, response: str) -> bool:
+        """Whether a response is a real completion that may be reused."""
+        return True
+
+    def bind_transport(self, transport: TransportManager) -> None:
+        """Route this agent's HTTP traffic through a shared connection pool.
+
+        Takes effect when the agent next builds its client.
+        """
+        self.transport = transport
+
+
+class AgentWrapper(Agent):
+    """Base for middleware that wraps another agent and forwards to it."""
+
+    def __init__(self, inner: Agent) -> None:
+        super().__init__(inner.config)
+        self.inner = inner
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        return await self.inner.execute(prompt, context)
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self.inner.execute_stream(prompt, context):
+            yield chunk
+
+    async def execute_many(
+        self, prompts: list[str], context: dict[str, object] | None = None
+    ) -> list[str]:
+        # Batches go to the provider as one submission; anything else fans
+        # out through this wrapper's own execute.
+        if self.inner.supports_batches():
+            return await self.inner.execute_many(prompts, context)
+        return await super().execute_many(prompts, context)
+
+    def supports_batches(self) -> bool:
+        return self.inner.supports_batches()
+
+    async def is_available(self) -> bool:
+        return await self.inner.is_available()
+
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        return self.inner.fingerprint(context)
+
+    def prepare(self, task: str) -> None:
+        self.inner.prepare(task)
+
+    def is_cacheable(self, response: str) -> bool:
+        return self.inner.is_cacheable(response)
+
+    def bind_transport(self, transport: TransportManager) -> None:
+        self.inner.bind_transport(transport)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not found on the wrapper itself, so
+        # adapter helpers like build_architect_prompt stay reachable.
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
 
 class AgentRegistry:
     """Registry of available agents."""
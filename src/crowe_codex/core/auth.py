@@ -4,15 +4,23 @@ from __future__ import annotations
 
 import os
 import shutil
+from typing import TYPE_CHECKING
 
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from crowe_codex.core.health import HealthMonitor
+
 ENV_KEYS = {
     "anthropic": "ANTHROPIC_API_KEY",
     "openai": "OPENAI_API_KEY",
     "nvidia": "NVIDIA_API_KEY",
 }
 
+# Comma-separated Ollama hosts to pool; OLLAMA_HOST names a single one.
+OLLAMA_HOSTS_ENV = "OLLAMA_HOSTS"
+OLLAMA_HOST_ENV = "OLLAMA_HOST"
+
 
 class ProviderAuth(BaseModel):
     """Authentication state for a single provider."""
@@ -21,11 +29,18 @@ class ProviderAuth(BaseModel):
     api_key: str = ""
     method: str = "none"
     available: bool = False
+    hosts: list[str] = []
 
     @classmethod
     def from_env(cls, provider: str) -> ProviderAuth:
         if provider == "ollama":
-            return cls(provider="ollama", method="local", available=True)
+            hosts = os.environ.get(OLLAMA_HOSTS_ENV) or os.environ.get(OLLAMA_HOST_ENV, "")
+            return cls(
+                provider="ollama",
+                method="local",
+                available=True,
+                hosts=[h.strip() for h in hosts.split(",") if h.strip()],
+            )
 
         env_key = ENV_KEYS.get(provider, "")
         api_key = os.environ.get(env_key, "")
@@ -53,21 +68,31 @@ class AuthStatus(BaseModel):
 
 
 class AuthManager:
-    """Manages authentication across all providers."""
+    """Manages authentication across all providers.
 
-    def __init__(self) -> None:
+    With a HealthMonitor, a provider whose agents are all failing their
+    probes or calls is reported unavailable even if it has credentials.
+    """
+
+    def __init__(self, health: HealthMonitor | None = None) -> None:
         self._providers: dict[str, ProviderAuth] = {}
         for provider in ["anthropic", "openai", "ollama", "nvidia"]:
             self._providers[provider] = ProviderAuth.from_env(provider)
+        self.health = health
 
     def get(self, provider: str) -> ProviderAuth:
         return self._providers.get(provider, ProviderAuth(provider=provider))
 
+    def _available(self, provider: str) -> bool:
+        if not self._providers[provider].available:
+            return False
+        return self.health is None or self.health.provider_healthy(provider) is not False
+
     def status(self) -> AuthStatus:
-        anthropic = self._providers["anthropic"].available
-        openai = self._providers["openai"].available
-        ollama = self._providers["ollama"].available
-        nvidia = self._providers["nvidia"].available
+        anthropic = self._available("anthropic")
+        openai = self._available("openai")
+        ollama = self._available("ollama")
+        nvidia = self._available("nvidia")
 
         stages: list[int] = []
         if anthropic:
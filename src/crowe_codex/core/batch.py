@@ -0,0 +1,192 @@
+"""Bulk execution through provider message-batch APIs, resumable across crashes."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_BATCH_DIR = Path.home() / ".crowe-codex" / "batches"
+
+
+@dataclass
+class BatchPolicy:
+    """How often to poll a submitted batch.
+
+    The first check waits ``poll_initial`` seconds; each later wait grows
+    by ``backoff`` up to ``poll_max``. Batches can take hours, so the
+    defaults favour few requests over prompt pickup.
+    """
+
+    poll_initial: float = 5.0
+    poll_max: float = 300.0
+    backoff: float = 2.0
+
+    def delays(self) -> Callable[[], float]:
+        delay = self.poll_initial
+
+        def next_delay() -> float:
+            nonlocal delay
+            current = delay
+            delay = min(delay * self.backoff, self.poll_max)
+            return current
+
+        return next_delay
+
+
+class BatchItemFailure(str):
+    """The provider's reason a single batch request produced no completion."""
+
+
+class BatchError(Exception):
+    """Some requests in a batch failed.
+
+    ``results`` holds every completion in prompt order (None where the
+    request failed) and ``failures`` maps prompt index to reason, so
+    callers can keep what succeeded.
+    """
+
+    def __init__(self, batch_id: str, results: list[str | None], failures: dict[int, str]) -> None:
+        super().__init__(
+            f"Batch {batch_id}: {len(failures)} of {len(results)} requests failed"
+        )
+        self.batch_id = batch_id
+        self.results = results
+        self.failures = failures
+
+
+class BatchStore:
+    """Batch IDs of submitted jobs, persisted so a crashed run can resume.
+
+    Jobs are content-addressed on the agent fingerprint and the prompts, so
+    rerunning the same job finds the batch it already submitted instead of
+    paying for a second one. Pass ``persist=False`` to keep IDs in memory.
+    """
+
+    def __init__(self, directory: Path | None = None, persist: bool = True) -> None:
+        self._directory = (directory or DEFAULT_BATCH_DIR) if persist else None
+        self._memory: dict[str, dict[str, object]] = {}
+
+    @staticmethod
+    def job_key(fingerprint: dict[str, object], prompts: list[str]) -> str:
+        payload = json.dumps(
+            {
+                "fingerprint": fingerprint,
+                "prompts": [hashlib.sha256(p.encode()).hexdigest() for p in prompts],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        record = self._memory.get(key) or self._read_file(key)
+        return str(record["batch_id"]) if record else None
+
+    def put(self, key: str, provider: str, batch_id: str, count: int) -> None:
+        record = {
+            "provider": provider,
+            "batch_id": batch_id,
+            "requests": count,
+            "submitted": time.time(),
+        }
+        self._memory[key] = record
+        if self._directory is None:
+            return
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(".tmp")
+            tmp.write_text(json.dumps(record))
+            tmp.replace(self._path(key))
+        except OSError:
+            return
+
+    def delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        if self._directory is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def pending(self) -> list[dict[str, object]]:
+        """Every batch submitted but not yet collected."""
+        records = dict(self._memory)
+        if self._directory is not None and self._directory.exists():
+            for path in self._directory.glob("*.json"):
+                record = self._read_file(path.stem)
+                if record:
+                    records.setdefault(path.stem, record)
+        return list(records.values())
+
+    def _path(self, key: str) -> Path:
+        assert self._directory is not None
+        return self._directory / f"{key}.json"
+
+    def _read_file(self, key: str) -> dict[str, object] | None:
+        if self._directory is None:
+            return None
+        try:
+            record = json.loads(self._path(key).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return record if isinstance(record, dict) and "batch_id" in record else None
+
+
+class BatchRunner:
+    """Submits a batch (or resumes a stored one), polls it and demultiplexes.
+
+    Adapters supply the three provider calls: ``submit`` takes
+    ``{custom_id: prompt}`` and returns a batch ID, ``ended`` reports whether
+    the batch has finished, and ``results`` returns ``{custom_id:
+    completion}`` with a BatchItemFailure for requests that failed.
+    """
+
+    def __init__(self, store: BatchStore | None = None, policy: BatchPolicy | None = None) -> None:
+        self.store = store or BatchStore()
+        self.policy = policy or BatchPolicy()
+
+    async def run(
+        self,
+        provider: str,
+        fingerprint: dict[str, object],
+        prompts: list[str],
+        submit: Callable[[dict[str, str]], Awaitable[str]],
+        ended: Callable[[str], Awaitable[bool]],
+        results: Callable[[str, dict[str, str]], Awaitable[dict[str, str]]],
+    ) -> list[str]:
+        if not prompts:
+            return []
+        requests = {f"req-{i}": prompt for i, prompt in enumerate(prompts)}
+        key = self.store.job_key(fingerprint, prompts)
+
+        batch_id = self.store.get(key)
+        if batch_id is None:
+            batch_id = await submit(requests)
+            self.store.put(key, provider, batch_id, len(requests))
+
+        next_delay = self.policy.delays()
+        while not await ended(batch_id):
+            await asyncio.sleep(next_delay())
+
+        completions = await results(batch_id, requests)
+        self.store.delete(key)
+        return _demultiplex(batch_id, requests, completions)
+
+
+def _demultiplex(
+    batch_id: str, requests: dict[str, str], completions: dict[str, str]
+) -> list[str]:
+    ordered: list[str | None] = []
+    failures: dict[int, str] = {}
+    for index, custom_id in enumerate(requests):
+        completion = completions.get(custom_id)
+        if completion is None or isinstance(completion, BatchItemFailure):
+            failures[index] = str(completion or "no result returned")
+            ordered.append(None)
+        else:
+            ordered.append(completion)
+    if failures:
+        raise BatchError(batch_id, ordered, failures)
+    return [c for c in ordered if c is not None]
@@ -0,0 +1,287 @@
+"""Local token estimation and prompt budgeting before anything is sent."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, replace
+from typing import Self
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+from crowe_codex.core.usage import TokenUsage, record_usage
+
+# Starting characters-per-token ratios, refined from billed usage at runtime.
+CHARS_PER_TOKEN: dict[str, float] = {
+    "anthropic": 3.5,
+    "openai": 4.0,
+    "ollama": 3.7,
+    "nvidia": 4.0,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Input context windows in tokens. Keys are providers or "provider/model".
+CONTEXT_WINDOWS: dict[str, int] = {
+    "anthropic": 200_000,
+    "openai": 128_000,
+    "ollama": 8_192,
+    "nvidia": 32_768,
+}
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+# Headroom for estimation error, as a fraction of the window.
+SAFETY_MARGIN = 0.05
+
+KEEP, TRIM, SUMMARIZE, DROP = "keep", "trim", "summarize", "drop"
+
+# Room left for the "[N lines trimmed]" marker when cutting a section.
+TRIM_MARKER_CHARS = 48
+
+_SUMMARY_LINE = re.compile(
+    r"^\s*(?:async\s+def |def |class |import |from \S+ import |#+ |[-*•] |\d+[.)] |@\w)"
+    r"|critical|high|severity|vulnerab|error|fail",
+    re.IGNORECASE,
+)
+
+
+class PromptTooLong(Exception):
+    """A prompt cannot be brought under the provider's budget locally."""
+
+    def __init__(self, provider: str, tokens: int, budget: int) -> None:
+        super().__init__(
+            f"Prompt for '{provider}' needs ~{tokens} tokens, budget is {budget}"
+        )
+        self.provider = provider
+        self.tokens = tokens
+        self.budget = budget
+
+
+class TokenEstimator:
+    """Fast character-ratio token estimate, calibrated per provider.
+
+    Each provider starts from CHARS_PER_TOKEN; ``observe`` folds in the
+    input token counts providers bill, so estimates converge on the real
+    tokenizer without shipping one.
+    """
+
+    def __init__(
+        self,
+        ratios: dict[str, float] | None = None,
+        smoothing: float = 0.2,
+    ) -> None:
+        self._ratios = dict(CHARS_PER_TOKEN if ratios is None else ratios)
+        self.smoothing = smoothing
+
+    def ratio(self, provider: str) -> float:
+        return self._ratios.get(provider, DEFAULT_CHARS_PER_TOKEN)
+
+    def estimate(self, text: str, provider: str = "") -> int:
+        return math.ceil(len(text) / self.ratio(provider))
+
+    def observe(self, provider: str, chars: int, tokens: int) -> None:
+        """Fold one billed (chars, tokens) sample into the provider's ratio."""
+        if chars <= 0 or tokens <= 0:
+            return
+        sample = chars / tokens
+        current = self.ratio(provider)
+        self._ratios[provider] = current + self.smoothing * (sample - current)
+
+
+@dataclass
+class Section:
+    """One part of a prompt and what the budgeter may do to it.
+
+    Lower ``priority`` sections are reduced first, larger ones first among
+    equals. ``policy`` is KEEP (never touched), TRIM (cut from the middle),
+    SUMMARIZE (keep signature/finding lines, then trim) or DROP (removed
+    whole). ``cache`` marks the end of a stable prefix that providers may
+    cache between calls.
+    """
+
+    text: str
+    priority: int = 0
+    policy: str = TRIM
+    label: str = ""
+    cache: bool = False
+
+
+class Prompt(str):
+    """A prompt string that remembers the sections it was built from.
+
+    Behaves as the joined text everywhere (cache keys, logging, adapters);
+    only the budgeter and prompt-caching adapters look at ``sections``.
+    Plain strings become KEEP sections.
+    """
+
+    sections: tuple[Section, ...]
+
+    def split_cached(self) -> tuple[str, str]:
+        """(prefix, suffix) split after the last ``cache`` section."""
+        marks = [i for i, s in enumerate(self.sections) if s.cache]
+        if not marks:
+            return "", str(self)
+        cut = marks[-1] + 1
+        return (
+            "".join(s.text for s in self.sections[:cut]),
+            "".join(s.text for s in self.sections[cut:]),
+        )
+
+    def __new__(cls, *parts: Section | str) -> Self:
+        sections = tuple(
+            p if isinstance(p, Section) else Section(p, policy=KEEP) for p in parts
+        )
+        prompt = super().__new__(cls, "".join(s.text for s in sections))
+        prompt.sections = sections
+        return prompt
+
+
+class PromptBudgeter:
+    """Brings prompts under a provider's input budget before they are sent."""
+
+    def __init__(
+        self,
+        estimator: TokenEstimator | None = None,
+        windows: dict[str, int] | None = None,
+    ) -> None:
+        self.estimator = estimator or TokenEstimator()
+        self.windows = dict(CONTEXT_WINDOWS if windows is None else windows)
+
+    def budget_for(self, provider: str, model: str = "", max_output: int = 0) -> int:
+        window = self.windows.get(f"{provider}/{model}") or self.windows.get(
+            provider, DEFAULT_CONTEXT_WINDOW
+        )
+        return int(window * (1 - SAFETY_MARGIN)) - max_output
+
+    def fit(self, prompt: str, provider: str, model: str = "", max_output: int = 0) -> str:
+        """Return ``prompt`` unchanged if it fits, else a reduced version.
+
+        Raises PromptTooLong when even the reduced prompt is over budget.
+        """
+        budget = self.budget_for(provider, model, max_output)
+        if self.estimator.estimate(prompt, provider) <= budget:
+            return prompt
+
+        if isinstance(prompt, Prompt):
+            sections = list(prompt.sections)
+        else:
+            sections = [Section(prompt, policy=TRIM)]
+        order = sorted(
+            (i for i, s in enumerate(sections) if s.policy != KEEP),
+            key=lambda i: (sections[i].priority, -len(sections[i].text)),
+        )
+        for i in order:
+            excess = self._tokens(sections, provider) - budget
+            if excess <= 0:
+                break
+            sections[i] = self._reduce(sections[i], excess, provider)
+
+        tokens = self._tokens(sections, provider)
+        if tokens > budget:
+            raise PromptTooLong(provider, tokens, budget)
+        return Prompt(*sections)
+
+    def _tokens(self, sections: list[Section], provider: str) -> int:
+        return self.estimator.estimate("".join(s.text for s in sections), provider)
+
+    def _reduce(self, section: Section, excess: int, provider: str) -> Section:
+        text = section.text
+        if section.policy == DROP:
+            text = _marker(section, "omitted")
+        else:
+            if section.policy == SUMMARIZE:
+                text = summarize(text)
+            over = self.estimator.estimate(text, provider) - (
+                self.estimator.estimate(section.text, provider) - excess
+            )
+            if over > 0:
+                cut = math.ceil(over * self.estimator.ratio(provider)) + TRIM_MARKER_CHARS
+                keep = len(text) - cut
+                text = trim(text, keep) if keep > 0 else _marker(section, "omitted")
+        return replace(section, text=text, policy=KEEP)
+
+
+def summarize(text: str) -> str:
+    """Extractive summary: keep signatures, headings, list items and findings.
+
+    The first line is always kept, so section headers survive.
+    """
+    lines = text.splitlines()
+    if len(lines) < 2:
+        return text
+    kept = [line for line in lines[1:] if _SUMMARY_LINE.search(line)]
+    if len(kept) == len(lines) - 1:
+        return text
+    note = f"[summarized: kept {len(kept)} of {len(lines) - 1} lines]"
+    return "\n".join([lines[0], note, *kept]) + "\n"
+
+
+def trim(text: str, keep_chars: int) -> str:
+    """Cut from the middle at line boundaries, keeping the head and tail."""
+    if len(text) <= keep_chars:
+        return text
+    head = text[: keep_chars * 2 // 3]
+    tail = text[len(text) - keep_chars // 3:]
+    head = head[: head.rfind("\n") + 1] or head
+    tail = tail[tail.find("\n") + 1:] if "\n" in tail else tail
+    removed = text.count("\n") - head.count("\n") - tail.count("\n")
+    return f"{head}... [{max(removed, 0)} lines trimmed] ...\n{tail}"
+
+
+def _marker(section: Section, what: str) -> str:
+    return f"[{section.label or 'section'} {what} to fit the context window]\n"
+
+
+class BudgetedAgent(AgentWrapper):
+    """Fits every prompt to the agent's context window before it is sent.
+
+    Billed input usage from non-streamed calls recalibrates the estimator.
+    """
+
+    def __init__(self, inner: Agent, budgeter: PromptBudgeter) -> None:
+        super().__init__(inner)
+        self.budgeter = budgeter
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        prompt = self._fit(prompt, context)
+        with record_usage() as usage:
+            response = await self.inner.execute(prompt, context)
+        self._calibrate(usage)
+        return response
+
+    async def execute_many(
+        self, prompts: list[str], context: dict[str, object] | None = None
+    ) -> list[str]:
+        if not self.inner.supports_batches():
+            return await super().execute_many(prompts, context)
+        fitted = [self._fit(p, context) for p in prompts]
+        with record_usage() as usage:
+            responses = await self.inner.execute_many(fitted, context)
+        self._calibrate(usage)
+        return responses
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        chunks = aiter(self.inner.execute_stream(self._fit(prompt, context), context))
+        while True:
+            # Record around each step only: a collector must not stay set across a yield.
+            with record_usage() as usage:
+                chunk = await anext(chunks, None)
+            self._calibrate(usage)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _fit(self, prompt: str, context: dict[str, object] | None) -> str:
+        fingerprint = self.inner.fingerprint(context)
+        max_tokens = fingerprint.get("max_tokens")
+        return self.budgeter.fit(
+            prompt,
+            self.config.provider,
+            model=str(fingerprint.get("model", "")),
+            max_output=max_tokens if isinstance(max_tokens, int) else 0,
+        )
+
+    def _calibrate(self, usage: list[TokenUsage]) -> None:
+        for u in usage:
+            self.budgeter.estimator.observe(u.provider, u.prompt_chars, u.prompt_tokens)
@@ -0,0 +1,312 @@
+"""Two-tier response cache: in-memory LRU in front of a content-addressed disk store."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+from crowe_codex.core.batch import BatchError
+
+DEFAULT_CACHE_DIR = Path.home() / ".crowe-codex" / "cache"
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 7 * 24 * 3600.0
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss and eviction counters for a response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    memory_entries: int = 0
+    disk_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return self.hits / lookups
+
+
+def cache_key(fingerprint: dict[str, object], prompt: str) -> str:
+    """Content address for a completion: agent fingerprint plus prompt hash."""
+    payload = json.dumps(
+        {
+            "fingerprint": fingerprint,
+            "prompt": hashlib.sha256(prompt.encode()).hexdigest(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def stage_key(
+    version: str,
+    node: str,
+    fingerprint: dict[str, object],
+    material: str,
+    inputs: dict[str, str],
+) -> str:
+    """Content address for a stage graph node's output.
+
+    ``material`` is the node's rendered prompt (or, for nodes that run
+    their own calls, the key they declare); upstream outputs are hashed in
+    by name, so a changed stage re-addresses everything downstream of it.
+    """
+    payload = json.dumps(
+        {
+            "stage": node,
+            "version": version,
+            "fingerprint": fingerprint,
+            "material": hashlib.sha256(material.encode()).hexdigest(),
+            "inputs": {
+                name: hashlib.sha256(output.encode()).hexdigest()
+                for name, output in sorted(inputs.items())
+            },
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU in memory, backed by a size-capped store on disk.
+
+    Entries older than ``ttl`` seconds are treated as misses and dropped.
+    Pass ``persist=False`` for a purely in-memory cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float | None = DEFAULT_TTL,
+        directory: Path | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        persist: bool = True,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self._directory = (directory or DEFAULT_CACHE_DIR) if persist else None
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._disk_bytes: int | None = None
+        self._stats = CacheStats()
+
+    @property
+    def directory(self) -> Path | None:
+        return self._directory
+
+    def get(self, key: str) -> str | None:
+        """Look up a response, promoting disk hits into memory."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            created, value = entry
+            if self._expired(created):
+                del self._memory[key]
+                self._delete_file(key)
+                self._stats.expirations += 1
+            else:
+                self._memory.move_to_end(key)
+                self._stats.hits += 1
+                self._stats.memory_hits += 1
+                return value
+
+        disk_entry = self._read_file(key)
+        if disk_entry is not None:
+            created, value = disk_entry
+            if self._expired(created):
+                self._delete_file(key)
+                self._stats.expirations += 1
+            else:
+                self._remember(key, created, value)
+                self._stats.hits += 1
+                self._stats.disk_hits += 1
+                return value
+
+        self._stats.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response in both tiers."""
+        created = time.time()
+        self._remember(key, created, value)
+        self._write_file(key, created, value)
+        self._stats.writes += 1
+
+    def clear(self) -> None:
+        """Drop every entry from memory and disk."""
+        self._memory.clear()
+        if self._directory and self._directory.exists():
+            for path in self._directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+        self._disk_bytes = 0
+
+    def stats(self) -> CacheStats:
+        self._stats.memory_entries = len(self._memory)
+        self._stats.disk_bytes = self._disk_usage()
+        return CacheStats(**vars(self._stats))
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _remember(self, key: str, created: float, value: str) -> None:
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _path(self, key: str) -> Path:
+        assert self._directory is not None
+        return self._directory / key[:2] / f"{key}.json"
+
+    def _read_file(self, key: str) -> tuple[float, str] | None:
+        if self._directory is None:
+            return None
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text())
+            # Touch so disk eviction approximates least-recently-used.
+            os.utime(path)
+            return float(data["created"]), str(data["response"])
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
+
+    def _write_file(self, key: str, created: float, value: str) -> None:
+        if self._directory is None:
+            return
+        path = self._path(key)
+        payload = json.dumps({"created": created, "response": value})
+        usage = self._disk_usage()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            tmp.replace(path)
+            self._disk_bytes = usage - previous + path.stat().st_size
+        except OSError:
+            return
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _delete_file(self, key: str) -> None:
+        if self._directory is None:
+            return
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes -= size
+
+    def _disk_usage(self) -> int:
+        if self._directory is None:
+            return 0
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(
+                p.stat().st_size for p in self._directory.glob("*/*.json")
+            ) if self._directory.exists() else 0
+        return self._disk_bytes
+
+    def _evict_disk(self) -> None:
+        assert self._directory is not None
+        files = sorted(
+            self._directory.glob("*/*.json"), key=lambda p: p.stat().st_mtime
+        )
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.max_disk_bytes:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._memory.pop(path.stem, None)
+            total -= size
+            self._stats.evictions += 1
+        self._disk_bytes = total
+
+
+class CachedAgent(AgentWrapper):
+    """Serves repeated prompts from a shared ResponseCache."""
+
+    def __init__(self, inner: Agent, cache: ResponseCache) -> None:
+        super().__init__(inner)
+        self.cache = cache
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        key = cache_key(self.inner.fingerprint(context), prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.inner.execute(prompt, context)
+        if self.inner.is_cacheable(response):
+            self.cache.put(key, response)
+        return response
+
+    async def execute_many(
+        self, prompts: list[str], context: dict[str, object] | None = None
+    ) -> list[str]:
+        fingerprint = self.inner.fingerprint(context)
+        keys = [cache_key(fingerprint, p) for p in prompts]
+        responses = [self.cache.get(key) for key in keys]
+        misses = [i for i, response in enumerate(responses) if response is None]
+        if misses:
+            try:
+                fresh: list[str | None] = list(
+                    await self.inner.execute_many([prompts[i] for i in misses], context)
+                )
+            except BatchError as err:
+                # Keep what succeeded, then report in the caller's prompt order.
+                self._store(keys, misses, err.results, responses)
+                failures = {misses[i]: reason for i, reason in err.failures.items()}
+                raise BatchError(err.batch_id, responses, failures) from err
+            self._store(keys, misses, fresh, responses)
+        return [r for r in responses if r is not None]
+
+    def _store(
+        self,
+        keys: list[str],
+        misses: list[int],
+        fresh: list[str | None],
+        responses: list[str | None],
+    ) -> None:
+        for i, response in zip(misses, fresh, strict=True):
+            responses[i] = response
+            if response is not None and self.inner.is_cacheable(response):
+                self.cache.put(keys[i], response)
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        key = cache_key(self.inner.fingerprint(context), prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks: list[str] = []
+        async for chunk in self.inner.execute_stream(prompt, context):
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if self.inner.is_cacheable(response):
+            self.cache.put(key, response)
@@ -0,0 +1,157 @@
+"""Run checkpoints: stage outputs persisted as they land, so a failed run can resume."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+DEFAULT_CHECKPOINT_DIR = Path.home() / ".crowe-codex" / "checkpoints"
+
+_RUN_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+_NOTE = "Finished stages are checkpointed as run "
+
+_active: ContextVar[RunCheckpoint | None] = ContextVar("checkpoint", default=None)
+
+
+def active_checkpoint() -> RunCheckpoint | None:
+    """The checkpoint stage graphs in this task record to, if any."""
+    return _active.get()
+
+
+def note_checkpoint(error: BaseException, run_id: str) -> None:
+    """Tell whoever catches ``error`` which run to resume."""
+    error.add_note(_NOTE + run_id)
+
+
+def checkpointed_run(error: BaseException) -> str | None:
+    """The run ID noted on ``error`` by note_checkpoint, if any."""
+    notes: list[str] = getattr(error, "__notes__", [])
+    for note in notes:
+        if note.startswith(_NOTE):
+            return note.removeprefix(_NOTE)
+    return None
+
+
+class RunCheckpoint:
+    """One run's completed stage outputs, appended to a JSON-lines file.
+
+    The file is written from the first node to land: its first line records
+    the run's strategy and task, every later line is one node's output,
+    flushed and fsynced as the node lands, so a crash loses at most the node
+    being written. A torn last line is dropped on load.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        run_id: str,
+        strategy: str,
+        task: str,
+        outputs: dict[str, tuple[str, str]] | None = None,
+    ) -> None:
+        self.path = path
+        self.run_id = run_id
+        self.strategy = strategy
+        self.task = task
+        # node name -> (agent role, output)
+        self.outputs = outputs or {}
+        self.replayed: list[str] = []
+
+    def restore(self, node: str, agent: str) -> str | None:
+        """The saved output of ``node``, if it ran on the same agent role."""
+        saved = self.outputs.get(node)
+        if saved is None or saved[0] != agent:
+            return None
+        self.replayed.append(node)
+        return saved[1]
+
+    def record(self, node: str, agent: str, output: str) -> None:
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._append({
+                "run_id": self.run_id, "strategy": self.strategy, "task": self.task,
+                "created": str(time.time()),
+            })
+        self.outputs[node] = (agent, output)
+        self._append({"node": node, "agent": agent, "output": output})
+
+    @property
+    def saved(self) -> bool:
+        """Whether any stage output has been checkpointed, i.e. there is anything to resume."""
+        return bool(self.outputs)
+
+    @contextmanager
+    def active(self) -> Iterator[RunCheckpoint]:
+        """Make stage graphs run inside the block replay from and record to this."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    def discard(self) -> None:
+        """Delete the checkpoint once its run has finished."""
+        self.path.unlink(missing_ok=True)
+
+    def _append(self, entry: dict[str, str]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class CheckpointStore:
+    """Checkpoints of unfinished runs, one file per run ID."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory or DEFAULT_CHECKPOINT_DIR
+
+    def create(self, strategy: str, task: str) -> RunCheckpoint:
+        run_id = uuid.uuid4().hex[:12]
+        return RunCheckpoint(self._path(run_id), run_id, strategy, task)
+
+    def open(self, run_id: str) -> RunCheckpoint:
+        """Load a run's checkpoint; KeyError if there is none."""
+        if not _RUN_ID.match(run_id) or not self._path(run_id).exists():
+            raise KeyError(f"No checkpoint for run '{run_id}'")
+        path = self._path(run_id)
+        header: dict[str, str] | None = None
+        outputs: dict[str, tuple[str, str]] = {}
+        text = path.read_text(encoding="utf-8")
+        good = 0
+        for line in text.splitlines(keepends=True):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if not line.endswith("\n"):
+                break
+            good += len(line)
+            if header is None:
+                header = entry
+            else:
+                outputs[entry["node"]] = (entry["agent"], entry["output"])
+        if header is None:
+            raise KeyError(f"Checkpoint for run '{run_id}' is empty")
+        if good < len(text):
+            # Drop a write torn by a crash so the resumed run appends cleanly.
+            path.write_text(text[:good], encoding="utf-8")
+        return RunCheckpoint(path, run_id, header["strategy"], header["task"], outputs)
+
+    def runs(self) -> list[str]:
+        """Run IDs with a checkpoint, oldest first."""
+        if not self.directory.exists():
+            return []
+        paths = sorted(self.directory.glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
+        return [p.stem for p in paths]
+
+    def _path(self, run_id: str) -> Path:
+        return self.directory / f"{run_id}.jsonl"
@@ -2,38 +2,147 @@
 
 from __future__ import annotations
 
-from anthropic import AsyncAnthropic
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
 from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.batch import BatchItemFailure, BatchRunner
+from crowe_codex.core.budget import SUMMARIZE, Prompt, Section
+from crowe_codex.core.usage import TokenUsage, report_usage
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+    from anthropic.types import Message, TextBlockParam
 
 DEFAULT_MODEL = "claude-opus-4-6"
+DEFAULT_BASE_URL = "https://api.anthropic.com"
+MAX_TOKENS = 8192
 
 
 class ClaudeAgent(Agent):
     """Claude agent for architecture planning and final dispatch."""
 
-    def __init__(self, config: AgentConfig) -> None:
+    def __init__(self, config: AgentConfig, batches: BatchRunner | None = None) -> None:
         super().__init__(config)
         self.model = config.model or DEFAULT_MODEL
+        self.batches = batches or BatchRunner()
         self._client: AsyncAnthropic | None = None
 
     def _get_client(self) -> AsyncAnthropic:
         if self._client is None:
-            self._client = AsyncAnthropic(api_key=self.config.api_key or None)
+            # The SDK is heavy to import; pay for it on first use only.
+            from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+            http_client = None
+            if self.transport is not None:
+                http_client = self.transport.client(
+                    self.config.base_url or DEFAULT_BASE_URL, DefaultAsyncHttpxClient
+                )
+            self._client = AsyncAnthropic(
+                api_key=self.config.api_key or None,
+                base_url=self.config.base_url or None,
+                http_client=http_client,
+            )
         return self._client
 
     async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
         client = self._get_client()
         message = await client.messages.create(
             model=self.model,
-            max_tokens=8192,
-            messages=[{"role": "user", "content": prompt}],
+            max_tokens=MAX_TOKENS,
+            messages=[{"role": "user", "content": _content(prompt)}],
+        )
+        self._report_usage(message, prompt)
+        return _text(message)
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        client = self._get_client()
+        async with client.messages.stream(
+            model=self.model,
+            max_tokens=MAX_TOKENS,
+            messages=[{"role": "user", "content": _content(prompt)}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            self._report_usage(await stream.get_final_message(), prompt)
+
+    async def execute_many(
+        self, prompts: list[str], context: dict[str, object] | None = None
+    ) -> list[str]:
+        """Run the prompts as one Message Batch; see BatchRunner."""
+        return await self.batches.run(
+            self.config.provider,
+            self.fingerprint(context),
+            prompts,
+            self._submit_batch,
+            self._batch_ended,
+            self._batch_results,
+        )
+
+    def supports_batches(self) -> bool:
+        return True
+
+    async def _submit_batch(self, requests: dict[str, str]) -> str:
+        batch = await self._get_client().messages.batches.create(
+            requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": MAX_TOKENS,
+                        "messages": [{"role": "user", "content": _content(prompt)}],
+                    },
+                }
+                for custom_id, prompt in requests.items()
+            ]
         )
-        return message.content[0].text
+        return batch.id
+
+    async def _batch_ended(self, batch_id: str) -> bool:
+        batch = await self._get_client().messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def _batch_results(self, batch_id: str, requests: dict[str, str]) -> dict[str, str]:
+        completions: dict[str, str] = {}
+        async for entry in await self._get_client().messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                self._report_usage(result.message, requests.get(entry.custom_id, ""))
+                completions[entry.custom_id] = _text(result.message)
+            elif result.type == "errored":
+                completions[entry.custom_id] = BatchItemFailure(
+                    f"errored: {result.error.error.message}"
+                )
+            else:
+                completions[entry.custom_id] = BatchItemFailure(result.type)
+        return completions
+
+    def _report_usage(self, message: object, prompt: str) -> None:
+        usage = getattr(message, "usage", None)
+        if usage is not None:
+            report_usage(TokenUsage(
+                provider=self.config.provider,
+                model=self.model,
+                input_tokens=usage.input_tokens or 0,
+                output_tokens=usage.output_tokens or 0,
+                prompt_chars=len(prompt),
+                cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+                cache_creation_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+            ))
 
     async def is_available(self) -> bool:
         return bool(self.config.api_key)
 
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        return {
+            "provider": self.config.provider,
+            "model": self.model,
+            "base_url": self.config.base_url or DEFAULT_BASE_URL,
+            "max_tokens": MAX_TOKENS,
+        }
+
     def build_architect_prompt(self, task: str) -> str:
         return (
             "You are the ARCHITECT stage of the crowe-codex pipeline.\n\n"
@@ -51,10 +160,12 @@ class ClaudeAgent(Agent):
         )
 
     def build_dispatch_prompt(self, task: str, stage_outputs: dict[str, str]) -> str:
-        outputs_text = "\n\n".join(
-            f"=== {stage} ===\n{output}" for stage, output in stage_outputs.items()
-        )
-        return (
+        # Stage outputs are the bulk of the prompt; let the budgeter condense them.
+        stages = [
+            Section(f"=== {stage} ===\n{output}\n\n", priority=1, policy=SUMMARIZE, label=stage)
+            for stage, output in stage_outputs.items()
+        ]
+        return Prompt(
             "You are the DISPATCH stage (final gate) of the crowe-codex pipeline.\n\n"
             "Your role:\n"
             "1. Verify the final code matches the original architectural intent\n"
@@ -63,10 +174,31 @@ class ClaudeAgent(Agent):
             "4. Generate a confidence score and security attestation\n"
             "5. Produce the final, clean output\n\n"
             f"Original task: {task}\n\n"
-            f"Stage outputs:\n{outputs_text}\n\n"
+            "Stage outputs:\n",
+            *stages,
             "Respond with:\n"
             '- "code": the final verified code\n'
             '- "security_issues": list of any issues found (empty if clean)\n'
             '- "confidence": your confidence assessment\n'
-            '- "summary": human-readable summary of what was built\n'
+            '- "summary": human-readable summary of what was built\n',
         )
+
+
+def _text(message: Message) -> str:
+    """The text of a completion, skipping any non-text blocks."""
+    return "".join(block.text for block in message.content if block.type == "text")
+
+
+def _content(prompt: str) -> str | list[TextBlockParam]:
+    """Message content, with any stable prompt prefix marked for caching."""
+    if not isinstance(prompt, Prompt):
+        return prompt
+    prefix, suffix = prompt.split_cached()
+    if not prefix:
+        return str(prompt)
+    blocks: list[TextBlockParam] = [
+        {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+    ]
+    if suffix:
+        blocks.append({"type": "text", "text": suffix})
+    return blocks
@@ -0,0 +1,135 @@
+"""Single-flight coalescing of identical in-flight agent requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+from crowe_codex.core.cache import cache_key
+
+
+@dataclass
+class CoalesceStats:
+    """How many calls were made and how many rode along on another's request."""
+
+    calls: int = 0
+    executed: int = 0
+    coalesced: int = 0
+
+
+class _Flight:
+    def __init__(self, future: asyncio.Future[str]) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent work by key; nothing is kept once a flight lands.
+
+    Unlike ResponseCache this never returns a stale result: a key is only
+    shared while its request is actually in progress.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self._stats = CoalesceStats()
+
+    def stats(self) -> CoalesceStats:
+        return CoalesceStats(**vars(self._stats))
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        """Run ``fn`` unless an identical call is already running, then share its result."""
+        self._stats.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            self._stats.executed += 1
+            flight = self._start(key, asyncio.ensure_future(fn()))
+        else:
+            self._stats.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            # The last interested caller giving up abandons the request.
+            if flight.waiters == 0 and not flight.future.done():
+                flight.future.cancel()
+
+    async def stream(
+        self, key: str, fn: Callable[[], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """Stream ``fn`` for the first caller; later callers get the joined result."""
+        self._stats.calls += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._stats.coalesced += 1
+            try:
+                yield await asyncio.shield(flight.future)
+                return
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not flight.future.cancelled() or (task and task.cancelling()):
+                    raise
+            # The leader abandoned its stream; make our own request instead.
+            self._stats.coalesced -= 1
+
+        self._stats.executed += 1
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._start(key, future)
+        chunks: list[str] = []
+        try:
+            async for chunk in fn():
+                chunks.append(chunk)
+                yield chunk
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                future.set_exception(exc)
+                # Followers observe the error; mark it retrieved for the leader.
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        else:
+            future.set_result("".join(chunks))
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def _start(self, key: str, future: asyncio.Future[str]) -> _Flight:
+        flight = _Flight(future)
+        self._flights[key] = flight
+
+        def land(_: asyncio.Future[str]) -> None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        future.add_done_callback(land)
+        return flight
+
+
+class CoalescingAgent(AgentWrapper):
+    """Shares one underlying call among concurrent identical prompts."""
+
+    def __init__(self, inner: Agent, group: SingleFlight) -> None:
+        super().__init__(inner)
+        self.group = group
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        key = cache_key(self.inner.fingerprint(context), prompt)
+        return await self.group.do(key, lambda: self.inner.execute(prompt, context))
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        key = cache_key(self.inner.fingerprint(context), prompt)
+        async for chunk in self.group.stream(
+            key, lambda: self.inner.execute_stream(prompt, context)
+        ):
+            yield chunk
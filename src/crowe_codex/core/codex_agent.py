@@ -3,30 +3,50 @@
 from __future__ import annotations
 
 import json
-
-from openai import AsyncOpenAI
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
 
 from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.batch import BatchItemFailure, BatchRunner
+from crowe_codex.core.usage import TokenUsage, report_usage
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types import CompletionUsage
 
 DEFAULT_MODEL = "gpt-5.3"
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+MAX_TOKENS = 8192
+
+# Batch states after which no more output will appear.
+BATCH_FINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
 
 
 class CodexAgent(Agent):
     """Codex/GPT agent for code generation and testing."""
 
-    def __init__(self, config: AgentConfig) -> None:
+    def __init__(self, config: AgentConfig, batches: BatchRunner | None = None) -> None:
         super().__init__(config)
         self.model = config.model or DEFAULT_MODEL
+        self.batches = batches or BatchRunner()
         self._client: AsyncOpenAI | None = None
 
     def _get_client(self) -> AsyncOpenAI:
         if self._client is None:
-            kwargs: dict[str, str] = {}
-            if self.config.api_key:
-                kwargs["api_key"] = self.config.api_key
-            if self.config.base_url:
-                kwargs["base_url"] = self.config.base_url
-            self._client = AsyncOpenAI(**kwargs)
+            # The SDK is heavy to import; pay for it on first use only.
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            http_client = None
+            if self.transport is not None:
+                http_client = self.transport.client(
+                    self.config.base_url or DEFAULT_BASE_URL, DefaultAsyncHttpxClient
+                )
+            # None falls back to the SDK's environment variables and defaults.
+            self._client = AsyncOpenAI(
+                api_key=self.config.api_key or None,
+                base_url=self.config.base_url or None,
+                http_client=http_client,
+            )
         return self._client
 
     async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
@@ -34,13 +54,132 @@ class CodexAgent(Agent):
         response = await client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=8192,
+            max_tokens=MAX_TOKENS,
         )
+        self._report_usage(response.usage, prompt)
         return response.choices[0].message.content or ""
 
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        client = self._get_client()
+        stream = await client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=MAX_TOKENS,
+            stream=True,
+            # Usage arrives on a final chunk with no choices.
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage is not None:
+                self._report_usage(chunk.usage, prompt)
+
+    async def execute_many(
+        self, prompts: list[str], context: dict[str, object] | None = None
+    ) -> list[str]:
+        """Run the prompts through the Batch API; see BatchRunner."""
+        return await self.batches.run(
+            self.config.provider,
+            self.fingerprint(context),
+            prompts,
+            self._submit_batch,
+            self._batch_ended,
+            self._batch_results,
+        )
+
+    def supports_batches(self) -> bool:
+        return True
+
+    async def _submit_batch(self, requests: dict[str, str]) -> str:
+        client = self._get_client()
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": MAX_TOKENS,
+                },
+            })
+            for custom_id, prompt in requests.items()
+        ]
+        upload = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def _batch_ended(self, batch_id: str) -> bool:
+        batch = await self._get_client().batches.retrieve(batch_id)
+        return batch.status in BATCH_FINAL_STATES
+
+    async def _batch_results(self, batch_id: str, requests: dict[str, str]) -> dict[str, str]:
+        client = self._get_client()
+        batch = await client.batches.retrieve(batch_id)
+        completions: dict[str, str] = {}
+        # Failed requests land in the error file; expired batches may have both.
+        for file_id in (batch.error_file_id, batch.output_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    completions[entry["custom_id"]] = self._batch_completion(
+                        entry, requests.get(entry["custom_id"], "")
+                    )
+        return completions
+
+    def _batch_completion(self, entry: dict[str, Any], prompt: str) -> str:
+        response = entry.get("response") or {}
+        body = response.get("body") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            error = entry.get("error") or body.get("error") or {}
+            return BatchItemFailure(
+                f"status {response.get('status_code')}: {error.get('message', 'failed')}"
+            )
+        from openai.types.chat import ChatCompletion
+
+        completion = ChatCompletion.model_validate(body)
+        self._report_usage(completion.usage, prompt)
+        return completion.choices[0].message.content or ""
+
+    def _report_usage(self, usage: CompletionUsage | None, prompt: str) -> None:
+        if usage is None:
+            return
+        # OpenAI caches long prompt prefixes automatically; cached tokens
+        # are a subset of prompt_tokens.
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+        report_usage(TokenUsage(
+            provider=self.config.provider,
+            model=self.model,
+            input_tokens=(usage.prompt_tokens or 0) - cached,
+            output_tokens=usage.completion_tokens or 0,
+            prompt_chars=len(prompt),
+            cache_read_tokens=cached,
+        ))
+
     async def is_available(self) -> bool:
         return bool(self.config.api_key)
 
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        return {
+            "provider": self.config.provider,
+            "model": self.model,
+            "base_url": self.config.base_url,
+            "max_tokens": MAX_TOKENS,
+        }
+
     def build_builder_prompt(self, blueprint: dict[str, object]) -> str:
         blueprint_text = json.dumps(blueprint, indent=2)
         return (
@@ -0,0 +1,60 @@
+"""Run-level deadlines propagated through strategies and agent calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+_current: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The run's wall-clock budget ran out before the work finished."""
+
+
+class Deadline:
+    """An absolute point in (monotonic) time by which a run must finish."""
+
+    def __init__(self, at: float) -> None:
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(self.at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator[Deadline]:
+        """Cancel whatever is in flight when the deadline passes.
+
+        Raises DeadlineExceeded on expiry. Re-entering the scope of a
+        deadline that is already enforced is a no-op, so nested strategies
+        do not stack timers for the same instant.
+        """
+        if _current.get() is self:
+            yield self
+            return
+
+        token = _current.set(self)
+        timer = asyncio.timeout(self.remaining())
+        try:
+            async with timer:
+                yield self
+        except TimeoutError as exc:
+            if timer.expired():
+                raise DeadlineExceeded(
+                    f"Deadline exceeded after {self.remaining():.1f}s remaining"
+                ) from exc
+            raise
+        finally:
+            _current.reset(token)
+
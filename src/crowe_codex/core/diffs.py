@@ -0,0 +1,186 @@
+"""Diff-based code exchange: agents return unified diffs, applied locally."""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+
+from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import Prompt
+
+FULL, DIFF = "full", "diff"
+
+DIFF_INSTRUCTION = (
+    "Return ONLY a unified diff against the code above (--- / +++ headers and "
+    "@@ hunks with 3 lines of context), no prose. Return an empty diff if "
+    "nothing needs to change."
+)
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_FENCE = re.compile(r"^```[\w-]*\s*$")
+
+
+class DiffApplyError(Exception):
+    """A diff does not apply cleanly to the code it claims to modify."""
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    old_count: int
+    new_count: int
+    old_lines: list[str]
+    new_lines: list[str]
+
+    @property
+    def complete(self) -> bool:
+        return len(self.old_lines) >= self.old_count and len(self.new_lines) >= self.new_count
+
+
+@dataclass
+class ExchangeStats:
+    """How revisions came back: as applied diffs, or as full text."""
+
+    diffs_applied: int = 0
+    full_text: int = 0
+    fallbacks: int = 0
+
+
+def parse_diff(diff: str) -> list[Hunk]:
+    """Parse the hunks of a unified diff, tolerating code fences and headers."""
+    hunks: list[Hunk] = []
+    current: Hunk | None = None
+    for line in diff.splitlines():
+        if _FENCE.match(line):
+            continue
+        header = _HUNK_HEADER.match(line)
+        if header:
+            old_count, new_count = header.group(2), header.group(4)
+            current = Hunk(
+                int(header.group(1)),
+                1 if old_count is None else int(old_count),
+                1 if new_count is None else int(new_count),
+                [],
+                [],
+            )
+            hunks.append(current)
+        elif current is None or current.complete:
+            # File headers, or prose past the hunk's stated length.
+            continue
+        elif line.startswith("\\"):
+            continue
+        elif line.startswith("+"):
+            current.new_lines.append(line[1:])
+        elif line.startswith("-"):
+            current.old_lines.append(line[1:])
+        else:
+            # Context; models often drop the leading space on blank lines.
+            text = line.removeprefix(" ")
+            current.old_lines.append(text)
+            current.new_lines.append(text)
+    return hunks
+
+
+def apply_diff(original: str, diff: str) -> str:
+    """Apply a unified diff to ``original``.
+
+    Hunks are located near their stated line numbers, matching lines with
+    trailing whitespace ignored. Raises DiffApplyError if a hunk's context
+    or removed lines cannot be found.
+    """
+    hunks = parse_diff(diff)
+    lines = original.splitlines()
+    result: list[str] = []
+    cursor = 0
+    for number, hunk in enumerate(hunks, 1):
+        at = _locate(lines, hunk, cursor)
+        if at is None:
+            raise DiffApplyError(f"Hunk {number} (line {hunk.old_start}) does not match")
+        result.extend(lines[cursor:at])
+        result.extend(hunk.new_lines)
+        cursor = at + len(hunk.old_lines)
+    result.extend(lines[cursor:])
+    trailing = "\n" if original.endswith("\n") or not original else ""
+    return "\n".join(result) + trailing
+
+
+def _locate(lines: list[str], hunk: Hunk, cursor: int) -> int | None:
+    wanted = [line.rstrip() for line in hunk.old_lines]
+    size = len(wanted)
+    if size == 0:
+        return min(max(hunk.old_start, cursor), len(lines))
+    expected = max(hunk.old_start - 1, cursor)
+    candidates = range(cursor, len(lines) - size + 1)
+    for start in sorted(candidates, key=lambda i: abs(i - expected)):
+        if [line.rstrip() for line in lines[start:start + size]] == wanted:
+            return start
+    return None
+
+
+def is_diff(response: str) -> bool:
+    return any(_HUNK_HEADER.match(line) for line in response.splitlines())
+
+
+class CodeExchange:
+    """Requests revised code from an agent as a diff or as full text.
+
+    In DIFF mode the agent is asked for a unified diff, which is applied
+    locally. An empty response means "no change"; one with no hunks is
+    taken as full replacement code only if it looks like code (fenced, or
+    parses as Python). Prose such as "No changes needed." and diffs that
+    fail to apply trigger one full-text re-request.
+    """
+
+    def __init__(self, mode: str = FULL) -> None:
+        if mode not in (FULL, DIFF):
+            raise ValueError(f"Unknown code exchange mode '{mode}'")
+        self.mode = mode
+        self.stats = ExchangeStats()
+
+    async def revise(
+        self,
+        agent: Agent,
+        prompt: str | Prompt,
+        code: str,
+        full_instruction: str,
+    ) -> str:
+        """Send ``prompt`` (which shows ``code``) and return the revised code."""
+        if self.mode == FULL:
+            self.stats.full_text += 1
+            return await agent.execute(_append(prompt, full_instruction))
+
+        response = await agent.execute(_append(prompt, DIFF_INSTRUCTION))
+        if not response.strip():
+            self.stats.diffs_applied += 1
+            return code
+        if not is_diff(response):
+            if not _looks_like_code(response):
+                self.stats.fallbacks += 1
+                return await agent.execute(_append(prompt, full_instruction))
+            self.stats.full_text += 1
+            return response
+        try:
+            revised = apply_diff(code, response)
+        except DiffApplyError:
+            self.stats.fallbacks += 1
+            return await agent.execute(_append(prompt, full_instruction))
+        self.stats.diffs_applied += 1
+        return revised
+
+
+def _looks_like_code(response: str) -> bool:
+    if any(_FENCE.match(line) for line in response.splitlines()):
+        return True
+    try:
+        tree = ast.parse(response)
+    except (SyntaxError, ValueError):
+        return False
+    # A lone word or phrase parses as an expression; code defines or does something.
+    return not all(isinstance(node, ast.Expr) for node in tree.body)
+
+
+def _append(prompt: str | Prompt, instruction: str) -> str:
+    if isinstance(prompt, Prompt):
+        return Prompt(*prompt.sections, instruction)
+    return prompt + instruction
@@ -2,6 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any
+
+from crowe_codex.core.agent import Agent, AgentConfig, task_scope
+from crowe_codex.core.auth import AuthManager
+from crowe_codex.core.budget import BudgetedAgent, PromptBudgeter
+from crowe_codex.core.cache import CachedAgent, CacheStats, ResponseCache
+from crowe_codex.core.checkpoint import CheckpointStore, RunCheckpoint, note_checkpoint
+from crowe_codex.core.coalesce import CoalesceStats, CoalescingAgent, SingleFlight
+from crowe_codex.core.deadline import Deadline, DeadlineExceeded
+from crowe_codex.core.equivalence import agreement as code_agreement
+from crowe_codex.core.graph import memoize_stages
+from crowe_codex.core.health import HealthCheckedAgent, HealthMonitor
+from crowe_codex.core.hedging import HedgedAgent, HedgePolicy, record_hedges
+from crowe_codex.core.limiter import ConcurrencyController, LimitedAgent
+from crowe_codex.core.resilience import (
+    BreakerAgent,
+    BreakerRegistry,
+    RetryingAgent,
+    RetryPolicy,
+)
 from crowe_codex.core.result import (
     AgentOutput,
     ConfidenceReport,
@@ -9,6 +32,9 @@ from crowe_codex.core.result import (
     SecurityAttestation,
     Stage,
 )
+from crowe_codex.core.streaming import StreamingAgent, TokenCallback
+from crowe_codex.core.transport import PoolStats, TransportManager
+from crowe_codex.core.usage import record_usage, total_usage
 from crowe_codex.strategies.base import Strategy
 
 AGENT_STAGE_MAP: dict[str, list[int]] = {
@@ -19,29 +45,229 @@ AGENT_STAGE_MAP: dict[str, list[int]] = {
     "dispatch": [5],
 }
 
+# How long past its deadline a strategy may take to hand back partial results
+# before the engine abandons it outright.
+DEADLINE_GRACE = 1.0
+
+# Tasks run_many keeps in flight at once unless told otherwise.
+DEFAULT_RUN_CONCURRENCY = 16
+
+# Seconds auto-detection waits for a local provider to answer its probe.
+DETECT_TIMEOUT = 2.0
+
+# Where the deliverable code lives, best first; partial runs fall through.
+CODE_KEYS = ("dispatch_output", "build_output", "code_output", "agreed_code")
+
 
 class DualEngine:
     """The crowe-codex pipeline orchestration engine."""
 
-    def __init__(self, auto_detect: bool = True) -> None:
-        self._agents: dict[str, object] = {}
+    def __init__(
+        self,
+        auto_detect: bool = True,
+        cache: ResponseCache | None = None,
+        on_token: TokenCallback | None = None,
+        transport: TransportManager | None = None,
+        concurrency: ConcurrencyController | None = None,
+        coalescing: SingleFlight | None = None,
+        retry: RetryPolicy | None = None,
+        breakers: BreakerRegistry | None = None,
+        budget: PromptBudgeter | None = None,
+        health: HealthMonitor | None = None,
+        checkpoints: CheckpointStore | None = None,
+    ) -> None:
+        # Agents come back wrapped in middleware; anything else is stored as given.
+        self._agents: dict[str, Any] = {}
+        self._cache = cache
+        self._checkpoints = checkpoints
+        self._on_token = on_token
+        self._transport = transport or TransportManager()
+        self._concurrency = concurrency or ConcurrencyController()
+        self._single_flight = coalescing or SingleFlight()
+        self._retry = retry or RetryPolicy()
+        self._breakers = breakers or BreakerRegistry()
+        self._budget = budget or PromptBudgeter()
+        self._health = health or HealthMonitor()
+        self.auth = AuthManager(health=self._health)
+        # Auto-detected agents registered once their availability probe passes.
+        self._pending: dict[str, Agent] = {}
+        self._detecting: asyncio.Future[None] | None = None
         if auto_detect:
             self._auto_detect()
 
     def _auto_detect(self) -> None:
-        """Auto-detect available agents from environment."""
-        pass
+        """Auto-detect available agents from environment.
+
+        Providers with an API key are registered straight away: adapters
+        import their SDK and build their client on first use, so this costs
+        no imports or network. Ollama has no credentials to check, so it is
+        probed in the background and registered only if it answers; ``run``
+        and ``detect`` wait for that probe.
+        """
+        from crowe_codex.core.claude_agent import ClaudeAgent
+        from crowe_codex.core.codex_agent import CodexAgent
+        from crowe_codex.core.nim_agent import NimAgent
+        from crowe_codex.core.ollama_agent import OllamaAgent
+        from crowe_codex.core.ollama_pool import OllamaPool
+
+        anthropic = self.auth.get("anthropic")
+        if anthropic.method == "api_key":
+            for role in ("claude", "dispatch"):
+                self.register_agent(role, ClaudeAgent(
+                    AgentConfig(name=role, provider="anthropic", api_key=anthropic.api_key)
+                ))
+        openai = self.auth.get("openai")
+        if openai.method == "api_key":
+            self.register_agent("codex", CodexAgent(
+                AgentConfig(name="codex", provider="openai", api_key=openai.api_key)
+            ))
+        nvidia = self.auth.get("nvidia")
+        if nvidia.method == "api_key":
+            self.register_agent("nim", NimAgent(
+                AgentConfig(name="nim", provider="nvidia", api_key=nvidia.api_key)
+            ))
+
+        hosts = self.auth.get("ollama").hosts
+        config = AgentConfig(name="ollama", provider="ollama")
+        ollama: Agent
+        if len(hosts) > 1:
+            ollama = OllamaPool(hosts, config)
+        else:
+            ollama = OllamaAgent(config.model_copy(update={"base_url": hosts[0] if hosts else ""}))
+        # Bound before probing so the probe's client is the pooled one.
+        ollama.bind_transport(self._transport)
+        self._pending["ollama"] = ollama
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # probed on the first ``detect`` instead
+        self._detecting = loop.create_task(self._probe_pending())
+
+    async def detect(self) -> list[str]:
+        """Finish auto-detection and return the registered roles."""
+        if self._pending and self._detecting is None:
+            self._detecting = asyncio.get_running_loop().create_task(self._probe_pending())
+        if self._detecting is not None:
+            await self._detecting
+        return self.available_agents()
+
+    async def _probe_pending(self) -> None:
+        pending = list(self._pending.items())
+        results = await asyncio.gather(
+            *(asyncio.wait_for(agent.is_available(), DETECT_TIMEOUT) for _, agent in pending),
+            return_exceptions=True,
+        )
+        for (name, agent), available in zip(pending, results):
+            if available is True:
+                self.register_agent(name, agent)
+        self._pending.clear()
+
+    def register_agent(
+        self,
+        name: str,
+        agent: object,
+        replicas: list[Agent] | None = None,
+        hedge: HedgePolicy | None = None,
+        fallback: Agent | None = None,
+    ) -> None:
+        """Register an agent for a role.
 
-    def register_agent(self, name: str, agent: object) -> None:
+        ``replicas`` opt the role into hedged requests; ``fallback`` answers
+        while the provider's circuit breaker is open.
+        """
+        if isinstance(agent, Agent):
+            if fallback is not None:
+                fallback = self._limited(fallback)
+            agent = self._resilient(agent, fallback)
+            if replicas:
+                agent = HedgedAgent(
+                    agent, [self._resilient(r, fallback) for r in replicas], hedge, name=name
+                )
+            agent = HealthCheckedAgent(agent, self._health.watch(name, agent))
+            agent = CoalescingAgent(agent, self._single_flight)
+            if self._cache is not None:
+                agent = CachedAgent(agent, self._cache)
+            if self._on_token is not None:
+                agent = StreamingAgent(agent, self._on_token, name=name)
         self._agents[name] = agent
 
+    def _limited(self, agent: Agent) -> Agent:
+        agent.bind_transport(self._transport)
+        budgeted = BudgetedAgent(agent, self._budget)
+        return LimitedAgent(budgeted, self._concurrency.limiter_for(agent.config.provider))
+
+    def _resilient(self, agent: Agent, fallback: Agent | None) -> Agent:
+        # Breaker inside retry so each attempt counts and an open circuit ends retrying.
+        provider = agent.config.provider
+        breaker = BreakerAgent(
+            self._limited(agent), self._breakers.breaker_for(provider), fallback
+        )
+        return RetryingAgent(breaker, self._retry)
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        return self._cache
+
+    def cache_stats(self) -> CacheStats:
+        """Hit/miss, eviction and size counters for the response cache."""
+        if self._cache is None:
+            return CacheStats()
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+    def coalesce_stats(self) -> CoalesceStats:
+        """Counts of agent calls saved by sharing identical in-flight requests."""
+        return self._single_flight.stats()
+
+    def breaker_states(self) -> dict[str, str]:
+        """Circuit breaker state per provider: closed, open or half_open."""
+        return self._breakers.states()
+
+    @property
+    def budget(self) -> PromptBudgeter:
+        return self._budget
+
+    @property
+    def concurrency(self) -> ConcurrencyController:
+        return self._concurrency
+
+    def concurrency_windows(self) -> dict[str, float]:
+        """Current adaptive concurrency window per provider."""
+        return self._concurrency.windows()
+
+    @property
+    def transport(self) -> TransportManager:
+        return self._transport
+
+    def pool_stats(self) -> dict[str, PoolStats]:
+        """Per-base-URL request and connection counters for the shared transport."""
+        return self._transport.stats()
+
+    @property
+    def health(self) -> HealthMonitor:
+        return self._health
+
+    async def aclose(self) -> None:
+        """Release pooled connections held on behalf of the registered agents."""
+        if self._detecting is not None and not self._detecting.done():
+            self._detecting.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._detecting
+        await self._health.stop()
+        await self._transport.aclose()
+
     def available_agents(self) -> list[str]:
         return list(self._agents.keys())
 
     def available_stages(self) -> list[int]:
         stages: set[int] = set()
         for name in self._agents:
-            stages.update(AGENT_STAGE_MAP.get(name, []))
+            # Roles demoted by a failed call or probe drop out until they recover.
+            if self._health.is_healthy(name):
+                stages.update(AGENT_STAGE_MAP.get(name, []))
         return sorted(stages)
 
     async def run(
@@ -49,15 +275,67 @@ class DualEngine:
         strategy: Strategy,
         task: str,
         context: dict[str, object] | None = None,
+        deadline: float | Deadline | None = None,
+        resume: str | None = None,
     ) -> PipelineResult:
-        """Execute a strategy through the pipeline."""
-        result = await strategy.execute(task, self._agents, context)
+        """Execute a strategy through the pipeline.
+
+        With a ``deadline`` (seconds from now, or a Deadline), the strategy
+        receives it as ``context["deadline"]``; every agent call is
+        cancelled once it passes and the best partial result is returned.
+
+        With a checkpoint store, every stage output is saved under a run ID
+        as it lands. A run that fails or runs out of time keeps its
+        checkpoint (the ID is in ``metadata["run_id"]``, or in a note on the
+        raised error) and ``resume`` with that ID replays its finished
+        stages, calling agents only for the rest.
+
+        With a response cache, stage outputs are also memoized by content
+        (see StageGraph), so a rerun recomputes only the stages whose inputs
+        changed; those reused are listed in ``metadata["memoized_stages"]``.
+        """
+        checkpoint = self._checkpoint(strategy, task, resume)
+        if deadline is not None:
+            if not isinstance(deadline, Deadline):
+                deadline = Deadline.after(deadline)
+            context = {**(context or {}), "deadline": deadline}
 
+        await self.detect()
+
+        # Agents learn the task up front (e.g. to load a routed model) and
+        # can see it during every stage.
+        for agent in self._agents.values():
+            if isinstance(agent, Agent):
+                agent.prepare(task)
+
+        with (
+            task_scope(task),
+            record_hedges() as hedges,
+            record_usage() as usage,
+            checkpoint.active() if checkpoint else contextlib.nullcontext(),
+            memoize_stages(self._cache) if self._cache is not None else contextlib.nullcontext(),
+        ):
+            try:
+                if deadline is None:
+                    result = await strategy.execute(task, self._agents, context)
+                else:
+                    result = await self._execute_by(deadline, strategy, task, context)
+            except Exception as e:
+                if checkpoint is not None and checkpoint.saved:
+                    note_checkpoint(e, checkpoint.run_id)
+                raise
+
+        partial = bool(result.get("partial"))
         code = ""
-        if isinstance(result.get("dispatch_output"), str):
-            code = result["dispatch_output"]
-        elif isinstance(result.get("build_output"), str):
-            code = result["build_output"]
+        for key in CODE_KEYS:
+            value = result.get(key)
+            if isinstance(value, str) and (value or not partial):
+                code = value
+                break
+        else:
+            candidates = result.get("candidates")
+            if isinstance(candidates, list) and candidates:
+                code = str(candidates[0])
 
         stage_outputs: list[AgentOutput] = []
         stage_map = {
@@ -68,6 +346,8 @@ class DualEngine:
         }
         for key, value in result.items():
             if key.endswith("_output") and isinstance(value, str):
+                if partial and not value:
+                    continue
                 stage_name = key.replace("_output", "")
                 stage_num = stage_map.get(stage_name, Stage.DISPATCH)
                 stage_outputs.append(AgentOutput(
@@ -75,8 +355,12 @@ class DualEngine:
                 ))
 
         agreement = 1.0
-        if result.get("claude_output") and result.get("codex_output"):
-            agreement = 1.0 if result["claude_output"] == result["codex_output"] else 0.7
+        reported = result.get("agreement")
+        claude, codex = result.get("claude_output"), result.get("codex_output")
+        if isinstance(reported, float):
+            agreement = reported
+        elif claude and codex:
+            agreement = code_agreement(str(claude), str(codex))
 
         confidence = ConfidenceReport(
             architecture_preserved=True,
@@ -88,10 +372,175 @@ class DualEngine:
             cross_vendor_agreement=agreement,
         )
 
+        metadata: dict[str, object] = {}
+        if hedges:
+            metadata["hedges"] = [vars(h) for h in hedges]
+        if usage:
+            metadata["usage"] = total_usage(usage)
+        if result.get("critical_path"):
+            # Recorded by StageGraph: the chain of stages that set the wall time.
+            metadata["critical_path"] = result["critical_path"]
+            metadata["stage_timings"] = result.get("stage_timings", {})
+        if result.get("memoized_stages"):
+            metadata["memoized_stages"] = result["memoized_stages"]
+        if result.get("skipped_stages"):
+            metadata["skipped_stages"] = result["skipped_stages"]
+        summary = f"Strategy: {strategy.name}"
+        if partial:
+            metadata["deadline_exceeded"] = True
+            summary += " (partial: deadline exceeded)"
+        if checkpoint is not None:
+            if checkpoint.replayed:
+                metadata["resumed_stages"] = list(checkpoint.replayed)
+            if partial and checkpoint.saved:
+                metadata["run_id"] = checkpoint.run_id
+            else:
+                checkpoint.discard()
+
         return PipelineResult(
             code=code,
             stage_outputs=stage_outputs,
             confidence=confidence,
             security=SecurityAttestation(),
-            summary=f"Strategy: {strategy.name}",
+            summary=summary,
+            metadata=metadata,
         )
+
+    def _checkpoint(
+        self, strategy: Strategy, task: str, resume: str | None
+    ) -> RunCheckpoint | None:
+        if resume is None:
+            if self._checkpoints is None:
+                return None
+            return self._checkpoints.create(strategy.name, task)
+        if self._checkpoints is None:
+            raise ValueError("Resuming a run needs an engine with a checkpoint store")
+        checkpoint = self._checkpoints.open(resume)
+        if (checkpoint.strategy, checkpoint.task) != (strategy.name, task):
+            raise ValueError(
+                f"Run {resume} was strategy '{checkpoint.strategy}' on task "
+                f"{checkpoint.task!r}; resume it with the same strategy and task"
+            )
+        return checkpoint
+
+    @property
+    def checkpoints(self) -> CheckpointStore | None:
+        return self._checkpoints
+
+    async def run_many(
+        self,
+        strategy: Strategy,
+        tasks: Iterable[str] | AsyncIterable[str],
+        context: dict[str, object] | None = None,
+        deadline: float | None = None,
+        concurrency: int = DEFAULT_RUN_CONCURRENCY,
+        provider_limits: dict[str, float] | None = None,
+    ) -> AsyncIterator[PipelineResult]:
+        """Run ``strategy`` over many tasks, yielding results as they finish.
+
+        At most ``concurrency`` tasks run at once, and ``provider_limits``
+        caps each provider's adaptive window (see ConcurrencyController.cap;
+        the caps outlive the call). Tasks are pulled from ``tasks`` only as
+        workers free up, and finished results wait in a bounded queue, so a
+        slow consumer stalls the batch instead of buffering it. Each result
+        carries ``metadata["task"]`` and ``metadata["task_index"]``; a task
+        that raises yields a failed result with ``metadata["error"]`` and
+        the others carry on. ``deadline`` (seconds) applies to each task.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        for provider, limit in (provider_limits or {}).items():
+            self._concurrency.cap(provider, limit)
+
+        pending: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue(maxsize=concurrency)
+        finished: asyncio.Queue[PipelineResult | None] = asyncio.Queue(maxsize=concurrency)
+
+        feed_error: list[Exception] = []
+
+        async def feed() -> None:
+            try:
+                index = 0
+                async for task in _aiter(tasks):
+                    await pending.put((index, task))
+                    index += 1
+            except Exception as e:  # noqa: BLE001 - re-raised once the queue drains
+                # Finish the tasks already queued, then re-raise to the caller.
+                feed_error.append(e)
+            for _ in range(concurrency):
+                await pending.put(None)
+
+        async def work() -> None:
+            while (item := await pending.get()) is not None:
+                index, task = item
+                try:
+                    result = await self.run(strategy, task, context, deadline)
+                except Exception as e:  # noqa: BLE001 - one task's failure is its result
+                    result = _failed_result(strategy, e)
+                result.metadata.update(task=task, task_index=index)
+                await finished.put(result)
+            await finished.put(None)
+
+        feeder = asyncio.ensure_future(feed())
+        workers = [asyncio.ensure_future(work()) for _ in range(concurrency)]
+        try:
+            running = concurrency
+            while running:
+                result = await finished.get()
+                if result is None:
+                    running -= 1
+                else:
+                    yield result
+            if feed_error:
+                raise feed_error[0]
+        finally:
+            # Reached early when the consumer stops iterating or feeding fails.
+            for job in (feeder, *workers):
+                job.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+
+    async def _execute_by(
+        self,
+        deadline: Deadline,
+        strategy: Strategy,
+        task: str,
+        context: dict[str, object] | None,
+    ) -> dict[str, object]:
+        # Strategies enforce the deadline themselves so they can keep partial
+        # output; this backstop only catches ones that ignore it.
+        try:
+            async with asyncio.timeout(deadline.remaining() + DEADLINE_GRACE):
+                return await strategy.execute(task, self._agents, context)
+        except TimeoutError as exc:
+            if not deadline.expired:
+                raise
+            raise DeadlineExceeded(
+                f"Strategy '{strategy.name}' overran its deadline"
+            ) from exc
+
+
+async def _aiter(tasks: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(tasks, AsyncIterable):
+        async for task in tasks:
+            yield task
+    else:
+        for task in tasks:
+            yield task
+
+
+def _failed_result(strategy: Strategy, error: Exception) -> PipelineResult:
+    """Stand-in result for a run_many task whose run raised."""
+    return PipelineResult(
+        code="",
+        confidence=ConfidenceReport(
+            architecture_preserved=False,
+            tests_passing=False,
+            vulnerabilities_found=0,
+            dependencies_verified=False,
+            owasp_clean=False,
+            models_consulted=0,
+            cross_vendor_agreement=0.0,
+        ),
+        security=SecurityAttestation(),
+        summary=f"Strategy: {strategy.name} (failed: {error})",
+        metadata={"error": f"{type(error).__name__}: {error}"},
+    )
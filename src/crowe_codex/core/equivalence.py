@@ -0,0 +1,132 @@
+"""Local code equivalence: how closely two agents' implementations agree."""
+
+from __future__ import annotations
+
+import ast
+import re
+from difflib import SequenceMatcher
+
+_FENCED = re.compile(r"```[\w+-]*[ \t]*\n(.*?)```", re.DOTALL)
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+_Function = ast.FunctionDef | ast.AsyncFunctionDef | ast.Lambda
+
+
+def extract_code(response: str) -> str:
+    """The code in a response: its fenced blocks if it has any, else all of it."""
+    blocks = _FENCED.findall(response)
+    return "\n".join(blocks) if blocks else response
+
+
+def canonical_python(code: str) -> str | None:
+    """``code`` with formatting, comments, docstrings, annotations and local names normalized.
+
+    Each function's parameters and local variables are renamed in order of
+    first appearance, so implementations that differ only in naming or
+    layout come out identical. Class and module fields declared with only
+    an annotation keep their names. None if ``code`` is not Python.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    tree = _Canonical().visit(tree)
+    return ast.unparse(ast.fix_missing_locations(tree))
+
+
+def token_similarity(a: str, b: str) -> float:
+    """Ratio of matching tokens between ``a`` and ``b``, 0 to 1."""
+    left, right = _TOKEN.findall(a), _TOKEN.findall(b)
+    if not left and not right:
+        return 1.0
+    return SequenceMatcher(None, left, right, autojunk=False).ratio()
+
+
+def agreement(a: str, b: str) -> float:
+    """How far two implementations agree, 0 to 1.
+
+    When both sides are Python the normalized ASTs decide: 1.0 if they are
+    identical (see canonical_python), else 0.0, since a one-token change
+    such as ``<`` for ``<=`` changes behaviour. Only code that doesn't parse
+    falls back to token similarity.
+    """
+    a, b = extract_code(a), extract_code(b)
+    canon_a, canon_b = canonical_python(a), canonical_python(b)
+    if canon_a is None or canon_b is None:
+        return token_similarity(a, b)
+    return 1.0 if canon_a == canon_b else 0.0
+
+
+class _Canonical(ast.NodeTransformer):
+    def __init__(self) -> None:
+        self.functions = 0
+        self.depth = 0  # how many functions the visitor is inside
+
+    def visit_Module(self, node: ast.Module) -> ast.AST:
+        node.body = _without_docstring(node.body)
+        return self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.AST:
+        node.body = _without_docstring(node.body)
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        node.body = _without_docstring(node.body)
+        node.returns = None
+        return self._rename(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.AST:
+        node.body = _without_docstring(node.body)
+        node.returns = None
+        return self._rename(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        return self._rename(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | None:
+        if node.value is not None:
+            return self.generic_visit(ast.Assign(targets=[node.target], value=node.value))
+        if self.depth:
+            return None  # a bare local annotation does nothing at runtime
+        # Class and module level: a dataclass, TypedDict or model field.
+        return self.generic_visit(ast.Expr(value=node.target))
+
+    def _rename(self, node: _Function) -> ast.AST:
+        # Nested functions are normalized first, under their own prefix.
+        self.depth += 1
+        try:
+            self.generic_visit(node)
+        finally:
+            self.depth -= 1
+        prefix = f"_f{self.functions}_"
+        self.functions += 1
+        names: dict[str, str] = {}
+        params = node.args
+        for arg in (*params.posonlyargs, *params.args, params.vararg,
+                    *params.kwonlyargs, params.kwarg):
+            if arg is not None:
+                canonical = f"{prefix}{len(names)}"
+                names[arg.arg] = canonical
+                arg.arg = canonical
+                arg.annotation = None
+        body = node.body if isinstance(node.body, list) else [node.body]
+        for statement in body:
+            for child in ast.walk(statement):
+                if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                    names.setdefault(child.id, f"{prefix}{len(names)}")
+        for statement in body:
+            for child in ast.walk(statement):
+                if isinstance(child, ast.Name) and child.id in names:
+                    child.id = names[child.id]
+        return node
+
+
+def _without_docstring(body: list[ast.stmt]) -> list[ast.stmt]:
+    first = body[0] if body else None
+    if (
+        isinstance(first, ast.Expr)
+        and isinstance(first.value, ast.Constant)
+        and isinstance(first.value.value, str)
+    ):
+        return body[1:] or [ast.Pass()]
+    return body
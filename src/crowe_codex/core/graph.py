@@ -0,0 +1,269 @@
+"""Stage graphs: strategies declare their agent calls, ready ones run at once."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import Prompt
+from crowe_codex.core.cache import ResponseCache, stage_key
+from crowe_codex.core.checkpoint import active_checkpoint
+
+# Builds a node's prompt from the outputs of its inputs, keyed by node name.
+PromptBuilder = Callable[[Mapping[str, str]], "str | Prompt"]
+# Replaces the plain ``agent.execute(prompt)`` call, e.g. for diff exchange.
+NodeRunner = Callable[[Agent, Mapping[str, str]], Awaitable[str]]
+
+
+@dataclass
+class StageNode:
+    """One agent call in a stage graph.
+
+    ``output`` names the strategy result key the node's output is stored
+    under as soon as it lands; ``then`` is called with the output too.
+    ``key`` is what, besides its inputs, a ``run`` node's output depends
+    on; such nodes are only memoized when they declare one. A node whose
+    ``when`` returns False for its inputs is skipped, and so is everything
+    downstream of it.
+    """
+
+    name: str
+    agent: str
+    prompt: PromptBuilder | None = None
+    inputs: tuple[str, ...] = ()
+    output: str | None = None
+    run: NodeRunner | None = None
+    then: Callable[[str], None] | None = None
+    key: str | None = None
+    when: Callable[[Mapping[str, str]], bool] | None = None
+
+
+@dataclass
+class NodeTiming:
+    """When a node ran, in seconds since its graph started."""
+
+    name: str
+    agent: str
+    started: float
+    finished: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.finished is None else self.finished - self.started
+
+
+# Called with each node's timing and output as the node lands.
+StageCallback = Callable[[NodeTiming, str], None]
+
+_stage_watcher: ContextVar[StageCallback | None] = ContextVar("stage_watcher", default=None)
+
+
+@contextmanager
+def watch_stages(callback: StageCallback) -> Iterator[None]:
+    """Report every graph node that finishes inside the block to ``callback``."""
+    token = _stage_watcher.set(callback)
+    try:
+        yield
+    finally:
+        _stage_watcher.reset(token)
+
+
+_stage_memo: ContextVar[ResponseCache | None] = ContextVar("stage_memo", default=None)
+
+
+@contextmanager
+def memoize_stages(cache: ResponseCache) -> Iterator[None]:
+    """Reuse graph node outputs from ``cache`` inside the block, keyed by their inputs."""
+    token = _stage_memo.set(cache)
+    try:
+        yield
+    finally:
+        _stage_memo.reset(token)
+
+
+@dataclass
+class GraphRun:
+    """Outputs and timings of a (possibly interrupted) graph run."""
+
+    outputs: dict[str, str] = field(default_factory=dict)
+    timings: dict[str, NodeTiming] = field(default_factory=dict)
+    inputs: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    def critical_path(self) -> list[str]:
+        """The chain of finished nodes that decided the run's length.
+
+        Starts from the last node to finish and walks back through the input
+        that finished last, i.e. the one the node was waiting on.
+        """
+        done = {n: t for n, t in self.timings.items() if t.finished is not None}
+        if not done:
+            return []
+        path = [max(done, key=lambda n: done[n].finished or 0.0)]
+        while True:
+            gating = [i for i in self.inputs.get(path[-1], ()) if i in done]
+            if not gating:
+                break
+            path.append(max(gating, key=lambda n: done[n].finished or 0.0))
+        return path[::-1]
+
+
+class StageGraph:
+    """A DAG of agent calls; every node whose inputs are ready runs concurrently.
+
+    Nodes may only take inputs from nodes added before them, so a graph is
+    acyclic by construction. ``run`` records each node's output in the
+    strategy's result dict as it lands (``within_deadline`` keeps those on
+    expiry), and the timings and critical path under ``stage_timings`` and
+    ``critical_path``, which the engine reports in the run metadata.
+
+    Inside an active RunCheckpoint, nodes saved by an earlier attempt of
+    the run are replayed instead of called, and every node that runs is
+    recorded to the checkpoint as it lands.
+
+    Inside ``memoize_stages``, a node whose content address (see
+    cache.stage_key: its rendered prompt or declared key, its inputs, the
+    agent's fingerprint and the graph's ``version``) was seen before reuses
+    that output instead of calling its agent. A changed node changes the
+    inputs of everything downstream, so exactly the affected nodes rerun;
+    they are listed under ``memoized_stages`` in the result. Bump
+    ``version`` when a strategy changes how it uses an output in a way its
+    prompts don't show.
+
+    Nodes skipped by their ``when`` (and their dependents) are listed under
+    ``skipped_stages``.
+    """
+
+    def __init__(self, version: str = "") -> None:
+        self.nodes: dict[str, StageNode] = {}
+        self.version = version
+
+    def add(
+        self,
+        name: str,
+        agent: str,
+        prompt: PromptBuilder | None = None,
+        inputs: tuple[str, ...] = (),
+        output: str | None = None,
+        run: NodeRunner | None = None,
+        then: Callable[[str], None] | None = None,
+        key: str | None = None,
+        when: Callable[[Mapping[str, str]], bool] | None = None,
+    ) -> StageNode:
+        if name in self.nodes:
+            raise ValueError(f"Duplicate stage node '{name}'")
+        unknown = [i for i in inputs if i not in self.nodes]
+        if unknown:
+            raise ValueError(f"Node '{name}' depends on undeclared nodes: {', '.join(unknown)}")
+        if (prompt is None) == (run is None):
+            raise ValueError(f"Node '{name}' needs exactly one of prompt or run")
+        node = StageNode(name, agent, prompt, tuple(inputs), output, run, then, key, when)
+        self.nodes[name] = node
+        return node
+
+    async def run(
+        self,
+        agents: Mapping[str, Agent],
+        result: dict[str, object] | None = None,
+    ) -> GraphRun:
+        """Run the graph to completion; the first failure cancels the rest."""
+        missing = sorted({n.agent for n in self.nodes.values()} - set(agents))
+        if missing:
+            raise KeyError(", ".join(missing))
+        result = {} if result is None else result
+        graph_run = GraphRun(inputs={n.name: n.inputs for n in self.nodes.values()})
+        start = time.monotonic()
+        waiting = dict(self.nodes)
+        running: dict[asyncio.Task[str], StageNode] = {}
+        checkpoint = active_checkpoint()
+        memo = _stage_memo.get()
+        restored: set[str] = set()
+        memoized: list[str] = []
+        memo_keys: dict[str, str] = {}
+
+        skipped: list[str] = []
+
+        def launch_ready() -> None:
+            # Nodes are in dependency order, so one pass settles skips too.
+            for name, node in list(waiting.items()):
+                if any(i in skipped for i in node.inputs):
+                    del waiting[name]
+                    skipped.append(name)
+                elif all(i in graph_run.outputs for i in node.inputs):
+                    del waiting[name]
+                    if node.when is not None and not node.when(
+                        {i: graph_run.outputs[i] for i in node.inputs}
+                    ):
+                        skipped.append(name)
+                        continue
+                    graph_run.timings[name] = NodeTiming(
+                        name, node.agent, time.monotonic() - start
+                    )
+                    running[asyncio.ensure_future(start_node(node))] = node
+
+        def start_node(node: StageNode) -> Awaitable[str]:
+            saved = checkpoint.restore(node.name, node.agent) if checkpoint else None
+            if saved is not None:
+                restored.add(node.name)
+                return _replay(saved)
+            agent = agents[node.agent]
+            inputs = {i: graph_run.outputs[i] for i in node.inputs}
+            prompt = node.prompt(inputs) if node.prompt is not None else None
+            material = str(prompt) if prompt is not None else node.key
+            if memo is not None and material is not None:
+                key = stage_key(
+                    self.version, node.name, agent.fingerprint(), material, inputs
+                )
+                hit = memo.get(key)
+                if hit is not None:
+                    memoized.append(node.name)
+                    return _replay(hit)
+                memo_keys[node.name] = key
+            if prompt is not None:
+                return agent.execute(prompt)
+            assert node.run is not None
+            return node.run(agent, inputs)
+
+        try:
+            launch_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = running.pop(task)
+                    output = task.result()
+                    graph_run.timings[node.name].finished = time.monotonic() - start
+                    graph_run.outputs[node.name] = output
+                    if checkpoint is not None and node.name not in restored:
+                        checkpoint.record(node.name, node.agent, output)
+                    key = memo_keys.pop(node.name, None)
+                    if memo is not None and key and agents[node.agent].is_cacheable(output):
+                        memo.put(key, output)
+                    if node.output is not None:
+                        result[node.output] = output
+                    if node.then is not None:
+                        node.then(output)
+                    if (watcher := _stage_watcher.get()) is not None:
+                        watcher(graph_run.timings[node.name], output)
+                launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            result["stage_timings"] = {
+                n: t.duration for n, t in graph_run.timings.items() if t.duration is not None
+            }
+            result["critical_path"] = graph_run.critical_path()
+            if memo is not None:
+                result["memoized_stages"] = memoized
+            if skipped:
+                result["skipped_stages"] = skipped
+        return graph_run
+
+
+async def _replay(output: str) -> str:
+    return output
@@ -0,0 +1,221 @@
+"""Cached health probing: agent availability without a round trip per call."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+from crowe_codex.core.resilience import is_retryable
+
+# Seconds a healthy probe result is trusted before probing again.
+DEFAULT_TTL = 30.0
+# Seconds an unhealthy result stands, so a recovered provider is noticed soon.
+DEFAULT_FAILURE_TTL = 5.0
+
+
+@dataclass
+class HealthState:
+    """Last known availability of one agent."""
+
+    available: bool
+    checked_at: float
+    error: str = ""
+    probes: int = 0
+    demotions: int = 0
+
+
+class HealthProbe:
+    """TTL cache in front of an availability probe.
+
+    Concurrent checks of a stale entry share one probe. ``demote`` marks
+    the target unavailable at once, when a real call fails; ``confirm``
+    refreshes it after a real call succeeds, which counts as a probe.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], Awaitable[bool]],
+        ttl: float = DEFAULT_TTL,
+        failure_ttl: float = DEFAULT_FAILURE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._probe = probe
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._clock = clock
+        self._state: HealthState | None = None
+        self._inflight: asyncio.Future[bool] | None = None
+
+    @property
+    def state(self) -> HealthState | None:
+        return self._state
+
+    def known(self) -> bool | None:
+        """Cached availability if still fresh, else None."""
+        state = self._state
+        if state is None:
+            return None
+        ttl = self.ttl if state.available else self.failure_ttl
+        if self._clock() - state.checked_at >= ttl:
+            return None
+        return state.available
+
+    async def check(self) -> bool:
+        known = self.known()
+        if known is not None:
+            return known
+        return await self.refresh()
+
+    async def refresh(self) -> bool:
+        """Probe now, joining a probe already in flight."""
+        if self._inflight is not None:
+            return await asyncio.shield(self._inflight)
+        self._inflight = asyncio.get_running_loop().create_future()
+        try:
+            try:
+                available = bool(await self._probe())
+                error = "" if available else "probe failed"
+            except Exception as e:  # noqa: BLE001 - any probe failure means unavailable
+                available, error = False, str(e) or type(e).__name__
+            self._set(available, error).probes += 1
+            self._inflight.set_result(available)
+            return available
+        finally:
+            if not self._inflight.done():
+                self._inflight.cancel()  # release callers joined to a cancelled probe
+            self._inflight = None
+
+    def demote(self, error: str = "") -> None:
+        self._set(False, error or "call failed").demotions += 1
+
+    def confirm(self) -> None:
+        self._set(True, "")
+
+    def _set(self, available: bool, error: str) -> HealthState:
+        previous = self._state
+        self._state = HealthState(
+            available=available,
+            checked_at=self._clock(),
+            error=error,
+            probes=previous.probes if previous else 0,
+            demotions=previous.demotions if previous else 0,
+        )
+        return self._state
+
+
+class HealthMonitor:
+    """Availability of every registered agent, by role name.
+
+    Each role's ``is_available`` is cached behind a HealthProbe; ``start``
+    re-probes stale roles in the background so callers never wait on a
+    probe. Unknown roles count as available.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        failure_ttl: float = DEFAULT_FAILURE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._clock = clock
+        self._probes: dict[str, HealthProbe] = {}
+        self._providers: dict[str, str] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def watch(self, name: str, agent: Agent) -> HealthProbe:
+        probe = HealthProbe(agent.is_available, self.ttl, self.failure_ttl, self._clock)
+        self._probes[name] = probe
+        self._providers[name] = agent.config.provider
+        return probe
+
+    def probe_for(self, name: str) -> HealthProbe | None:
+        return self._probes.get(name)
+
+    async def check(self, name: str) -> bool:
+        probe = self._probes.get(name)
+        return True if probe is None else await probe.check()
+
+    async def refresh(self) -> dict[str, bool]:
+        """Probe every stale role concurrently."""
+        stale = [name for name, probe in self._probes.items() if probe.known() is None]
+        results = await asyncio.gather(*(self._probes[n].refresh() for n in stale))
+        return dict(zip(stale, results, strict=True))
+
+    def is_healthy(self, name: str) -> bool:
+        """Last known state, without probing. Unknown and stale count as healthy."""
+        probe = self._probes.get(name)
+        known = probe.known() if probe else None
+        return True if known is None else known
+
+    def provider_healthy(self, provider: str) -> bool | None:
+        """Whether any role on ``provider`` is healthy; None if none watched."""
+        names = [n for n, p in self._providers.items() if p == provider]
+        if not names:
+            return None
+        return any(self.is_healthy(n) for n in names)
+
+    def states(self) -> dict[str, HealthState]:
+        return {n: p.state for n, p in self._probes.items() if p.state is not None}
+
+    def start(self, interval: float | None = None) -> None:
+        """Re-probe stale roles every ``interval`` seconds in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval or self.failure_ttl))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(interval)
+
+
+class HealthCheckedAgent(AgentWrapper):
+    """Feeds real call outcomes into a role's HealthProbe.
+
+    A transient failure (see resilience.is_retryable) demotes the role
+    immediately; a successful call refreshes it, saving the next probe.
+    Errors that say nothing about the provider's health, such as client
+    errors, an over-long prompt or an open circuit, leave it alone.
+    ``is_available`` answers from the cache.
+    """
+
+    def __init__(self, inner: Agent, probe: HealthProbe) -> None:
+        super().__init__(inner)
+        self.probe = probe
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        try:
+            response = await self.inner.execute(prompt, context)
+        except Exception as e:
+            if is_retryable(e):
+                self.probe.demote(str(e) or type(e).__name__)
+            raise
+        self.probe.confirm()
+        return response
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        try:
+            async for chunk in self.inner.execute_stream(prompt, context):
+                yield chunk
+        except Exception as e:
+            if is_retryable(e):
+                self.probe.demote(str(e) or type(e).__name__)
+            raise
+        self.probe.confirm()
+
+    async def is_available(self) -> bool:
+        return await self.probe.check()
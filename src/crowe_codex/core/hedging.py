@@ -0,0 +1,219 @@
+"""Hedged requests: race a backup replica when the primary runs past its usual latency."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+
+DEFAULT_WINDOW = 100
+
+
+@dataclass
+class HedgePolicy:
+    """When to fire a backup request for a stage.
+
+    A backup goes out once the primary has been running longer than the
+    ``percentile`` of its recent latencies. Until ``min_samples`` calls have
+    been observed, ``initial_delay`` is used instead (None disables hedging
+    during warm-up).
+    """
+
+    percentile: float = 0.95
+    min_samples: int = 5
+    initial_delay: float | None = None
+    max_hedges: int = 1
+
+
+@dataclass
+class HedgeRecord:
+    """Which replica answered one hedged call."""
+
+    agent: str
+    replica: str
+    hedged: bool
+    latency_ms: float
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedges_fired: int = 0
+    wins: dict[str, int] = field(default_factory=dict)
+
+
+_records: ContextVar[list[HedgeRecord] | None] = ContextVar("hedge_records", default=None)
+
+
+@contextmanager
+def record_hedges() -> Iterator[list[HedgeRecord]]:
+    """Collect HedgeRecords for every hedged call made inside the block."""
+    records: list[HedgeRecord] = []
+    token = _records.set(records)
+    try:
+        yield records
+    finally:
+        _records.reset(token)
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies (seconds)."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(p * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+
+class HedgedAgent(AgentWrapper):
+    """Races equivalent replicas against a slow primary; the first answer wins.
+
+    Replicas must be interchangeable with the primary (a second model, a
+    second Ollama host). Losing requests are cancelled. A replica is also
+    launched immediately if the request in flight fails. Answers from a
+    replica whose fingerprint differs from the primary's are not cached.
+    """
+
+    def __init__(
+        self,
+        inner: Agent,
+        replicas: list[Agent],
+        policy: HedgePolicy | None = None,
+        name: str = "",
+    ) -> None:
+        super().__init__(inner)
+        self.replicas = replicas
+        self.policy = policy or HedgePolicy()
+        self.name = name or inner.config.name
+        self.latency = LatencyTracker()
+        self._labels = self._label_replicas([inner, *replicas])
+        self._stats = HedgeStats()
+        # Answers from replicas the cache can't key, insertion-ordered to bound it.
+        self._backup_answers: dict[str, None] = {}
+
+    def prepare(self, task: str) -> None:
+        for agent in (self.inner, *self.replicas):
+            agent.prepare(task)
+
+    def stats(self) -> HedgeStats:
+        return HedgeStats(
+            calls=self._stats.calls,
+            hedges_fired=self._stats.hedges_fired,
+            wins=dict(self._stats.wins),
+        )
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait on the primary before firing a backup."""
+        if len(self.latency) < self.policy.min_samples:
+            return self.policy.initial_delay
+        return self.latency.percentile(self.policy.percentile)
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        self._stats.calls += 1
+        candidates = [self.inner, *self.replicas][: self.policy.max_hedges + 1]
+        delay = self.hedge_delay()
+        start = time.monotonic()
+        running: dict[asyncio.Future[str], int] = {}
+        launched = 0
+        last_error: BaseException | None = None
+
+        def launch() -> None:
+            nonlocal launched
+            agent = candidates[launched]
+            running[asyncio.ensure_future(agent.execute(prompt, context))] = launched
+            launched += 1
+
+        launch()
+        try:
+            while running:
+                timeout = None
+                if delay is not None and launched < len(candidates):
+                    timeout = max(start + delay * launched - time.monotonic(), 0)
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self._stats.hedges_fired += 1
+                    launch()
+                    continue
+                for future in done:
+                    index = running.pop(future)
+                    if future.exception() is not None:
+                        last_error = future.exception()
+                        continue
+                    primary_running = 0 in running.values()
+                    self._record(index, launched > 1, time.monotonic() - start, primary_running)
+                    return self._mark(index, future.result())
+                if not running and launched < len(candidates):
+                    launch()
+        finally:
+            for future in running:
+                future.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        assert last_error is not None
+        raise last_error
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        # Hedging trades time-to-first-token for tail latency: deliver whole.
+        yield await self.execute(prompt, context)
+
+    def is_cacheable(self, response: str) -> bool:
+        if response in self._backup_answers:
+            del self._backup_answers[response]
+            return False
+        return self.inner.is_cacheable(response)
+
+    def _mark(self, index: int, response: str) -> str:
+        # The cache keys answers by the primary's fingerprint; a replica that
+        # fingerprints differently must not have its answer stored under it.
+        replica = [self.inner, *self.replicas][index]
+        if index and replica.fingerprint() != self.inner.fingerprint():
+            self._backup_answers[response] = None
+            while len(self._backup_answers) > DEFAULT_WINDOW:
+                del self._backup_answers[next(iter(self._backup_answers))]
+        return response
+
+    def _record(self, index: int, hedged: bool, elapsed: float, primary_running: bool) -> None:
+        label = self._labels[index]
+        if index == 0 or primary_running:
+            # A primary cancelled by a winning backup ran at least this long;
+            # leaving it out would bias the percentile low and hedge less.
+            self.latency.observe(elapsed)
+        self._stats.wins[label] = self._stats.wins.get(label, 0) + 1
+        records = _records.get()
+        if records is not None:
+            records.append(HedgeRecord(
+                agent=self.name, replica=label, hedged=hedged, latency_ms=elapsed * 1000,
+            ))
+
+    @staticmethod
+    def _label_replicas(agents: list[Agent]) -> list[str]:
+        labels: list[str] = []
+        for i, agent in enumerate(agents):
+            label = agent.config.name
+            if agent.config.base_url:
+                label = f"{label}@{agent.config.base_url}"
+            if label in labels:
+                label = f"{label}#{i}"
+            labels.append(label)
+        return labels
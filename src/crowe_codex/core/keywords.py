@@ -0,0 +1,135 @@
+"""Compiled keyword classification shared by the task routers."""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Mapping
+
+DEFAULT_MEMO_SIZE = 1024
+
+
+class KeywordMatcher:
+    """Classifies text against labelled keyword tables in one pass.
+
+    Keywords are compiled into an Aho-Corasick automaton, so matching costs
+    one walk over the lowercased text however large the tables grow, and
+    overlapping keywords ("protein" inside "protein folding") all count,
+    exactly as substring tests would. Results are memoized per text.
+    Tables can be extended with ``add``; the automaton is rebuilt lazily.
+    """
+
+    def __init__(
+        self,
+        tables: Mapping[str, Iterable[str]] | None = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ) -> None:
+        self.memo_size = memo_size
+        self._tables: dict[str, list[str]] = {}
+        self._memo: OrderedDict[str, dict[str, int]] = OrderedDict()
+        self._compiled = False
+        self._goto: list[dict[str, int]] = []
+        self._fail: list[int] = []
+        self._out: list[tuple[int, ...]] = []
+        self._keyword_labels: list[tuple[str, ...]] = []
+        for label, keywords in (tables or {}).items():
+            self.add(label, keywords)
+
+    @property
+    def tables(self) -> dict[str, list[str]]:
+        return {label: list(keywords) for label, keywords in self._tables.items()}
+
+    def add(self, label: str, keywords: Iterable[str]) -> None:
+        """Add keywords to ``label`` (creating it after existing labels)."""
+        table = self._tables.setdefault(label, [])
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword and keyword not in table:
+                table.append(keyword)
+        self._compiled = False
+        self._memo.clear()
+
+    def counts(self, text: str) -> dict[str, int]:
+        """Distinct keywords of each label found in ``text``, in table order.
+
+        Labels without a match are omitted.
+        """
+        cached = self._memo.get(text)
+        if cached is not None:
+            self._memo.move_to_end(text)
+            return dict(cached)
+
+        found = self._scan(text.lower())
+        hits: dict[str, int] = {}
+        for keyword_id in sorted(found):
+            for label in self._keyword_labels[keyword_id]:
+                hits[label] = hits.get(label, 0) + 1
+        ordered = {label: hits[label] for label in self._tables if label in hits}
+
+        self._memo[text] = ordered
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return dict(ordered)
+
+    def labels(self, text: str) -> list[str]:
+        """Labels with at least one keyword in ``text``, in table order."""
+        return list(self.counts(text))
+
+    def best(self, text: str) -> str | None:
+        """The label with the most matching keywords; earlier labels win ties."""
+        counts = self.counts(text)
+        if not counts:
+            return None
+        return max(counts, key=lambda label: counts[label])
+
+    def _scan(self, text: str) -> set[int]:
+        if not self._compiled:
+            self._compile()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def _compile(self) -> None:
+        labels_by_keyword: dict[str, list[str]] = {}
+        for label, keywords in self._tables.items():
+            for keyword in keywords:
+                labels_by_keyword.setdefault(keyword, []).append(label)
+
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        self._keyword_labels = []
+        for keyword_id, (keyword, labels) in enumerate(labels_by_keyword.items()):
+            self._keyword_labels.append(tuple(labels))
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(keyword_id)
+
+        # Breadth-first failure links; each state also reports the keywords
+        # ending at its longest proper suffix state.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0) if goto[link].get(char) != child else 0
+                outputs[child].extend(outputs[fail[child]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in outputs]
+        self._compiled = True
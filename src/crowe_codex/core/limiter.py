@@ -0,0 +1,205 @@
+"""Per-provider adaptive concurrency limiting (AIMD) with rate-limit awareness."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+
+DEFAULT_INITIAL_LIMIT = 4.0
+DEFAULT_MIN_LIMIT = 1.0
+DEFAULT_MAX_LIMIT = 64.0
+DEFAULT_BACKOFF = 0.5
+
+
+def is_overload(exc: BaseException) -> bool:
+    """True for provider 429s and timeouts — the signals that we are sending too fast."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    if isinstance(exc, TimeoutError):
+        return True
+    return "timeout" in type(exc).__name__.lower()
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds the provider asked us to wait, from Retry-After style headers."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class LimiterStats:
+    """Snapshot of one provider's concurrency window."""
+
+    limit: float
+    in_flight: int
+    successes: int = 0
+    overloads: int = 0
+    blocked_for: float = 0.0
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease concurrency window.
+
+    Each success grows the window by ``1 / limit`` (about one slot per
+    round-trip of the whole window); a 429 or timeout multiplies it by
+    ``backoff``. A Retry-After hint pauses new calls until it elapses.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = DEFAULT_INITIAL_LIMIT,
+        min_limit: float = DEFAULT_MIN_LIMIT,
+        max_limit: float = DEFAULT_MAX_LIMIT,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self._limit = min(max(initial_limit, min_limit), max_limit)
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._successes = 0
+        self._overloads = 0
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one unit of concurrency for the duration of a call."""
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                delay = self._blocked_until - time.monotonic()
+                if delay <= 0 and self._in_flight < int(self._limit):
+                    break
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=max(delay, 0) or None)
+                except TimeoutError:
+                    pass
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    def cap(self, max_limit: float) -> None:
+        """Lower (or raise) the ceiling the window may grow to."""
+        self.max_limit = max(max_limit, self.min_limit)
+        self._limit = min(self._limit, self.max_limit)
+
+    def on_success(self) -> None:
+        self._successes += 1
+        self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+
+    def on_overload(self, wait: float | None = None) -> None:
+        self._overloads += 1
+        self._limit = max(self._limit * self.backoff, self.min_limit)
+        if wait:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            limit=self._limit,
+            in_flight=self._in_flight,
+            successes=self._successes,
+            overloads=self._overloads,
+            blocked_for=max(self._blocked_until - time.monotonic(), 0.0),
+        )
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside a running loop.
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+
+class ConcurrencyController:
+    """One AdaptiveLimiter per provider, created on first use."""
+
+    def __init__(self, **limiter_options: float) -> None:
+        self._options = limiter_options
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+
+    def limiter_for(self, provider: str) -> AdaptiveLimiter:
+        if provider not in self._limiters:
+            self._limiters[provider] = AdaptiveLimiter(**self._options)
+        return self._limiters[provider]
+
+    def cap(self, provider: str, max_limit: float) -> None:
+        """Never let ``provider`` run more than ``max_limit`` calls at once."""
+        self.limiter_for(provider).cap(max_limit)
+
+    def windows(self) -> dict[str, float]:
+        """Current concurrency window per provider."""
+        return {name: limiter.limit for name, limiter in self._limiters.items()}
+
+    def stats(self) -> dict[str, LimiterStats]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+class LimitedAgent(AgentWrapper):
+    """Routes every call through its provider's adaptive concurrency window."""
+
+    def __init__(self, inner: Agent, limiter: AdaptiveLimiter) -> None:
+        super().__init__(inner)
+        self.limiter = limiter
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        async with self.limiter.slot():
+            try:
+                response = await self.inner.execute(prompt, context)
+            except Exception as exc:
+                if is_overload(exc):
+                    self.limiter.on_overload(retry_after(exc))
+                raise
+            self.limiter.on_success()
+        return response
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        async with self.limiter.slot():
+            try:
+                async for chunk in self.inner.execute_stream(prompt, context):
+                    yield chunk
+            except Exception as exc:
+                if is_overload(exc):
+                    self.limiter.on_overload(retry_after(exc))
+                raise
+            self.limiter.on_success()
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.health import HealthProbe
+from crowe_codex.core.usage import TokenUsage, report_usage
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+NIM_UNAVAILABLE_MARKER = "[NIM_UNAVAILABLE]"
+MAX_TOKENS = 4096
+TEMPERATURE = 0.1
+DEFAULT_BASE_URL = "https://integrate.api.nvidia.com/v1"
+DEFAULT_MODEL = "nvidia/nemotron-4-340b"
 
 # NIM microservice endpoints for different tasks
 NIM_ENDPOINTS = {
@@ -29,19 +42,29 @@ class NimBatchRequest:
 
 @dataclass
 class NimBatchResult:
-    """Results from a NIM batch inference call."""
+    """Results from a NIM batch inference call.
+
+    Per-request lists are in prompt order. ``latency_ms`` is the wall-clock
+    time of the whole batch; ``latencies_ms`` times each request from its
+    dispatch to its response.
+    """
 
     responses: list[str] = field(default_factory=list)
     model: str = ""
     total_tokens: int = 0
     latency_ms: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+    usage: list[TokenUsage | None] = field(default_factory=list)
+    errors: dict[int, str] = field(default_factory=dict)
 
 
 class NimAgent(Agent):
     """NVIDIA NIM agent for GPU-accelerated batch inference.
 
     Uses NVIDIA NIM microservices for high-throughput code analysis.
-    Falls back gracefully when NIM is unavailable.
+    Falls back gracefully when NIM is not configured or has just failed;
+    a request that fails is demoted and raised, so the engine's retries
+    and circuit breaker see the failure.
     """
 
     def __init__(
@@ -53,11 +76,13 @@ class NimAgent(Agent):
             config = AgentConfig(
                 name="nim",
                 provider="nvidia",
-                model="nvidia/nemotron-4-340b",
+                model=DEFAULT_MODEL,
             )
         super().__init__(config)
+        self.model = config.model or DEFAULT_MODEL
         self.batch_size = batch_size
-        self._client = None
+        self._client: AsyncOpenAI | None = None
+        self.health = HealthProbe(self._probe)
 
     async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
         """Execute a single prompt via NIM."""
@@ -66,57 +91,174 @@ class NimAgent(Agent):
 
         try:
             return await self._nim_execute(prompt)
-        except Exception:
-            return await self._fallback_execute(prompt)
+        except Exception as e:
+            self.health.demote(str(e))
+            raise
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        """Stream a single prompt via NIM."""
+        client = self._get_client() if await self.is_available() else None
+        if client is None:
+            yield await self._fallback_execute(prompt)
+            return
+
+        try:
+            stream = await client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                stream=True,
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            self.health.demote(str(e))
+            raise
 
     async def batch_execute(self, prompts: list[str]) -> list[str]:
-        """Execute multiple prompts in parallel batches via NIM."""
+        """Execute multiple prompts, ``batch_size`` in flight at a time."""
+        return (await self.batch_run(prompts)).responses
+
+    async def batch_run(self, prompts: list[str]) -> NimBatchResult:
+        """Like batch_execute, with per-request latency and token usage."""
+        result = NimBatchResult()
+        async for _ in self.as_completed(prompts, result):
+            pass
+        return result
+
+    async def as_completed(
+        self, prompts: list[str], result: NimBatchResult | None = None
+    ) -> AsyncIterator[tuple[int, str]]:
+        """Yield ``(index, response)`` as each response lands.
+
+        A sliding window keeps ``batch_size`` requests in flight: each
+        completion immediately dispatches the next prompt, so one slow
+        request never idles the rest. Failed requests yield a "NIM error"
+        response. Pass ``result`` to have it filled in as responses arrive.
+        """
+        result = result if result is not None else NimBatchResult()
+        result.model = self.model
+        result.responses = [""] * len(prompts)
+        result.latencies_ms = [0.0] * len(prompts)
+        result.usage = [None] * len(prompts)
+        started = time.monotonic()
+
         if not await self.is_available():
-            return [await self._fallback_execute(p) for p in prompts]
-
-        results = []
-        for i in range(0, len(prompts), self.batch_size):
-            batch = prompts[i : i + self.batch_size]
-            batch_results = await asyncio.gather(
-                *(self._nim_execute(p) for p in batch),
-                return_exceptions=True,
-            )
-            for r in batch_results:
-                if isinstance(r, Exception):
-                    results.append(f"NIM error: {r}")
-                else:
-                    results.append(r)
-        return results
+            for index, prompt in enumerate(prompts):
+                result.responses[index] = await self._fallback_execute(prompt)
+                yield index, result.responses[index]
+            return
+
+        pending = iter(enumerate(prompts))
+        in_flight: dict[asyncio.Task[tuple[str, TokenUsage | None]], tuple[int, float]] = {}
+
+        def dispatch() -> None:
+            item = next(pending, None)
+            if item is not None:
+                index, prompt = item
+                task = asyncio.create_task(self._nim_call(prompt))
+                in_flight[task] = (index, time.monotonic())
+
+        try:
+            for _ in range(max(self.batch_size, 1)):
+                dispatch()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, sent = in_flight.pop(task)
+                    dispatch()
+                    result.latencies_ms[index] = (time.monotonic() - sent) * 1000
+                    try:
+                        response, usage = task.result()
+                    except Exception as e:  # noqa: BLE001 - recorded per prompt in the result
+                        self.health.demote(str(e))
+                        response = f"NIM error: {e}"
+                        result.errors[index] = str(e)
+                    else:
+                        result.usage[index] = usage
+                        if usage is not None:
+                            result.total_tokens += usage.input_tokens + usage.output_tokens
+                    result.responses[index] = response
+                    result.latency_ms = (time.monotonic() - started) * 1000
+                    yield index, response
+        finally:
+            for task in in_flight:
+                task.cancel()
+            # Reap them, or a consumer that stops early leaves pending tasks behind.
+            await asyncio.gather(*in_flight, return_exceptions=True)
 
     async def is_available(self) -> bool:
-        """Check if NIM is configured and reachable."""
+        """Check if NIM is configured and has not just failed a request."""
+        return await self.health.check()
+
+    async def _probe(self) -> bool:
         return bool(self.config.api_key)
 
-    async def _nim_execute(self, prompt: str) -> str:
-        """Execute via NVIDIA NIM API (OpenAI-compatible endpoint)."""
-        try:
-            from openai import AsyncOpenAI
-        except ImportError:
-            return await self._fallback_execute(prompt)
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        return {
+            "provider": self.config.provider,
+            "model": self.model,
+            "base_url": self.config.base_url or DEFAULT_BASE_URL,
+            "max_tokens": MAX_TOKENS,
+            "temperature": TEMPERATURE,
+        }
+
+    def is_cacheable(self, response: str) -> bool:
+        return not response.startswith(NIM_UNAVAILABLE_MARKER)
 
+    def _get_client(self) -> AsyncOpenAI | None:
+        """Build the OpenAI-compatible NIM client, or None without the SDK."""
         if self._client is None:
-            base_url = self.config.base_url or "https://integrate.api.nvidia.com/v1"
+            try:
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+            except ImportError:
+                return None
+            base_url = self.config.base_url or DEFAULT_BASE_URL
+            http_client = None
+            if self.transport is not None:
+                http_client = self.transport.client(base_url, DefaultAsyncHttpxClient)
             self._client = AsyncOpenAI(
                 api_key=self.config.api_key,
                 base_url=base_url,
+                http_client=http_client,
             )
+        return self._client
 
-        response = await self._client.chat.completions.create(
-            model=self.config.model,
+    async def _nim_execute(self, prompt: str) -> str:
+        """Execute via NVIDIA NIM API (OpenAI-compatible endpoint)."""
+        response, _ = await self._nim_call(prompt)
+        return response
+
+    async def _nim_call(self, prompt: str) -> tuple[str, TokenUsage | None]:
+        client = self._get_client()
+        if client is None:
+            return await self._fallback_execute(prompt), None
+
+        response = await client.chat.completions.create(
+            model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=4096,
-            temperature=0.1,
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
         )
-        return response.choices[0].message.content or ""
+        usage = None
+        if response.usage is not None:
+            usage = TokenUsage(
+                provider=self.config.provider,
+                model=self.model,
+                input_tokens=response.usage.prompt_tokens or 0,
+                output_tokens=response.usage.completion_tokens or 0,
+                prompt_chars=len(prompt),
+            )
+            report_usage(usage)
+        return response.choices[0].message.content or "", usage
 
     async def _fallback_execute(self, prompt: str) -> str:
         """Fallback when NIM is unavailable — return a pass-through marker."""
-        return f"[NIM_UNAVAILABLE] Stage 4 skipped. Prompt: {prompt[:100]}..."
+        return f"{NIM_UNAVAILABLE_MARKER} Stage 4 skipped. Prompt: {prompt[:100]}..."
 
     def build_accelerator_prompt(self, code: str, task: str = "") -> str:
         """Build a prompt optimized for NIM's code analysis capabilities."""
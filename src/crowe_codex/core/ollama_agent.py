@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
-from ollama import AsyncClient
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
-from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.agent import Agent, AgentConfig, current_task
+from crowe_codex.core.health import HealthProbe
+from crowe_codex.core.keywords import KeywordMatcher
+from crowe_codex.core.residency import ModelResidency
+from crowe_codex.core.usage import TokenUsage, report_usage
+
+if TYPE_CHECKING:
+    from ollama import AsyncClient, ChatResponse
 
 DEFAULT_MODEL = "Mcrowe1210/DeepParallel"
+DEFAULT_HOST = "http://localhost:11434"
 
 DOMAIN_MODELS = {
     "physics": "Mcrowe1210/DeepParallel-Physics",
@@ -38,56 +47,120 @@ DOMAIN_KEYWORDS: dict[str, list[str]] = {
 class DeepParallelRouter:
     """Routes tasks to the best DeepParallel specialist model."""
 
-    def route(self, task: str) -> str:
-        task_lower = task.lower()
-        scores: dict[str, int] = {}
+    def __init__(
+        self,
+        matcher: KeywordMatcher | None = None,
+        models: dict[str, str] | None = None,
+    ) -> None:
+        self.matcher = matcher or KeywordMatcher(DOMAIN_KEYWORDS)
+        self.models = dict(DOMAIN_MODELS if models is None else models)
 
-        for domain, keywords in DOMAIN_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw.lower() in task_lower)
-            if score > 0:
-                scores[domain] = score
+    def add_domain(self, domain: str, model: str, keywords: list[str]) -> None:
+        """Route tasks matching ``keywords`` to ``model``."""
+        self.models[domain] = model
+        self.matcher.add(domain, keywords)
 
-        if not scores:
+    def route(self, task: str) -> str:
+        best_domain = self.matcher.best(task)
+        if best_domain is None or best_domain not in self.models:
             return DEFAULT_MODEL
-
-        best_domain = max(scores, key=lambda k: scores[k])
-        return DOMAIN_MODELS[best_domain]
+        return self.models[best_domain]
 
 
 class OllamaAgent(Agent):
     """Ollama agent for local model inference with DeepParallel routing."""
 
-    def __init__(self, config: AgentConfig) -> None:
+    def __init__(self, config: AgentConfig, router: DeepParallelRouter | None = None) -> None:
         super().__init__(config)
         self.model = config.model or DEFAULT_MODEL
-        self._router = DeepParallelRouter()
+        self._router = router or DeepParallelRouter()
         self._client: AsyncClient | None = None
+        self.health = HealthProbe(self._probe)
+        self.residency = ModelResidency(self._get_client)
 
     def _get_client(self) -> AsyncClient:
         if self._client is None:
-            host = self.config.base_url or "http://localhost:11434"
-            self._client = AsyncClient(host=host)
+            from ollama import AsyncClient
+
+            host = self.config.base_url or DEFAULT_HOST
+            kwargs = self.transport.client_kwargs(host) if self.transport else {}
+            self._client = AsyncClient(host=host, **kwargs)
         return self._client
 
+    def _resolve_model(self, context: dict[str, object] | None) -> str:
+        task = context.get("task") if context else None
+        task = task or current_task()
+        if not task:
+            return self.model
+        routed = self._router.route(str(task))
+        # General tasks keep the configured model.
+        return self.model if routed == DEFAULT_MODEL else routed
+
+    def prepare(self, task: str) -> None:
+        """Start loading the specialist model routed for ``task``."""
+        self.residency.prefetch(self._resolve_model({"task": task}))
+
     async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
         client = self._get_client()
-        model = self.model
-        if context and "task" in context:
-            model = self._router.route(str(context["task"]))
-
-        response = await client.chat(
+        model = self._resolve_model(context)
+
+        async with self.residency.slot(model):
+            try:
+                response = await client.chat(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    keep_alive=self.residency.keep_alive(model),
+                )
+            except Exception as e:
+                self.health.demote(str(e))
+                raise
+        self.health.confirm()
+        self.residency.note_use(model)
+        self._report_usage(response, model, prompt)
+        return response.message.content or ""
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        client = self._get_client()
+        model = self._resolve_model(context)
+        async with self.residency.slot(model):
+            stream = await client.chat(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True,
+                keep_alive=self.residency.keep_alive(model),
+            )
+            async for part in stream:
+                content = part["message"]["content"]
+                if content:
+                    yield content
+                if part.get("done"):
+                    self._report_usage(part, model, prompt)
+        self.residency.note_use(model)
+
+    def _report_usage(self, response: ChatResponse, model: str, prompt: str) -> None:
+        report_usage(TokenUsage(
+            provider=self.config.provider,
             model=model,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return response["message"]["content"]
+            input_tokens=response.prompt_eval_count or 0,
+            output_tokens=response.eval_count or 0,
+            prompt_chars=len(prompt),
+        ))
 
     async def is_available(self) -> bool:
-        try:
-            client = self._get_client()
-            await client.list()
-            return True
-        except Exception:
-            return False
+        return await self.health.check()
+
+    async def _probe(self) -> bool:
+        await self._get_client().list()
+        return True
+
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        return {
+            "provider": self.config.provider,
+            "model": self._resolve_model(context),
+            "host": self.config.base_url or DEFAULT_HOST,
+        }
 
     def build_specialist_prompt(self, code: str, task: str) -> str:
         return (
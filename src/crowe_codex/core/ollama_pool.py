@@ -0,0 +1,151 @@
+"""Ollama pool: Stage 3 calls spread across several Ollama hosts."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.ollama_agent import DeepParallelRouter, OllamaAgent
+from crowe_codex.core.transport import TransportManager
+
+
+@dataclass
+class HostStats:
+    """Load and health of one pooled Ollama host."""
+
+    host: str
+    in_flight: int = 0
+    calls: int = 0
+    failures: int = 0
+    healthy: bool = True
+    resident: tuple[str, ...] = ()
+
+
+class OllamaPool(Agent):
+    """Dispatches each call to the best of several Ollama hosts.
+
+    Hosts that already have the routed DeepParallel model loaded are
+    preferred, then the one with the fewest requests in flight. A host
+    whose call fails is demoted (see HealthProbe) and the call fails over
+    to the next host; streams fail over only before their first token.
+    """
+
+    def __init__(
+        self,
+        hosts: list[str],
+        config: AgentConfig | None = None,
+        router: DeepParallelRouter | None = None,
+    ) -> None:
+        if not hosts:
+            raise ValueError("OllamaPool needs at least one host")
+        config = config or AgentConfig(name="ollama", provider="ollama")
+        super().__init__(config)
+        router = router or DeepParallelRouter()
+        self.hosts = [
+            OllamaAgent(config.model_copy(update={"base_url": host}), router=router)
+            for host in hosts
+        ]
+        self._stats = {id(h): HostStats(host=h.config.base_url) for h in self.hosts}
+
+    def stats(self) -> list[HostStats]:
+        stats = []
+        for host in self.hosts:
+            counts = self._stats[id(host)]
+            stats.append(HostStats(
+                host=counts.host,
+                in_flight=counts.in_flight,
+                calls=counts.calls,
+                failures=counts.failures,
+                healthy=host.health.known() is not False,
+                resident=tuple(sorted(host.residency.loaded())),
+            ))
+        return stats
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        model = self.hosts[0]._resolve_model(context)
+        error: Exception | None = None
+        for host in await self._ranked(model):
+            stats = self._stats[id(host)]
+            stats.in_flight += 1
+            stats.calls += 1
+            try:
+                return await host.execute(prompt, context)
+            except Exception as e:  # noqa: BLE001 - try the next host, re-raise the last
+                stats.failures += 1
+                error = e
+            finally:
+                stats.in_flight -= 1
+        assert error is not None
+        raise error
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        model = self.hosts[0]._resolve_model(context)
+        error: Exception | None = None
+        for host in await self._ranked(model):
+            stats = self._stats[id(host)]
+            stats.in_flight += 1
+            stats.calls += 1
+            started = False
+            try:
+                async for chunk in host.execute_stream(prompt, context):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                stats.failures += 1
+                host.health.demote(str(e))
+                if started:
+                    raise
+                error = e
+            finally:
+                stats.in_flight -= 1
+        assert error is not None
+        raise error
+
+    async def _ranked(self, model: str) -> list[OllamaAgent]:
+        """Healthy hosts, model-resident first, then least loaded.
+
+        Demoted hosts are still tried last, so a fully demoted pool keeps
+        probing with real calls rather than refusing outright.
+        """
+        healthy = [h for h in self.hosts if h.health.known() is not False]
+        await asyncio.gather(*(h.residency.resident() for h in healthy))
+        order = {id(h): i for i, h in enumerate(self.hosts)}
+        ranked = sorted(
+            healthy,
+            key=lambda h: (
+                not h.residency.is_resident(model),
+                self._stats[id(h)].in_flight,
+                order[id(h)],
+            ),
+        )
+        return ranked + [h for h in self.hosts if h not in healthy]
+
+    def prepare(self, task: str) -> None:
+        """Load the routed model on the least-loaded host unless one has it."""
+        model = self.hosts[0]._resolve_model({"task": task})
+        healthy = [h for h in self.hosts if h.health.known() is not False] or self.hosts
+        if any(h.residency.is_resident(model) for h in healthy):
+            return
+        host = min(healthy, key=lambda h: self._stats[id(h)].in_flight)
+        host.residency.prefetch(model)
+
+    async def is_available(self) -> bool:
+        return any(await asyncio.gather(*(h.is_available() for h in self.hosts)))
+
+    def fingerprint(self, context: dict[str, object] | None = None) -> dict[str, object]:
+        # Keyed by the whole pool, so any host's completion serves the others.
+        hosts = sorted(h.config.base_url for h in self.hosts)
+        return {**self.hosts[0].fingerprint(context), "host": hosts}
+
+    def bind_transport(self, transport: TransportManager) -> None:
+        super().bind_transport(transport)
+        for host in self.hosts:
+            host.bind_transport(transport)
+
+    def build_specialist_prompt(self, code: str, task: str) -> str:
+        return self.hosts[0].build_specialist_prompt(code, task)
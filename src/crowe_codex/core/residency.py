@@ -0,0 +1,194 @@
+"""Ollama model residency: keep the routed DeepParallel model loaded."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ollama import AsyncClient
+
+# keep_alive for models used occasionally, and for pinned or hot ones.
+DEFAULT_KEEP_ALIVE = "5m"
+PIN_KEEP_ALIVE = "1h"
+# Uses within HOT_WINDOW seconds after which a model is pinned.
+HOT_AFTER = 3
+HOT_WINDOW = 600.0
+# Seconds a /api/ps listing is trusted.
+PS_TTL = 2.0
+# Calls admitted for the active model while other models wait, before switching.
+MAX_GROUP = 8
+
+
+@dataclass
+class ResidencyStats:
+    prefetches: int = 0
+    switches: int = 0
+    ps_calls: int = 0
+
+
+class ModelResidency:
+    """Tracks and steers which models one Ollama host keeps loaded.
+
+    Loaded models come from the host's process listing (``/api/ps``),
+    corrected locally as calls land. Models that are pinned, or used
+    HOT_AFTER times within HOT_WINDOW, get a long ``keep_alive``.
+
+    ``slot`` groups calls by model: calls for the active model run at once,
+    while calls for a different model queue until the active group drains
+    (or has admitted ``max_group`` calls past waiters). The model with the
+    most waiters goes next, so consecutive calls share a loaded model
+    instead of evicting each other.
+    """
+
+    def __init__(
+        self,
+        client: Callable[[], AsyncClient],
+        keep_alive: str = DEFAULT_KEEP_ALIVE,
+        pin_keep_alive: str = PIN_KEEP_ALIVE,
+        max_group: int = MAX_GROUP,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self.default_keep_alive = keep_alive
+        self.pin_keep_alive = pin_keep_alive
+        self.max_group = max_group
+        self._clock = clock
+        self._resident: set[str] = set()
+        self._listed_at: float | None = None
+        self._pinned: set[str] = set()
+        self._uses: dict[str, list[float]] = {}
+        self._prefetching: dict[str, asyncio.Task[None]] = {}
+        self._active: str | None = None
+        self._last: str | None = None
+        self._running = 0
+        self._admitted = 0
+        self._waiting: Counter[str] = Counter()
+        self._changed = asyncio.Condition()
+        self._stats = ResidencyStats()
+
+    def stats(self) -> ResidencyStats:
+        return ResidencyStats(**vars(self._stats))
+
+    async def resident(self) -> set[str]:
+        """Models loaded on the host, from a recent ``/api/ps`` listing."""
+        now = self._clock()
+        if self._listed_at is None or now - self._listed_at >= PS_TTL:
+            try:
+                listing = await self._client().ps()
+            except Exception:  # noqa: BLE001 - a failed listing keeps the last known set
+                return set(self._resident)
+            self._stats.ps_calls += 1
+            self._resident = {m.model or m.name or "" for m in listing.models} - {""}
+            self._listed_at = now
+        return set(self._resident)
+
+    def is_resident(self, model: str) -> bool:
+        return model in self._resident
+
+    def loaded(self) -> set[str]:
+        """Last known loaded models, without asking the host."""
+        return set(self._resident)
+
+    def pin(self, model: str) -> None:
+        self._pinned.add(model)
+
+    def unpin(self, model: str) -> None:
+        self._pinned.discard(model)
+
+    def keep_alive(self, model: str) -> str:
+        if model in self._pinned or self._is_hot(model):
+            return self.pin_keep_alive
+        return self.default_keep_alive
+
+    def note_use(self, model: str) -> None:
+        """Record a completed call: the model is loaded and one use warmer."""
+        self._resident.add(model)
+        cutoff = self._clock() - HOT_WINDOW
+        uses = [t for t in self._uses.get(model, []) if t > cutoff]
+        uses.append(self._clock())
+        self._uses[model] = uses
+
+    def prefetch(self, model: str) -> None:
+        """Start loading ``model`` in the background unless already resident."""
+        if model in self._resident or model in self._prefetching:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._load(model))
+        except RuntimeError:
+            return
+        self._prefetching[model] = task
+        task.add_done_callback(lambda _: self._prefetching.pop(model, None))
+
+    async def _load(self, model: str) -> None:
+        if model in await self.resident():
+            return
+        # An empty generate request loads the model without running it.
+        with contextlib.suppress(Exception):
+            await self._client().generate(model=model, keep_alive=self.keep_alive(model))
+            self._stats.prefetches += 1
+            self._resident.add(model)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """Hold a place in ``model``'s group for the length of one call."""
+        async with self._changed:
+            self._waiting[model] += 1
+            try:
+                await self._changed.wait_for(lambda: self._admits(model))
+            except BaseException:
+                self._leave_queue(model)
+                self._hand_over()
+                raise
+            self._leave_queue(model)
+            if self._active is None:
+                self._activate(model)
+            self._admitted += 1
+            self._running += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._running -= 1
+                self._hand_over()
+
+    def _admits(self, model: str) -> bool:
+        if self._active is None:
+            return True
+        if self._active == model:
+            others_waiting = any(m != model for m in self._waiting)
+            return not others_waiting or self._admitted < self.max_group
+        return False
+
+    def _leave_queue(self, model: str) -> None:
+        self._waiting[model] -= 1
+        if not self._waiting[model]:
+            del self._waiting[model]
+
+    def _hand_over(self) -> None:
+        """Once the active group drains, give the host to the largest queue."""
+        if self._running:
+            return
+        others = [m for m in self._waiting if m != self._active]
+        if others:
+            self._activate(max(others, key=lambda m: self._waiting[m]))
+        elif self._active not in self._waiting:
+            self._active = None
+        else:
+            self._admitted = 0
+        self._changed.notify_all()
+
+    def _activate(self, model: str) -> None:
+        if self._last is not None and self._last != model:
+            self._stats.switches += 1
+        self._active = self._last = model
+        self._admitted = 0
+
+    def _is_hot(self, model: str) -> bool:
+        cutoff = self._clock() - HOT_WINDOW
+        return sum(1 for t in self._uses.get(model, []) if t > cutoff) >= HOT_AFTER
@@ -0,0 +1,236 @@
+"""Retry with jittered exponential backoff, and per-provider circuit breakers."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+from crowe_codex.core.limiter import is_overload, retry_after
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient provider failures: rate limits, timeouts, 5xx and dropped connections."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    if is_overload(exc) or isinstance(exc, ConnectionError):
+        return True
+    return "connection" in type(exc).__name__.lower()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+    def __init__(self, provider: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for '{provider}', retry in {retry_in:.1f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+@dataclass
+class RetryPolicy:
+    """Full-jitter exponential backoff for retryable errors."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+    def delay(self, attempt: int, exc: BaseException | None = None) -> float:
+        """Sleep before retry number ``attempt`` (1-based), at least any Retry-After hint."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        wait = random.uniform(0, ceiling)
+        hint = retry_after(exc) if exc is not None else None
+        return max(wait, min(hint, self.max_delay)) if hint else wait
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures; half-open probe after a cool-down."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        provider: str = "",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def abandon(self) -> None:
+        """Free the half-open probe slot of a call that ended without a verdict.
+
+        Cancelled calls (hedge losers, deadlines, hung-up clients) say
+        nothing about the provider, so the next call may probe instead.
+        """
+        self._probing = False
+
+
+class BreakerRegistry:
+    """One CircuitBreaker per provider, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker_for(self, provider: str) -> CircuitBreaker:
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(
+                provider, self.failure_threshold, self.reset_timeout
+            )
+        return self._breakers[provider]
+
+    def states(self) -> dict[str, str]:
+        return {name: b.state for name, b in self._breakers.items()}
+
+
+class RetryingAgent(AgentWrapper):
+    """Retries transient failures with jittered exponential backoff."""
+
+    def __init__(self, inner: Agent, policy: RetryPolicy | None = None) -> None:
+        super().__init__(inner)
+        self.policy = policy or RetryPolicy()
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        attempt = 1
+        while True:
+            try:
+                return await self.inner.execute(prompt, context)
+            except Exception as exc:
+                if attempt >= self.policy.max_attempts or not is_retryable(exc):
+                    raise
+                await asyncio.sleep(self.policy.delay(attempt, exc))
+                attempt += 1
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        attempt = 1
+        while True:
+            started = False
+            try:
+                async for chunk in self.inner.execute_stream(prompt, context):
+                    started = True
+                    yield chunk
+                return
+            except Exception as exc:
+                # Chunks already delivered cannot be taken back.
+                if started or attempt >= self.policy.max_attempts or not is_retryable(exc):
+                    raise
+                await asyncio.sleep(self.policy.delay(attempt, exc))
+                attempt += 1
+
+
+class BreakerAgent(AgentWrapper):
+    """Short-circuits calls while the provider's breaker is open.
+
+    With a ``fallback`` agent, open-circuit calls are answered by it (as
+    ``NimAgent`` does with its pass-through marker); otherwise they raise
+    CircuitOpenError without touching the network.
+    """
+
+    def __init__(
+        self,
+        inner: Agent,
+        breaker: CircuitBreaker,
+        fallback: Agent | None = None,
+    ) -> None:
+        super().__init__(inner)
+        self.breaker = breaker
+        self.fallback = fallback
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        if not self.breaker.allow():
+            return await self._short_circuit(prompt, context)
+        try:
+            response = await self.inner.execute(prompt, context)
+        except Exception as exc:
+            self._record_error(exc)
+            raise
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        self.breaker.record_success()
+        return response
+
+    async def execute_stream(
+        self, prompt: str, context: dict[str, object] | None = None
+    ) -> AsyncIterator[str]:
+        if not self.breaker.allow():
+            yield await self._short_circuit(prompt, context)
+            return
+        try:
+            async for chunk in self.inner.execute_stream(prompt, context):
+                yield chunk
+        except Exception as exc:
+            self._record_error(exc)
+            raise
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        self.breaker.record_success()
+
+    def is_cacheable(self, response: str) -> bool:
+        # Fallback answers stand in for the real provider; never cache them.
+        return self.breaker.state == CircuitBreaker.CLOSED and self.inner.is_cacheable(response)
+
+    async def _short_circuit(self, prompt: str, context: dict[str, object] | None) -> str:
+        if self.fallback is not None:
+            return await self.fallback.execute(prompt, context)
+        raise CircuitOpenError(self.breaker.provider, self.breaker.retry_in())
+
+    def _record_error(self, exc: Exception) -> None:
+        if is_retryable(exc):
+            self.breaker.record_failure()
+        else:
+            # A client error means the provider answered; it is not unhealthy.
+            self.breaker.record_success()
@@ -75,3 +75,4 @@ class PipelineResult(BaseModel):
     confidence: ConfidenceReport
     security: SecurityAttestation
     summary: str = ""
+    metadata: dict[str, object] = {}
@@ -0,0 +1,30 @@
+"""Token streaming: surface partial completions while strategies await full ones."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from crowe_codex.core.agent import Agent, AgentWrapper
+
+# Called with (agent_name, chunk) for every streamed piece of a completion.
+TokenCallback = Callable[[str, str], None]
+
+
+class StreamingAgent(AgentWrapper):
+    """Drives the inner agent's stream and reports each chunk as it lands.
+
+    Strategies still receive the joined completion from ``execute``, so they
+    need no changes; observers such as the CLI see tokens immediately.
+    """
+
+    def __init__(self, inner: Agent, on_token: TokenCallback, name: str = "") -> None:
+        super().__init__(inner)
+        self.on_token = on_token
+        self.name = name or inner.config.name
+
+    async def execute(self, prompt: str, context: dict[str, object] | None = None) -> str:
+        chunks: list[str] = []
+        async for chunk in self.inner.execute_stream(prompt, context):
+            chunks.append(chunk)
+            self.on_token(self.name, chunk)
+        return "".join(chunks)
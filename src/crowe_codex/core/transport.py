@@ -0,0 +1,127 @@
+"""Shared, pooled HTTP transport for agent adapters."""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+
+def http2_supported() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install crowe-codex[http2]``)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class PoolStats:
+    """Traffic and connection counters for one base URL."""
+
+    base_url: str
+    requests: int = 0
+    responses: int = 0
+    connections: int = 0
+    idle_connections: int = 0
+    http2: bool = False
+
+    @property
+    def in_flight(self) -> int:
+        return self.requests - self.responses
+
+
+class _Pool:
+    """Per-base-URL bookkeeping shared by every client that talks to it."""
+
+    def __init__(self, base_url: str, http2: bool) -> None:
+        self.stats = PoolStats(base_url=base_url, http2=http2)
+        self.clients: dict[Callable[..., Any], Any] = {}
+        self.transport: httpx.AsyncHTTPTransport | None = None
+
+    def event_hooks(self) -> dict[str, list[Callable[..., Any]]]:
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    async def _on_request(self, request: object) -> None:
+        self.stats.requests += 1
+
+    async def _on_response(self, response: object) -> None:
+        self.stats.responses += 1
+
+    def refresh(self) -> PoolStats:
+        connections: list[Any] = []
+        for owner in [self.transport, *(getattr(c, "_transport", None) for c in self.clients.values())]:
+            # httpcore's pool is not public API; stats are best-effort.
+            pool = getattr(owner, "_pool", None)
+            connections.extend(getattr(pool, "connections", []) or [])
+        self.stats.connections = len(connections)
+        self.stats.idle_connections = sum(1 for c in connections if c.is_idle())
+        return self.stats
+
+
+class TransportManager:
+    """Hands out keep-alive, connection-limited HTTP clients, one pool per base URL.
+
+    Adapters built on an SDK pass that SDK's client class as ``factory`` so
+    the shared client matches what the SDK expects; adapters that build
+    their own httpx client use ``client_kwargs`` instead.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool | None = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2_supported() if http2 is None else http2
+        self._pools: dict[str, _Pool] = {}
+
+    def client(
+        self,
+        base_url: str,
+        factory: Callable[..., Any] = httpx.AsyncClient,
+    ) -> Any:
+        """Return the shared client for ``base_url``, creating it on first use."""
+        pool = self._pool(base_url)
+        if factory not in pool.clients:
+            pool.clients[factory] = factory(
+                limits=self.limits,
+                http2=self.http2,
+                event_hooks=pool.event_hooks(),
+            )
+        return pool.clients[factory]
+
+    def client_kwargs(self, base_url: str) -> dict[str, Any]:
+        """Keyword arguments that route a caller-built httpx client through the pool."""
+        pool = self._pool(base_url)
+        if pool.transport is None:
+            pool.transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+        return {"transport": pool.transport, "event_hooks": pool.event_hooks()}
+
+    def stats(self) -> dict[str, PoolStats]:
+        return {url: pool.refresh() for url, pool in self._pools.items()}
+
+    async def aclose(self) -> None:
+        """Close every pooled client and transport."""
+        for pool in self._pools.values():
+            for client in pool.clients.values():
+                await client.aclose()
+            if pool.transport is not None:
+                await pool.transport.aclose()
+        self._pools.clear()
+
+    def _pool(self, base_url: str) -> _Pool:
+        key = base_url.rstrip("/")
+        if key not in self._pools:
+            self._pools[key] = _Pool(key, self.http2)
+        return self._pools[key]
@@ -0,0 +1,63 @@
+"""Token usage reported by provider responses."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass
+class TokenUsage:
+    """Billed tokens for one provider call, as the provider counted them.
+
+    ``input_tokens`` excludes prompt tokens served from (or written to) the
+    provider's prompt cache, which are counted separately.
+    """
+
+    provider: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    prompt_chars: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Every token of the prompt, cached or not."""
+        return self.input_tokens + self.cache_read_tokens + self.cache_creation_tokens
+
+
+_collectors: ContextVar[tuple[list[TokenUsage], ...]] = ContextVar("usage", default=())
+
+
+@contextmanager
+def record_usage() -> Iterator[list[TokenUsage]]:
+    """Collect TokenUsage for every provider call made inside the block.
+
+    Blocks nest: a call is reported to every enclosing collector.
+    """
+    usage: list[TokenUsage] = []
+    token = _collectors.set((*_collectors.get(), usage))
+    try:
+        yield usage
+    finally:
+        _collectors.reset(token)
+
+
+def report_usage(usage: TokenUsage) -> None:
+    """Called by adapters once a response's usage is known."""
+    for collector in _collectors.get():
+        collector.append(usage)
+
+
+def total_usage(usage: list[TokenUsage]) -> dict[str, int]:
+    return {
+        "calls": len(usage),
+        "input_tokens": sum(u.input_tokens for u in usage),
+        "output_tokens": sum(u.output_tokens for u in usage),
+        "cache_read_tokens": sum(u.cache_read_tokens for u in usage),
+        "cache_creation_tokens": sum(u.cache_creation_tokens for u in usage),
+    }
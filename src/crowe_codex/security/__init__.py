@@ -1,10 +1,29 @@
 """Security verification module: OWASP, supply chain, threat model, compliance."""
 
-from crowe_codex.security.owasp import OWASPScanner, OWASPReport
-from crowe_codex.security.supply_chain import SupplyChainVerifier, SupplyChainReport
-from crowe_codex.security.threat_model import ThreatModelEngine, ThreatModel
-from crowe_codex.security.compliance import ComplianceMapper, ComplianceReport
-from crowe_codex.security.attestation import AttestationGenerator, SecurityAttestation
+from typing import TYPE_CHECKING
+
+from crowe_codex._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from crowe_codex.security.attestation import AttestationGenerator, SecurityAttestation
+    from crowe_codex.security.compliance import ComplianceMapper, ComplianceReport
+    from crowe_codex.security.owasp import OWASPReport, OWASPScanner
+    from crowe_codex.security.supply_chain import SupplyChainReport, SupplyChainVerifier
+    from crowe_codex.security.threat_model import ThreatModel, ThreatModelEngine
+
+# Each checker module is imported on first access.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "OWASPScanner": "crowe_codex.security.owasp",
+    "OWASPReport": "crowe_codex.security.owasp",
+    "SupplyChainVerifier": "crowe_codex.security.supply_chain",
+    "SupplyChainReport": "crowe_codex.security.supply_chain",
+    "ThreatModelEngine": "crowe_codex.security.threat_model",
+    "ThreatModel": "crowe_codex.security.threat_model",
+    "ComplianceMapper": "crowe_codex.security.compliance",
+    "ComplianceReport": "crowe_codex.security.compliance",
+    "AttestationGenerator": "crowe_codex.security.attestation",
+    "SecurityAttestation": "crowe_codex.security.attestation",
+})
 
 __all__ = [
     "OWASPScanner",
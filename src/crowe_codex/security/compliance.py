@@ -6,6 +6,8 @@ import asyncio
 from dataclasses import dataclass, field
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import Prompt
+from crowe_codex.security.prompts import code_prefix
 
 
 # Compliance frameworks and their key controls
@@ -145,17 +147,16 @@ class ComplianceMapper:
         controls_text = "\n".join(
             f"- {cid}: {name}" for cid, name in controls.items()
         )
-        return (
-            f"Assess this code against {framework.upper()} compliance controls.\n\n"
-            f"Code:\n```\n{code}\n```\n\n"
-            f"{'Context: ' + context + chr(10) + chr(10) if context else ''}"
+        return Prompt(
+            code_prefix(code, context),
+            f"Assess the code above against {framework.upper()} compliance controls.\n\n"
             f"Controls to check:\n{controls_text}\n\n"
             "For each control, report:\n"
             "- Control ID\n"
             "- Status: PASS, FAIL, PARTIAL, or NOT_APPLICABLE\n"
             "- Evidence or reasoning\n"
             "- Recommendation if failing\n\n"
-            "Format: CONTROL_ID: STATUS - evidence | RECOMMENDATION: suggestion"
+            "Format: CONTROL_ID: STATUS - evidence | RECOMMENDATION: suggestion",
         )
 
     def _merge_assessments(
@@ -6,6 +6,8 @@ import asyncio
 from dataclasses import dataclass, field
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import Prompt
+from crowe_codex.security.prompts import code_prefix
 
 
 OWASP_TOP_10 = {
@@ -103,18 +105,17 @@ class OWASPScanner:
         categories = "\n".join(
             f"- {cid}: {name}" for cid, name in OWASP_TOP_10.items()
         )
-        return (
-            "You are a security auditor. Analyze this code for OWASP Top 10 "
+        return Prompt(
+            code_prefix(code, context),
+            "As a security auditor, analyze the code above for OWASP Top 10 "
             "vulnerabilities.\n\n"
-            f"Code:\n```\n{code}\n```\n\n"
-            f"{'Context: ' + context + chr(10) + chr(10) if context else ''}"
             f"OWASP Top 10 Categories:\n{categories}\n\n"
             "For each vulnerability found, report:\n"
             "- Category ID (A01-A10)\n"
             "- Description of the issue\n"
             "- Severity (critical/high/medium/low/info)\n\n"
             "If the code is clean, respond with: NO_VULNERABILITIES_FOUND\n"
-            "Format each finding as: [CATEGORY_ID] SEVERITY: description"
+            "Format each finding as: [CATEGORY_ID] SEVERITY: description",
         )
 
     def _parse_findings(
@@ -0,0 +1,21 @@
+"""Cache-friendly prompt layout shared by the security analyses."""
+
+from __future__ import annotations
+
+from crowe_codex.core.budget import KEEP, Section
+
+
+def code_prefix(code: str, context: str = "") -> Section:
+    """The stable prefix every security prompt starts with.
+
+    OWASP, STRIDE and compliance prompts for the same code share this text
+    byte-for-byte and put their instructions after it, so providers can
+    serve it from their prompt cache on every call after the first.
+    """
+    text = (
+        "You are part of a security review of the following code.\n\n"
+        f"Code:\n```\n{code}\n```\n\n"
+    )
+    if context:
+        text += f"Context: {context}\n\n"
+    return Section(text, policy=KEEP, label="code", cache=True)
@@ -7,6 +7,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import Prompt
+from crowe_codex.security.prompts import code_prefix
 
 
 @dataclass
@@ -169,10 +171,9 @@ class ThreatModelEngine:
         stride_desc = "\n".join(
             f"- {k} ({v})" for k, v in STRIDE.items()
         )
-        return (
-            "Perform a STRIDE threat model analysis on this code.\n\n"
-            f"Code:\n```\n{code}\n```\n\n"
-            f"{'Context: ' + context + chr(10) + chr(10) if context else ''}"
+        return Prompt(
+            code_prefix(code, context),
+            "Perform a STRIDE threat model analysis on the code above.\n\n"
             f"STRIDE Categories:\n{stride_desc}\n\n"
             "For each threat found, report:\n"
             "- Threat name\n"
@@ -184,7 +185,7 @@ class ThreatModelEngine:
             "- Key assets (data, services, credentials)\n"
             "- Trust boundaries\n"
             "- Data flows\n\n"
-            "Format threats as: [CATEGORY] SEVERITY NAME: description | MITIGATION: suggestion"
+            "Format threats as: [CATEGORY] SEVERITY NAME: description | MITIGATION: suggestion",
         )
 
     def _merge_results(self, results: dict[str, str]) -> ThreatModel:
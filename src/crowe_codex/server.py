@@ -0,0 +1,169 @@
+"""``crowe-codex serve``: one warm engine answering runs over a Unix socket.
+
+The daemon keeps a single DualEngine, with its detected agents, pooled
+clients, response cache and stores, alive between commands. Clients speak
+newline-delimited JSON (see crowe_codex.client): a ``run`` request streams
+back ``token`` and ``stage`` events, then one ``result`` or ``error``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from crowe_codex.client import ServerClient, socket_path
+from crowe_codex.core.cache import ResponseCache
+from crowe_codex.core.checkpoint import CheckpointStore, checkpointed_run
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.graph import NodeTiming, watch_stages
+from crowe_codex.strategies.registry import build_strategy
+
+# Where the tokens of the run being served in this task go, if anywhere.
+_token_sink: ContextVar[Any] = ContextVar("token_sink", default=None)
+
+
+class CodexServer:
+    """Serves strategy runs from one long-lived DualEngine.
+
+    Runs from concurrent connections share the engine, so they share its
+    cache, coalescing and per-provider concurrency limits. A run is
+    cancelled if its client disconnects.
+    """
+
+    def __init__(self, engine: DualEngine | None = None, path: Path | None = None) -> None:
+        self.engine = engine or DualEngine(
+            cache=ResponseCache(), on_token=self._route_token, checkpoints=CheckpointStore(),
+        )
+        self.path = path or socket_path()
+        self.started = time.time()
+        self.runs = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    @staticmethod
+    def _route_token(agent: str, chunk: str) -> None:
+        sink = _token_sink.get()
+        if sink is not None:
+            sink({"event": "token", "agent": agent, "chunk": chunk})
+
+    async def start(self) -> None:
+        """Warm the engine and start listening."""
+        if ServerClient(self.path, timeout=1.0).ping() is not None:
+            raise RuntimeError(f"A crowe-codex server is already listening on {self.path}")
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()  # left behind by a server that died
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        await self.engine.detect()
+        self.engine.health.start()
+        # Bind owner-only from the start: a chmod after bind leaves a window
+        # in which other local users could connect.
+        umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        finally:
+            os.umask(umask)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+        await self.engine.aclose()
+
+    def status(self) -> dict[str, object]:
+        return {
+            "event": "pong",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started, 1),
+            "runs": self.runs,
+            "agents": self.engine.available_agents(),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        def send(event: dict[str, object]) -> None:
+            if not writer.is_closing():
+                writer.write(json.dumps(event).encode() + b"\n")
+
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                request = None
+            if not isinstance(request, dict):
+                send({"event": "error", "error": "malformed request"})
+                return
+            if request.get("op") == "ping":
+                send(self.status())
+            elif request.get("op") == "run":
+                await self._serve_run(request, reader, send)
+            else:
+                send({"event": "error", "error": f"unknown op {request.get('op')!r}"})
+        finally:
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _serve_run(
+        self,
+        request: dict[str, Any],
+        reader: asyncio.StreamReader,
+        send: Any,
+    ) -> None:
+        def stage_landed(timing: NodeTiming, output: str) -> None:
+            send({
+                "event": "stage", "name": timing.name, "agent": timing.agent,
+                "seconds": timing.duration, "output": output,
+            })
+
+        try:
+            strategy = build_strategy(request.get("strategy", ""), **request.get("options", {}))
+        except (TypeError, ValueError) as e:
+            send({"event": "error", "error": f"{type(e).__name__}: {e}", "run_id": None})
+            return
+        self.runs += 1
+        if request.get("stream", True):
+            _token_sink.set(send)
+        with watch_stages(stage_landed):
+            run = asyncio.ensure_future(self.engine.run(
+                strategy, task=request.get("task", ""), deadline=request.get("deadline"),
+                resume=request.get("resume"),
+            ))
+        # The client sends nothing after its request, so EOF means it left.
+        hangup = asyncio.ensure_future(reader.read())
+        try:
+            await asyncio.wait([run, hangup], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            hangup.cancel()
+        if not run.done():
+            run.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await run
+            return
+        try:
+            result = run.result()
+        except Exception as e:  # noqa: BLE001 - the client gets every failure as an event
+            send({
+                "event": "error", "error": f"{type(e).__name__}: {e}",
+                "run_id": checkpointed_run(e),
+            })
+        else:
+            send({"event": "result", "result": result.model_dump(mode="json")})
@@ -1,13 +1,30 @@
 """Composable strategies for the crowe-codex pipeline."""
 
-from crowe_codex.strategies.base import Strategy
-from crowe_codex.strategies.adversarial import Adversarial
-from crowe_codex.strategies.consensus import Consensus
-from crowe_codex.strategies.evolutionary import Evolutionary
-from crowe_codex.strategies.mesh import CognitiveMesh
-from crowe_codex.strategies.pipeline_strategy import Pipeline
-from crowe_codex.strategies.router import AdaptiveRouter
-from crowe_codex.strategies.verification import VerificationLoop
+from typing import TYPE_CHECKING
+
+from crowe_codex._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from crowe_codex.strategies.adversarial import Adversarial
+    from crowe_codex.strategies.base import Strategy
+    from crowe_codex.strategies.consensus import Consensus
+    from crowe_codex.strategies.evolutionary import Evolutionary
+    from crowe_codex.strategies.mesh import CognitiveMesh
+    from crowe_codex.strategies.pipeline_strategy import Pipeline
+    from crowe_codex.strategies.router import AdaptiveRouter
+    from crowe_codex.strategies.verification import VerificationLoop
+
+# Each strategy module is imported on first access.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "Strategy": "crowe_codex.strategies.base",
+    "Adversarial": "crowe_codex.strategies.adversarial",
+    "Consensus": "crowe_codex.strategies.consensus",
+    "CognitiveMesh": "crowe_codex.strategies.mesh",
+    "Evolutionary": "crowe_codex.strategies.evolutionary",
+    "Pipeline": "crowe_codex.strategies.pipeline_strategy",
+    "AdaptiveRouter": "crowe_codex.strategies.router",
+    "VerificationLoop": "crowe_codex.strategies.verification",
+})
 
 __all__ = [
     "Strategy",
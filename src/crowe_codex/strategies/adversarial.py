@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import SUMMARIZE, Prompt, Section
+from crowe_codex.core.diffs import DIFF, FULL, CodeExchange
+from crowe_codex.core.graph import StageGraph
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
@@ -13,8 +18,9 @@ class Adversarial(Strategy):
     name = "adversarial"
     required_stages = [Stage.ARCHITECT, Stage.BUILDER, Stage.SPECIALIST, Stage.DISPATCH]
 
-    def __init__(self, rounds: int = 1) -> None:
+    def __init__(self, rounds: int = 1, code_exchange: str = FULL) -> None:
         self.rounds = rounds
+        self.code_exchange = code_exchange
 
     async def execute(
         self,
@@ -22,71 +28,112 @@ class Adversarial(Strategy):
         agents: dict[str, Agent],
         context: dict[str, object] | None = None,
     ) -> dict[str, object]:
-        claude = agents["claude"]
-        codex = agents["codex"]
-        ollama = agents["ollama"]
-        dispatch = agents["dispatch"]
+        exchange = CodeExchange(self.code_exchange)
+        all_attacks: list[str] = []
+        all_fuzzes: list[str] = []
+        result: dict[str, object] = {
+            "build_output": "",
+            "attack_output": "",
+            "fuzz_output": "",
+            "dispatch_output": "",
+            "rounds": self.rounds,
+            "total_attacks": 0,
+            "strategy": self.name,
+        }
 
+        def attacked(output: str) -> None:
+            all_attacks.append(output)
+            result["total_attacks"] = len(all_attacks)
+
+        # Each round's attack and fuzz only need that round's build, so they
+        # run side by side.
+        graph = StageGraph()
         # Stage 1: Claude architects
-        build_prompt = (
+        graph.add("build0", "claude", lambda _: (
             f"Write production-quality code for this task. Return ONLY code.\n\n"
             f"Task: {task}"
-        )
-        build_output = await claude.execute(build_prompt)
-
-        attack_output = ""
-        fuzz_output = ""
-        all_attacks: list[str] = []
-        all_fuzzes: list[str] = []
-
+        ), output="build_output")
         for round_num in range(self.rounds):
+            build = f"build{round_num}"
             # Stage 2: Codex attacks
-            attack_prompt = (
-                f"You are a security adversary. Find vulnerabilities, edge cases, and "
-                f"potential exploits in this code. Be thorough and aggressive.\n\n"
-                f"Code to attack:\n```\n{build_output}\n```\n\n"
-                f"List every issue you find with severity ratings."
+            def attack(inputs: Mapping[str, str], build: str = build) -> str:
+                return (
+                    f"You are a security adversary. Find vulnerabilities, edge cases, and "
+                    f"potential exploits in this code. Be thorough and aggressive.\n\n"
+                    f"Code to attack:\n```\n{inputs[build]}\n```\n\n"
+                    f"List every issue you find with severity ratings."
+                )
+
+            graph.add(
+                f"attack{round_num}", "codex", attack,
+                inputs=(build,), output="attack_output", then=attacked,
             )
-            attack_output = await codex.execute(attack_prompt)
-            all_attacks.append(attack_output)
 
             # Stage 3: Ollama fuzzes
-            fuzz_prompt = (
-                f"Generate adversarial inputs and edge cases for this code. "
-                f"Try to break it with unexpected types, boundary values, "
-                f"injection attempts, and malformed data.\n\n"
-                f"Code to fuzz:\n```\n{build_output}\n```"
+            def fuzz(inputs: Mapping[str, str], build: str = build) -> str:
+                return (
+                    f"Generate adversarial inputs and edge cases for this code. "
+                    f"Try to break it with unexpected types, boundary values, "
+                    f"injection attempts, and malformed data.\n\n"
+                    f"Code to fuzz:\n```\n{inputs[build]}\n```"
+                )
+
+            graph.add(
+                f"fuzz{round_num}", "ollama", fuzz,
+                inputs=(build,), output="fuzz_output", then=all_fuzzes.append,
             )
-            fuzz_output = await ollama.execute(fuzz_prompt)
-            all_fuzzes.append(fuzz_output)
 
             # Claude fixes based on attacks + fuzzing
             if round_num < self.rounds - 1:
-                fix_prompt = (
-                    f"Your code was attacked and fuzzed. Fix ALL issues found.\n\n"
-                    f"Original code:\n```\n{build_output}\n```\n\n"
-                    f"Attacks found:\n{attack_output}\n\n"
-                    f"Fuzz results:\n{fuzz_output}\n\n"
-                    f"Return the hardened code only."
+                async def fix(
+                    claude: Agent, inputs: Mapping[str, str], round_num: int = round_num
+                ) -> str:
+                    build_output = inputs[f"build{round_num}"]
+                    fix_prompt = Prompt(
+                        f"Your code was attacked and fuzzed. Fix ALL issues found.\n\n"
+                        f"Original code:\n```\n{build_output}\n```\n\n",
+                        Section(
+                            f"Attacks found:\n{inputs[f'attack{round_num}']}\n\n",
+                            priority=1, policy=SUMMARIZE, label="attacks",
+                        ),
+                        Section(
+                            f"Fuzz results:\n{inputs[f'fuzz{round_num}']}\n\n",
+                            policy=SUMMARIZE, label="fuzz results",
+                        ),
+                    )
+                    return await exchange.revise(
+                        claude, fix_prompt, build_output, "Return the hardened code only."
+                    )
+
+                graph.add(
+                    f"build{round_num + 1}", "claude",
+                    inputs=(build, f"attack{round_num}", f"fuzz{round_num}"),
+                    output="build_output", run=fix, key=self.code_exchange,
                 )
-                build_output = await claude.execute(fix_prompt)
 
         # Stage 5: Dispatch final verification
-        dispatch_prompt = (
+        final = f"build{max(self.rounds - 1, 0)}"
+        graph.add("dispatch", "dispatch", lambda inputs: Prompt(
             f"Final verification. Review code that survived adversarial testing.\n\n"
-            f"Final code:\n```\n{build_output}\n```\n\n"
-            f"Attacks it survived:\n{chr(10).join(all_attacks)}\n\n"
-            f"Fuzz tests it survived:\n{chr(10).join(all_fuzzes)}\n\n"
-            "Provide final verdict and confidence score."
-        )
-        dispatch_output = await dispatch.execute(dispatch_prompt)
-
-        return {
-            "build_output": build_output,
-            "attack_output": attack_output,
-            "fuzz_output": fuzz_output,
-            "dispatch_output": dispatch_output,
-            "rounds": self.rounds,
-            "total_attacks": len(all_attacks),
-            "strategy": self.name,
-        }
+            f"Final code:\n```\n{inputs[final]}\n```\n\n",
+            Section(
+                f"Attacks it survived:\n{chr(10).join(all_attacks)}\n\n",
+                priority=1, policy=SUMMARIZE, label="attacks",
+            ),
+            Section(
+                f"Fuzz tests it survived:\n{chr(10).join(all_fuzzes)}\n\n",
+                policy=SUMMARIZE, label="fuzz tests",
+            ),
+            "Provide final verdict and confidence score.",
+        ), inputs=(
+            final,
+            *(f"attack{r}" for r in range(self.rounds)),
+            *(f"fuzz{r}" for r in range(self.rounds)),
+        ), output="dispatch_output")
+
+        async with self.within_deadline(result, context):
+            await graph.run(agents, result)
+
+        if self.code_exchange == DIFF:
+            result["code_exchange"] = vars(exchange.stats)
+        return result
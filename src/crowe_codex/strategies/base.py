@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.deadline import Deadline, DeadlineExceeded
 from crowe_codex.core.result import Stage
 
 
@@ -27,3 +30,26 @@ class Strategy(ABC):
     def stages_needed(self) -> list[int]:
         """Return sorted list of stage numbers this strategy requires."""
         return sorted(s.value for s in self.required_stages)
+
+    @asynccontextmanager
+    async def within_deadline(
+        self,
+        result: dict[str, object],
+        context: dict[str, object] | None,
+    ) -> AsyncIterator[None]:
+        """Enforce ``context["deadline"]`` over the block.
+
+        In-flight agent calls are cancelled when the deadline passes; the
+        block is abandoned and ``result`` keeps whatever stage outputs were
+        stored in it so far, flagged ``partial``.
+        """
+        deadline = (context or {}).get("deadline")
+        if not isinstance(deadline, Deadline):
+            yield
+            return
+        try:
+            async with deadline.scope():
+                yield
+        except DeadlineExceeded:
+            result["partial"] = True
+            result["deadline_exceeded"] = True
@@ -2,19 +2,32 @@
 
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Mapping
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.equivalence import agreement, extract_code
+from crowe_codex.core.graph import StageGraph
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
+# Agreement (see equivalence.agreement) at which the dispatch merge is skipped.
+DEFAULT_AGREEMENT_THRESHOLD = 0.95
+
 
 class Consensus(Strategy):
-    """Run the same task through multiple agents and compare results."""
+    """Run the same task through multiple agents and compare results.
+
+    The two implementations are compared locally first; when they agree at
+    least ``agreement_threshold``, Claude's code is kept and the dispatch
+    merge is skipped. A threshold above 1 always merges.
+    """
 
     name = "consensus"
     required_stages = [Stage.ARCHITECT, Stage.BUILDER, Stage.DISPATCH]
 
+    def __init__(self, agreement_threshold: float = DEFAULT_AGREEMENT_THRESHOLD) -> None:
+        self.agreement_threshold = agreement_threshold
+
     async def execute(
         self,
         task: str,
@@ -26,25 +39,37 @@ class Consensus(Strategy):
             f"Task: {task}"
         )
 
-        claude_task = agents["claude"].execute(prompt)
-        codex_task = agents["codex"].execute(prompt)
-        claude_output, codex_output = await asyncio.gather(claude_task, codex_task)
+        result: dict[str, object] = {
+            "claude_output": "",
+            "codex_output": "",
+            "dispatch_output": "",
+            "strategy": self.name,
+        }
+
+        def needs_merge(inputs: Mapping[str, str]) -> bool:
+            score = agreement(inputs["claude"], inputs["codex"])
+            result["agreement"] = score
+            return score < self.agreement_threshold
 
-        dispatch_prompt = (
+        graph = StageGraph()
+        graph.add("claude", "claude", lambda _: prompt, output="claude_output")
+        graph.add("codex", "codex", lambda _: prompt, output="codex_output")
+        graph.add("dispatch", "dispatch", lambda inputs: (
             "Compare these two implementations and produce the best final version.\n\n"
-            f"Implementation A (Claude):\n{claude_output}\n\n"
-            f"Implementation B (Codex):\n{codex_output}\n\n"
+            f"Implementation A (Claude):\n{inputs['claude']}\n\n"
+            f"Implementation B (Codex):\n{inputs['codex']}\n\n"
             "Respond with JSON containing:\n"
             '- "code": the best implementation\n'
             '- "agreement": true if both are functionally equivalent\n'
             '- "confidence": float 0-1\n'
             '- "divergences": list of differences if any\n'
-        )
-        dispatch_output = await agents["dispatch"].execute(dispatch_prompt)
+        ), inputs=("claude", "codex"), output="dispatch_output", when=needs_merge)
 
-        return {
-            "claude_output": claude_output,
-            "codex_output": codex_output,
-            "dispatch_output": dispatch_output,
-            "strategy": self.name,
-        }
+        async with self.within_deadline(result, context):
+            await graph.run(agents, result)
+
+        skipped = result.get("skipped_stages")
+        if isinstance(skipped, list) and "dispatch" in skipped:
+            del result["dispatch_output"]
+            result["agreed_code"] = extract_code(str(result["claude_output"]))
+        return result
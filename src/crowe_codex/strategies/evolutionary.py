@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import asyncio
+import functools
+from collections.abc import Mapping
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.budget import SUMMARIZE, Prompt, Section
+from crowe_codex.core.graph import StageGraph
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
@@ -25,90 +28,122 @@ class Evolutionary(Strategy):
         agents: dict[str, Agent],
         context: dict[str, object] | None = None,
     ) -> dict[str, object]:
-        claude = agents["claude"]
-        codex = agents["codex"]
-        dispatch = agents["dispatch"]
-
         # Collect all worker agents for candidate generation
-        workers = [v for k, v in agents.items() if k != "dispatch"]
+        workers = [name for name in agents if name != "dispatch"]
+        evaluator = "ollama" if "ollama" in agents else "codex"
 
         all_generations: list[list[str]] = []
+        result: dict[str, object] = {
+            "candidates": [],
+            "population": self.population,
+            "dispatch_output": "",
+            "strategy": self.name,
+        }
+
+        def record(candidates: list[str]) -> None:
+            all_generations.append(candidates)
+            result["candidates"] = candidates
+
+        def candidates_of(inputs: Mapping[str, str], gen: int) -> list[str]:
+            if gen == 0:
+                return [inputs[f"variant{i}"] for i in range(self.population)]
+            return _split_candidates(inputs[f"crossover{gen}"], self.population)
 
-        # Generation 0: Initial population
+        def generation(gen: int) -> tuple[str, ...]:
+            if gen == 0:
+                return tuple(f"variant{i}" for i in range(self.population))
+            return (f"crossover{gen}",)
+
+        graph = StageGraph()
+        # Generation 0: Initial population, generated in parallel
         gen_prompt = (
             f"Write a complete, production-quality solution for this task. "
             f"Be creative and consider multiple approaches.\n\n"
             f"Task: {task}\n\n"
             f"Return ONLY code."
         )
+        initial: dict[int, str] = {}
+
+        def landed(i: int, output: str) -> None:
+            initial[i] = output
+            if len(initial) == self.population:
+                record([initial[j] for j in range(self.population)])
 
-        gen_tasks = []
         for i in range(self.population):
-            agent = workers[i % len(workers)]
-            variant_prompt = (
-                f"{gen_prompt}\n\nVariant #{i + 1}: "
-                f"Emphasize {'performance' if i % 3 == 0 else 'readability' if i % 3 == 1 else 'robustness'}."
-            )
-            gen_tasks.append(agent.execute(variant_prompt))
+            emphasis = "performance" if i % 3 == 0 else "readability" if i % 3 == 1 else "robustness"
 
-        candidates = list(await asyncio.gather(*gen_tasks))
-        all_generations.append(list(candidates))
+            def variant(_: Mapping[str, str], i: int = i, emphasis: str = emphasis) -> str:
+                return f"{gen_prompt}\n\nVariant #{i + 1}: Emphasize {emphasis}."
+
+            graph.add(
+                f"variant{i}", workers[i % len(workers)], variant,
+                then=functools.partial(landed, i),
+            )
 
         # Evolution loop
         for gen in range(1, self.generations):
+            previous = generation(gen - 1)
+
             # Fitness evaluation by specialist
-            evaluator = agents.get("ollama", codex)
-            fitness_prompt = (
-                f"Rank these {len(candidates)} code candidates for the task: {task}\n\n"
-            )
-            for idx, c in enumerate(candidates):
-                fitness_prompt += f"--- Candidate {idx + 1} ---\n{c}\n\n"
-            fitness_prompt += (
-                "Score each candidate 1-10 on: correctness, performance, "
-                "readability, robustness. Return rankings."
-            )
-            fitness_output = await evaluator.execute(fitness_prompt)
+            def fitness(inputs: Mapping[str, str], gen: int = gen) -> Prompt:
+                return Prompt(
+                    f"Rank these {self.population} code candidates for the task: {task}\n\n",
+                    *_candidate_sections(candidates_of(inputs, gen - 1)),
+                    "Score each candidate 1-10 on: correctness, performance, "
+                    "readability, robustness. Return rankings.",
+                )
+
+            graph.add(f"fitness{gen}", evaluator, fitness, inputs=previous)
 
             # Crossover: combine best traits
-            crossover_prompt = (
-                f"You've evaluated these candidates:\n{fitness_output}\n\n"
-                f"Now produce {self.population} improved candidates by combining "
-                f"the best traits. Fix any issues found. Return ONLY code for each "
-                f"candidate, separated by '---CANDIDATE---'.\n\n"
-                f"Original candidates:\n"
+            def crossover(inputs: Mapping[str, str], gen: int = gen) -> Prompt:
+                return Prompt(
+                    "You've evaluated these candidates:\n",
+                    Section(
+                        f"{inputs[f'fitness{gen}']}\n\n",
+                        priority=2, policy=SUMMARIZE, label="rankings",
+                    ),
+                    f"Now produce {self.population} improved candidates by combining "
+                    f"the best traits. Fix any issues found. Return ONLY code for each "
+                    f"candidate, separated by '---CANDIDATE---'.\n\n"
+                    f"Original candidates:\n",
+                    *_candidate_sections(candidates_of(inputs, gen - 1)),
+                )
+
+            graph.add(
+                f"crossover{gen}", "claude", crossover, inputs=(f"fitness{gen}", *previous),
+                then=lambda output: record(_split_candidates(output, self.population)),
             )
-            for idx, c in enumerate(candidates):
-                crossover_prompt += f"--- Candidate {idx + 1} ---\n{c}\n\n"
-
-            crossover_output = await claude.execute(crossover_prompt)
-            candidates = [
-                c.strip()
-                for c in crossover_output.split("---CANDIDATE---")
-                if c.strip()
-            ]
-            # Ensure we maintain population size
-            while len(candidates) < self.population:
-                candidates.append(candidates[-1] if candidates else "")
-            candidates = candidates[: self.population]
-            all_generations.append(list(candidates))
 
         # Final selection by dispatch
-        final_prompt = (
+        last = max(self.generations - 1, 0)
+        graph.add("dispatch", "dispatch", lambda inputs: Prompt(
             f"Select the best candidate from the final generation.\n\n"
-            f"Task: {task}\n\n"
-        )
-        for idx, c in enumerate(candidates):
-            final_prompt += f"--- Candidate {idx + 1} ---\n{c}\n\n"
-        final_prompt += (
-            "Pick the best one. Return the winning code and explain why."
-        )
-        dispatch_output = await dispatch.execute(final_prompt)
-
-        return {
-            "candidates": candidates,
-            "generations": len(all_generations),
-            "population": self.population,
-            "dispatch_output": dispatch_output,
-            "total_candidates_evaluated": sum(len(g) for g in all_generations),
-            "strategy": self.name,
-        }
+            f"Task: {task}\n\n",
+            *_candidate_sections(candidates_of(inputs, last)),
+            "Pick the best one. Return the winning code and explain why.",
+        ), inputs=generation(last), output="dispatch_output")
+
+        async with self.within_deadline(result, context):
+            await graph.run(agents, result)
+
+        result["generations"] = len(all_generations)
+        result["total_candidates_evaluated"] = sum(len(g) for g in all_generations)
+        return result
+
+
+def _split_candidates(crossover_output: str, population: int) -> list[str]:
+    """The candidates in a crossover response, padded or cut to ``population``."""
+    candidates = [c.strip() for c in crossover_output.split("---CANDIDATE---") if c.strip()]
+    # Ensure we maintain population size
+    while len(candidates) < population:
+        candidates.append(candidates[-1] if candidates else "")
+    return candidates[:population]
+
+
+def _candidate_sections(candidates: list[str]) -> list[Section]:
+    """One trimmable prompt section per candidate."""
+    return [
+        Section(f"--- Candidate {idx + 1} ---\n{c}\n\n", priority=1, label=f"candidate {idx + 1}")
+        for idx, c in enumerate(candidates)
+    ]
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Mapping
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.graph import StageGraph
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
@@ -21,48 +22,46 @@ class CognitiveMesh(Strategy):
         agents: dict[str, Agent],
         context: dict[str, object] | None = None,
     ) -> dict[str, object]:
-        dispatch = agents["dispatch"]
-
         # Identify all worker agents (everything except dispatch)
-        workers = {k: v for k, v in agents.items() if k != "dispatch"}
+        workers = [name for name in agents if name != "dispatch"]
 
         prompt = (
             f"Generate code for the following task. Return ONLY the code.\n\n"
             f"Task: {task}"
         )
 
-        # Fire all workers in parallel
-        tasks = {
-            name: agent.execute(prompt)
-            for name, agent in workers.items()
+        result: dict[str, object] = {
+            "dispatch_output": "",
+            "agents_consulted": 0,
+            "strategy": self.name,
         }
-        results = dict(
-            zip(tasks.keys(), await asyncio.gather(*tasks.values()))
-        )
 
-        # Build comparison prompt for dispatch
-        comparison_parts = []
-        for name, output in results.items():
-            comparison_parts.append(
-                f"--- {name.upper()} ---\n{output}"
+        # All workers run in parallel; dispatch waits for every one.
+        graph = StageGraph()
+        for name in workers:
+            graph.add(name, name, lambda _: prompt, output=f"{name}_output")
+
+        def merge_prompt(results: Mapping[str, str]) -> str:
+            # Build comparison prompt for dispatch
+            comparison_parts = [f"--- {name.upper()} ---\n{results[name]}" for name in workers]
+            return (
+                f"You are merging outputs from {len(results)} independent AI agents "
+                f"who all solved the same task.\n\n"
+                f"Task: {task}\n\n"
+                + "\n\n".join(comparison_parts)
+                + "\n\nAnalyze each solution. Produce the BEST possible implementation by:\n"
+                "1. Identifying the strongest parts of each solution\n"
+                "2. Combining the best approaches\n"
+                "3. Resolving any conflicts\n\n"
+                "Return the merged code and a confidence assessment."
             )
 
-        merge_prompt = (
-            f"You are merging outputs from {len(results)} independent AI agents "
-            f"who all solved the same task.\n\n"
-            f"Task: {task}\n\n"
-            + "\n\n".join(comparison_parts)
-            + "\n\nAnalyze each solution. Produce the BEST possible implementation by:\n"
-            "1. Identifying the strongest parts of each solution\n"
-            "2. Combining the best approaches\n"
-            "3. Resolving any conflicts\n\n"
-            "Return the merged code and a confidence assessment."
+        graph.add(
+            "dispatch", "dispatch", merge_prompt, inputs=tuple(workers), output="dispatch_output"
         )
-        dispatch_output = await dispatch.execute(merge_prompt)
 
-        return {
-            **{f"{name}_output": output for name, output in results.items()},
-            "dispatch_output": dispatch_output,
-            "agents_consulted": len(results),
-            "strategy": self.name,
-        }
+        async with self.within_deadline(result, context):
+            await graph.run(agents, result)
+            result["agents_consulted"] = len(workers)
+
+        return result
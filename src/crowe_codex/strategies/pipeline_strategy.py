@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.graph import StageGraph
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
@@ -22,58 +25,63 @@ class Pipeline(Strategy):
         agents: dict[str, Agent],
         context: dict[str, object] | None = None,
     ) -> dict[str, object]:
-        claude = agents["claude"]
-        codex = agents["codex"]
-        dispatch = agents["dispatch"]
+        result: dict[str, object] = {
+            "architect_output": "",
+            "build_output": "",
+            "specialist_output": "",
+            "dispatch_output": "",
+            "stages_run": 0,
+            "strategy": self.name,
+        }
 
+        graph = StageGraph()
         # Stage 1: Claude architects the solution
-        architect_prompt = (
+        graph.add("architect", "claude", lambda _: (
             f"Design the architecture and write an implementation plan for:\n\n"
             f"Task: {task}\n\n"
             f"Include: function signatures, data structures, error handling approach, "
             f"and key design decisions. Return a detailed blueprint."
-        )
-        architect_output = await claude.execute(architect_prompt)
+        ), output="architect_output")
 
         # Stage 2: Codex builds from the blueprint
-        build_prompt = (
+        graph.add("build", "codex", lambda inputs: (
             f"Implement production-quality code from this architecture blueprint. "
             f"Follow the design exactly. Return ONLY code.\n\n"
-            f"Blueprint:\n{architect_output}"
-        )
-        build_output = await codex.execute(build_prompt)
+            f"Blueprint:\n{inputs['architect']}"
+        ), inputs=("architect",), output="build_output")
 
         # Stage 3: Specialist reviews (if available and enabled)
-        specialist_output = ""
-        if self.include_specialist and "ollama" in agents:
-            specialist_prompt = (
+        reviewed = self.include_specialist and "ollama" in agents
+        if reviewed:
+            graph.add("specialist", "ollama", lambda inputs: (
                 f"Review this implementation for domain-specific issues, "
                 f"performance concerns, and edge cases.\n\n"
                 f"Original task: {task}\n\n"
-                f"Architecture:\n{architect_output}\n\n"
-                f"Implementation:\n```\n{build_output}\n```\n\n"
+                f"Architecture:\n{inputs['architect']}\n\n"
+                f"Implementation:\n```\n{inputs['build']}\n```\n\n"
                 f"List issues and suggested improvements."
-            )
-            specialist_output = await agents["ollama"].execute(specialist_prompt)
+            ), inputs=("architect", "build"), output="specialist_output")
 
         # Stage 5: Dispatch verifies and produces final output
-        dispatch_input = (
-            f"Final verification of pipeline output.\n\n"
-            f"Task: {task}\n\n"
-            f"Architecture:\n{architect_output}\n\n"
-            f"Implementation:\n```\n{build_output}\n```\n"
+        def dispatch_prompt(inputs: Mapping[str, str]) -> str:
+            dispatch_input = (
+                f"Final verification of pipeline output.\n\n"
+                f"Task: {task}\n\n"
+                f"Architecture:\n{inputs['architect']}\n\n"
+                f"Implementation:\n```\n{inputs['build']}\n```\n"
+            )
+            if inputs.get("specialist"):
+                dispatch_input += f"\nSpecialist review:\n{inputs['specialist']}\n"
+            return dispatch_input + "\nProvide final verdict, confidence score, and the approved code."
+
+        graph.add(
+            "dispatch", "dispatch", dispatch_prompt,
+            inputs=("architect", "build", *(("specialist",) if reviewed else ())),
+            output="dispatch_output",
         )
-        if specialist_output:
-            dispatch_input += f"\nSpecialist review:\n{specialist_output}\n"
-        dispatch_input += "\nProvide final verdict, confidence score, and the approved code."
 
-        dispatch_output = await dispatch.execute(dispatch_input)
+        async with self.within_deadline(result, context):
+            await graph.run(agents, result)
+            result["stages_run"] = 4 if result["specialist_output"] else 3
 
-        return {
-            "architect_output": architect_output,
-            "build_output": build_output,
-            "specialist_output": specialist_output,
-            "dispatch_output": dispatch_output,
-            "stages_run": 4 if specialist_output else 3,
-            "strategy": self.name,
-        }
+        return result
@@ -0,0 +1,59 @@
+"""Named strategies, as the CLI and the serve daemon build them."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from crowe_codex.strategies.base import Strategy
+
+
+def build_strategy(name: str, **kwargs: Any) -> Strategy:
+    """Instantiate a strategy by name; unknown names get Consensus."""
+    if name == "adversarial":
+        from crowe_codex.strategies.adversarial import Adversarial
+        return Adversarial(
+            rounds=kwargs.get("rounds", 1),
+            code_exchange=kwargs.get("code_exchange", "full"),
+        )
+    elif name == "verification_loop":
+        from crowe_codex.strategies.verification import VerificationLoop
+        return VerificationLoop(
+            iterations=kwargs.get("iterations", 2),
+            code_exchange=kwargs.get("code_exchange", "full"),
+        )
+    elif name == "pipeline":
+        from crowe_codex.strategies.pipeline_strategy import Pipeline
+        return Pipeline()
+    elif name == "cognitive_mesh":
+        from crowe_codex.strategies.mesh import CognitiveMesh
+        return CognitiveMesh()
+    elif name == "evolutionary":
+        from crowe_codex.strategies.evolutionary import Evolutionary
+        return Evolutionary(
+            population=kwargs.get("population", 3),
+            generations=kwargs.get("generations", 2),
+        )
+    elif name == "adaptive_router":
+        from crowe_codex.strategies.adversarial import Adversarial
+        from crowe_codex.strategies.consensus import Consensus
+        from crowe_codex.strategies.evolutionary import Evolutionary
+        from crowe_codex.strategies.mesh import CognitiveMesh
+        from crowe_codex.strategies.pipeline_strategy import Pipeline
+        from crowe_codex.strategies.router import AdaptiveRouter
+        from crowe_codex.strategies.verification import VerificationLoop
+
+        router = AdaptiveRouter(strategies={
+            "adversarial": Adversarial(),
+            "consensus": Consensus(),
+            "verification_loop": VerificationLoop(),
+            "pipeline": Pipeline(),
+            "cognitive_mesh": CognitiveMesh(),
+            "evolutionary": Evolutionary(),
+        })
+        return router
+    else:
+        from crowe_codex.strategies.consensus import DEFAULT_AGREEMENT_THRESHOLD, Consensus
+        return Consensus(
+            agreement_threshold=kwargs.get("agreement_threshold", DEFAULT_AGREEMENT_THRESHOLD),
+        )
@@ -6,6 +6,7 @@ import json
 from pathlib import Path
 
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.keywords import KeywordMatcher
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
@@ -28,12 +29,16 @@ DEFAULT_ROUTING: dict[str, str] = {
     "testing": "verification_loop",
 }
 
+# Shared by RoutingHistory and AdaptiveRouter; extend with SIGNAL_MATCHER.add().
+SIGNAL_MATCHER = KeywordMatcher(TASK_SIGNALS)
+
 
 class RoutingHistory:
     """Persists routing decisions and outcomes for learning."""
 
-    def __init__(self, path: Path | None = None) -> None:
+    def __init__(self, path: Path | None = None, matcher: KeywordMatcher | None = None) -> None:
         self._path = path or Path.home() / ".claude" / "crowe-logic" / "routing-history.json"
+        self._matcher = matcher or SIGNAL_MATCHER
         self._history: list[dict[str, object]] = []
         self._load()
 
@@ -75,12 +80,7 @@ class RoutingHistory:
         return best
 
     def _extract_signals(self, task: str) -> list[str]:
-        task_lower = task.lower()
-        return [
-            signal
-            for signal, keywords in TASK_SIGNALS.items()
-            if any(kw in task_lower for kw in keywords)
-        ]
+        return self._matcher.labels(task)
 
     def _save(self) -> None:
         self._path.parent.mkdir(parents=True, exist_ok=True)
@@ -97,9 +97,11 @@ class AdaptiveRouter(Strategy):
         self,
         strategies: dict[str, Strategy] | None = None,
         history: RoutingHistory | None = None,
+        matcher: KeywordMatcher | None = None,
     ) -> None:
         self._strategies = strategies or {}
         self._history = history or RoutingHistory()
+        self._matcher = matcher or SIGNAL_MATCHER
 
     def register_strategy(self, strategy: Strategy) -> None:
         self._strategies[strategy.name] = strategy
@@ -112,12 +114,10 @@ class AdaptiveRouter(Strategy):
             return self._strategies[learned]
 
         # Fall back to keyword-based routing
-        task_lower = task.lower()
-        for signal, keywords in TASK_SIGNALS.items():
-            if any(kw in task_lower for kw in keywords):
-                recommended = DEFAULT_ROUTING.get(signal)
-                if recommended and recommended in self._strategies:
-                    return self._strategies[recommended]
+        for signal in self._matcher.labels(task):
+            recommended = DEFAULT_ROUTING.get(signal)
+            if recommended and recommended in self._strategies:
+                return self._strategies[recommended]
 
         # Default: consensus (lowest cost)
         if "consensus" in self._strategies:
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from crowe_codex.core.agent import Agent
+from crowe_codex.core.diffs import DIFF, FULL, CodeExchange
+from crowe_codex.core.graph import StageGraph
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.base import Strategy
 
@@ -13,8 +17,9 @@ class VerificationLoop(Strategy):
     name = "verification_loop"
     required_stages = [Stage.ARCHITECT, Stage.BUILDER, Stage.DISPATCH]
 
-    def __init__(self, iterations: int = 2) -> None:
+    def __init__(self, iterations: int = 2, code_exchange: str = FULL) -> None:
         self.iterations = iterations
+        self.code_exchange = code_exchange
 
     async def execute(
         self,
@@ -22,74 +27,83 @@ class VerificationLoop(Strategy):
         agents: dict[str, Agent],
         context: dict[str, object] | None = None,
     ) -> dict[str, object]:
-        claude = agents["claude"]
-        codex = agents["codex"]
-        dispatch = agents["dispatch"]
+        exchange = CodeExchange(self.code_exchange)
+        all_code: list[str] = []
+        all_tests: list[str] = []
+        result: dict[str, object] = {
+            "code_output": "",
+            "test_output": "",
+            "dispatch_output": "",
+            "iterations": self.iterations,
+            "strategy": self.name,
+        }
 
+        graph = StageGraph()
         # Round 1: Claude codes, Codex writes tests
-        code_prompt = (
+        graph.add("code0", "claude", lambda _: (
             f"Write production-quality code for this task. Return ONLY code.\n\n"
             f"Task: {task}"
-        )
-        code_output = await claude.execute(code_prompt)
-
-        test_prompt = (
+        ), output="code_output", then=all_code.append)
+        graph.add("tests0", "codex", lambda inputs: (
             f"Write comprehensive tests for the following code. "
             f"Include edge cases, error conditions, and boundary values. "
             f"Return ONLY test code.\n\n"
-            f"Code to test:\n```\n{code_output}\n```"
-        )
-        test_output = await codex.execute(test_prompt)
-
-        all_code = [code_output]
-        all_tests = [test_output]
+            f"Code to test:\n```\n{inputs['code0']}\n```"
+        ), inputs=("code0",), output="test_output", then=all_tests.append)
 
         for i in range(1, self.iterations):
+            code, tests = f"code{i - 1}", f"tests{i - 1}"
+
             # Swap: Codex reviews/fixes code based on tests
-            fix_prompt = (
-                f"Review this code against these tests. Fix any issues the tests "
-                f"would catch. Return ONLY the fixed code.\n\n"
-                f"Code:\n```\n{code_output}\n```\n\n"
-                f"Tests:\n```\n{test_output}\n```"
+            async def fix(
+                fixer: Agent, inputs: Mapping[str, str], code: str = code, tests: str = tests
+            ) -> str:
+                fix_prompt = (
+                    f"Review this code against these tests. Fix any issues the tests "
+                    f"would catch.\n\n"
+                    f"Code:\n```\n{inputs[code]}\n```\n\n"
+                    f"Tests:\n```\n{inputs[tests]}\n```\n\n"
+                )
+                return await exchange.revise(
+                    fixer, fix_prompt, inputs[code], "Return ONLY the fixed code."
+                )
+
+            # Alternate which agent fixes, and which writes the next tests
+            fixer, tester = ("codex", "claude") if i % 2 == 1 else ("claude", "codex")
+            graph.add(
+                f"code{i}", fixer, inputs=(code, tests), output="code_output",
+                run=fix, then=all_code.append, key=self.code_exchange,
             )
-            # Alternate which agent fixes
-            if i % 2 == 1:
-                code_output = await codex.execute(fix_prompt)
-            else:
-                code_output = await claude.execute(fix_prompt)
-
-            all_code.append(code_output)
 
             # Generate additional tests for the fixed code
-            more_tests_prompt = (
-                f"The code has been updated. Write additional tests that cover "
-                f"any new behavior or remaining gaps.\n\n"
-                f"Updated code:\n```\n{code_output}\n```\n\n"
-                f"Existing tests:\n```\n{test_output}\n```"
+            def more_tests(inputs: Mapping[str, str], i: int = i, tests: str = tests) -> str:
+                return (
+                    f"The code has been updated. Write additional tests that cover "
+                    f"any new behavior or remaining gaps.\n\n"
+                    f"Updated code:\n```\n{inputs[f'code{i}']}\n```\n\n"
+                    f"Existing tests:\n```\n{inputs[tests]}\n```"
+                )
+
+            graph.add(
+                f"tests{i}", tester, more_tests,
+                inputs=(f"code{i}", tests), output="test_output", then=all_tests.append,
             )
-            if i % 2 == 1:
-                test_output = await claude.execute(more_tests_prompt)
-            else:
-                test_output = await codex.execute(more_tests_prompt)
-
-            all_tests.append(test_output)
 
         # Dispatch: final verdict
-        dispatch_prompt = (
+        last = max(self.iterations - 1, 0)
+        graph.add("dispatch", "dispatch", lambda inputs: (
             f"Verify this code passes its tests and is production-ready.\n\n"
-            f"Final code:\n```\n{code_output}\n```\n\n"
-            f"Final tests:\n```\n{test_output}\n```\n\n"
+            f"Final code:\n```\n{inputs[f'code{last}']}\n```\n\n"
+            f"Final tests:\n```\n{inputs[f'tests{last}']}\n```\n\n"
             f"Iterations performed: {self.iterations}\n"
             f"Provide verdict and confidence score."
-        )
-        dispatch_output = await dispatch.execute(dispatch_prompt)
+        ), inputs=(f"code{last}", f"tests{last}"), output="dispatch_output")
 
-        return {
-            "code_output": code_output,
-            "test_output": test_output,
-            "dispatch_output": dispatch_output,
-            "iterations": self.iterations,
-            "code_versions": len(all_code),
-            "test_versions": len(all_tests),
-            "strategy": self.name,
-        }
+        async with self.within_deadline(result, context):
+            await graph.run(agents, result)
+
+        if self.code_exchange == DIFF:
+            result["code_exchange"] = vars(exchange.stats)
+        result["code_versions"] = len(all_code)
+        result["test_versions"] = len(all_tests)
+        return result
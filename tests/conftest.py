@@ -0,0 +1,88 @@
+"""Shared fixtures: a local stand-in HTTP server for provider APIs."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StandInServer:
+    """Threaded HTTP/1.1 server that answers with a test-supplied handler.
+
+    The handler receives ``(method, path, body)`` where ``body`` is the
+    decoded JSON request, the raw bytes of a non-JSON request (e.g. a
+    multipart upload), or None, and returns ``(status, payload)`` or
+    ``(status, payload, headers)``. Dict/list payloads are sent as JSON.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests: list[tuple[str, str, object]] = []
+        self.connections: set[tuple[str, int]] = set()
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = raw
+                server.requests.append((self.command, self.path, body))
+                server.connections.add(self.client_address)
+                result = server.handler(self.command, self.path, body)
+                status, payload = result[0], result[1]
+                headers = result[2] if len(result) > 2 else {}
+                if isinstance(payload, (dict, list)):
+                    data = json.dumps(payload).encode()
+                    headers.setdefault("Content-Type", "application/json")
+                else:
+                    data = payload if isinstance(payload, bytes) else str(payload).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = _dispatch
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """Factory fixture: ``stand_in_server(handler)`` returns a running server."""
+    servers = []
+
+    def start(handler):
+        server = StandInServer(handler).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
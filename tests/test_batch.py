@@ -0,0 +1,254 @@
+import asyncio
+import json
+
+import pytest
+
+from crowe_codex.core.agent import AgentConfig
+from crowe_codex.core.batch import BatchError, BatchPolicy, BatchRunner, BatchStore
+from crowe_codex.core.cache import CachedAgent, ResponseCache
+from crowe_codex.core.claude_agent import ClaudeAgent
+from crowe_codex.core.codex_agent import CodexAgent
+from crowe_codex.core.usage import record_usage
+
+FAST = BatchPolicy(poll_initial=0.01, poll_max=0.02)
+
+
+class AnthropicBatches:
+    """Stand-in for the Message Batches endpoints.
+
+    A batch ends after ``polls`` status checks; completions echo the prompt
+    and are returned in reverse order to exercise demultiplexing.
+    """
+
+    def __init__(self, polls=2, fail=()):
+        self.polls = polls
+        self.fail = set(fail)
+        self.url = ""
+        self.batches: dict[str, dict] = {}
+        self.checks: dict[str, int] = {}
+
+    def _batch(self, batch_id):
+        ended = self.checks[batch_id] >= self.polls
+        return {
+            "id": batch_id, "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0,
+            },
+            "created_at": "2026-01-01T00:00:00Z", "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": None, "archived_at": None, "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _line(self, request):
+        prompt = request["params"]["messages"][0]["content"]
+        if prompt in self.fail:
+            result = {"type": "errored", "error": {
+                "type": "error", "error": {"type": "invalid_request_error", "message": "bad"},
+            }}
+        else:
+            result = {"type": "succeeded", "message": {
+                "id": "msg", "type": "message", "role": "assistant", "model": "m",
+                "content": [{"type": "text", "text": f"done: {prompt}"}],
+                "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": 5, "output_tokens": 2},
+            }}
+        return json.dumps({"custom_id": request["custom_id"], "result": result})
+
+    def __call__(self, method, path, body):
+        if method == "POST" and path == "/v1/messages/batches":
+            batch_id = f"msgbatch_{len(self.batches)}"
+            self.batches[batch_id] = body
+            self.checks[batch_id] = 0
+            return 200, self._batch(batch_id)
+        batch_id = path.split("/")[4]
+        if path.endswith("/results"):
+            lines = [self._line(r) for r in reversed(self.batches[batch_id]["requests"])]
+            return 200, "\n".join(lines).encode(), {"Content-Type": "application/binary"}
+        self.checks[batch_id] += 1
+        return 200, self._batch(batch_id)
+
+
+class OpenAIBatches:
+    """Stand-in for /v1/files and /v1/batches."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, str] = {}
+
+    def _batch(self, batch_id):
+        return {
+            "id": batch_id, "object": "batch", "endpoint": "/v1/chat/completions",
+            "input_file_id": self.batches[batch_id], "completion_window": "24h",
+            "status": "completed", "created_at": 0,
+            "output_file_id": f"out-{batch_id}", "error_file_id": f"err-{batch_id}",
+        }
+
+    def _output(self, file_id, errors):
+        lines = []
+        for line in self.files[self.batches[file_id.split("-", 1)[1]]].splitlines():
+            request = json.loads(line)
+            prompt = request["body"]["messages"][0]["content"]
+            if (prompt in self.fail) != errors:
+                continue
+            if errors:
+                response = {"status_code": 400, "body": {"error": {"message": "bad"}}}
+            else:
+                response = {"status_code": 200, "body": {
+                    "id": "c", "object": "chat.completion", "created": 0, "model": "m",
+                    "choices": [{
+                        "index": 0, "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": f"done: {prompt}"},
+                    }],
+                    "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+                }}
+            lines.append(json.dumps({
+                "id": "r", "custom_id": request["custom_id"], "response": response, "error": None,
+            }))
+        return "\n".join(reversed(lines)).encode()
+
+    def __call__(self, method, path, body):
+        if path == "/v1/files":
+            file_id = f"file-{len(self.files)}"
+            start = body.index(b'{"custom_id"')
+            self.files[file_id] = body[start:body.index(b"\r\n--", start)]
+            return 200, {
+                "id": file_id, "object": "file", "bytes": len(body), "created_at": 0,
+                "filename": "batch.jsonl", "purpose": "batch", "status": "processed",
+            }
+        if path == "/v1/batches":
+            batch_id = f"batch_{len(self.batches)}"
+            self.batches[batch_id] = body["input_file_id"]
+            return 200, self._batch(batch_id)
+        if path.startswith("/v1/batches/"):
+            return 200, self._batch(path.rsplit("/", 1)[1])
+        file_id = path.split("/")[3]
+        return 200, self._output(file_id, errors=file_id.startswith("err-"))
+
+
+def _claude(server, store):
+    config = AgentConfig(name="claude", provider="anthropic", api_key="k", base_url=server.url)
+    return ClaudeAgent(config, BatchRunner(store, FAST))
+
+
+def _codex(server, store):
+    config = AgentConfig(name="codex", provider="openai", api_key="k", base_url=f"{server.url}/v1")
+    return CodexAgent(config, BatchRunner(store, FAST))
+
+
+def _submissions(server, path):
+    return [r for r in server.requests if r[0] == "POST" and r[1] == path]
+
+
+def test_poll_delays_back_off_to_a_cap():
+    next_delay = BatchPolicy(poll_initial=1.0, poll_max=5.0, backoff=2.0).delays()
+    assert [next_delay() for _ in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+@pytest.mark.asyncio
+async def test_claude_batch_demultiplexes_in_prompt_order(stand_in_server, tmp_path):
+    api = AnthropicBatches(polls=2)
+    server = stand_in_server(api)
+    api.url = server.url
+    store = BatchStore(tmp_path)
+    prompts = [f"file {i}" for i in range(5)]
+
+    with record_usage() as usage:
+        results = await _claude(server, store).execute_many(prompts)
+
+    assert results == [f"done: {p}" for p in prompts]
+    assert len(_submissions(server, "/v1/messages/batches")) == 1
+    # Two polls, plus the lookup of results_url when fetching results.
+    assert api.checks["msgbatch_0"] == 3
+    assert len(usage) == 5 and usage[0].input_tokens == 5
+    assert store.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_crashed_job_resumes_its_stored_batch(stand_in_server, tmp_path):
+    api = AnthropicBatches(polls=1000)
+    server = stand_in_server(api)
+    api.url = server.url
+    prompts = ["a", "b"]
+
+    crashed = asyncio.create_task(_claude(server, BatchStore(tmp_path)).execute_many(prompts))
+    while not api.checks.get("msgbatch_0"):
+        await asyncio.sleep(0.01)
+    crashed.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await crashed
+
+    store = BatchStore(tmp_path)
+    assert [r["batch_id"] for r in store.pending()] == ["msgbatch_0"]
+    api.polls = 0
+    results = await _claude(server, store).execute_many(prompts)
+
+    assert results == ["done: a", "done: b"]
+    assert len(_submissions(server, "/v1/messages/batches")) == 1
+    assert store.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_keep_the_successes(stand_in_server, tmp_path):
+    api = AnthropicBatches(polls=0, fail={"b"})
+    server = stand_in_server(api)
+    api.url = server.url
+
+    with pytest.raises(BatchError) as info:
+        await _claude(server, BatchStore(tmp_path)).execute_many(["a", "b", "c"])
+
+    assert info.value.results == ["done: a", None, "done: c"]
+    assert list(info.value.failures) == [1]
+    assert "bad" in info.value.failures[1]
+
+
+@pytest.mark.asyncio
+async def test_codex_batch_uploads_jsonl_and_reads_output_files(stand_in_server, tmp_path):
+    api = OpenAIBatches(fail={"y"})
+    server = stand_in_server(api)
+    agent = _codex(server, BatchStore(tmp_path))
+
+    assert await agent.execute_many(["w", "x"]) == ["done: w", "done: x"]
+    with pytest.raises(BatchError) as info:
+        await agent.execute_many(["x", "y"])
+    assert info.value.results == ["done: x", None]
+    assert "status 400" in info.value.failures[1]
+
+    uploaded = api.files["file-0"].decode().splitlines()
+    assert [json.loads(line)["custom_id"] for line in uploaded] == ["req-0", "req-1"]
+    assert len(_submissions(server, "/v1/batches")) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_wrapper_only_batches_misses(stand_in_server, tmp_path):
+    api = AnthropicBatches(polls=0)
+    server = stand_in_server(api)
+    api.url = server.url
+    agent = CachedAgent(_claude(server, BatchStore(tmp_path)), ResponseCache(persist=False))
+
+    assert await agent.execute_many(["a", "b"]) == ["done: a", "done: b"]
+    assert await agent.execute_many(["b", "c", "a"]) == ["done: b", "done: c", "done: a"]
+
+    second = api.batches["msgbatch_1"]["requests"]
+    assert [r["params"]["messages"][0]["content"] for r in second] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_cached_wrapper_keeps_the_successes_of_a_failed_batch(stand_in_server, tmp_path):
+    api = AnthropicBatches(polls=0, fail={"c"})
+    server = stand_in_server(api)
+    api.url = server.url
+    cache = ResponseCache(persist=False)
+    agent = CachedAgent(_claude(server, BatchStore(tmp_path)), cache)
+
+    assert await agent.execute_many(["a"]) == ["done: a"]
+    with pytest.raises(BatchError) as info:
+        await agent.execute_many(["a", "b", "c"])
+    assert info.value.results == ["done: a", "done: b", None]
+    assert list(info.value.failures) == [2]
+
+    api.fail.clear()
+    assert await agent.execute_many(["b", "c"]) == ["done: b", "done: c"]
+    third = api.batches["msgbatch_2"]["requests"]
+    assert [r["params"]["messages"][0]["content"] for r in third] == ["c"]
@@ -0,0 +1,175 @@
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.budget import (
+    DROP,
+    KEEP,
+    SUMMARIZE,
+    BudgetedAgent,
+    Prompt,
+    PromptBudgeter,
+    PromptTooLong,
+    Section,
+    TokenEstimator,
+    summarize,
+    trim,
+)
+from crowe_codex.core.claude_agent import ClaudeAgent
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.usage import TokenUsage, record_usage, report_usage
+from crowe_codex.strategies.consensus import Consensus
+
+
+class EchoAgent(Agent):
+    def __init__(self, name="echo", provider="ollama", billed_ratio=None):
+        super().__init__(config=AgentConfig(name=name, provider=provider))
+        self.prompts = []
+        self.billed_ratio = billed_ratio
+
+    async def execute(self, prompt, context=None):
+        self.prompts.append(prompt)
+        if self.billed_ratio:
+            report_usage(TokenUsage(
+                provider=self.config.provider, model="m",
+                input_tokens=int(len(prompt) / self.billed_ratio), output_tokens=1,
+                prompt_chars=len(prompt),
+            ))
+        return "ok"
+
+    async def is_available(self):
+        return True
+
+
+def small_budgeter(tokens=100):
+    return PromptBudgeter(TokenEstimator({"ollama": 1.0}), windows={"ollama": tokens})
+
+
+def test_estimator_calibrates_toward_billed_counts():
+    estimator = TokenEstimator({"openai": 4.0}, smoothing=0.5)
+    assert estimator.estimate("x" * 400, "openai") == 100
+    estimator.observe("openai", chars=400, tokens=200)
+    assert estimator.ratio("openai") == 3.0
+    assert estimator.estimate("x" * 300, "unknown") == 86
+
+
+def test_prompt_is_a_plain_string_with_sections():
+    prompt = Prompt("head ", Section("body", priority=1), " tail")
+    assert prompt == "head body tail"
+    assert [s.policy for s in prompt.sections] == [KEEP, "trim", KEEP]
+
+
+def test_fitting_prompt_is_untouched():
+    prompt = "short"
+    assert small_budgeter().fit(prompt, "ollama") is prompt
+
+
+def test_lowest_priority_section_is_reduced_first():
+    prompt = Prompt(
+        "INSTRUCTIONS\n",
+        Section("keep me\n" * 8, priority=5, label="code"),
+        Section("noise line\n" * 20, priority=0, policy=DROP, label="fuzz"),
+    )
+    fitted = small_budgeter(150).fit(prompt, "ollama")
+    assert fitted.startswith("INSTRUCTIONS\n" + "keep me\n" * 8)
+    assert "[fuzz omitted to fit the context window]" in fitted
+    assert len(fitted) <= 142
+
+
+def test_summarize_keeps_findings_then_trims():
+    findings = "=== attacks ===\n" + "".join(
+        f"- CRITICAL issue {i}\nexplanation prose {i}\n" for i in range(5)
+    )
+    fitted = small_budgeter(200).fit(
+        Prompt("Q\n", Section(findings, policy=SUMMARIZE, label="attacks")), "ollama",
+    )
+    assert fitted.startswith("Q\n=== attacks ===\n[summarized")
+    assert "- CRITICAL issue 0" in fitted
+    assert "explanation prose" not in fitted
+
+
+def test_plain_prompt_is_trimmed_from_the_middle():
+    text = "".join(f"line {i}\n" for i in range(100))
+    fitted = small_budgeter(200).fit(text, "ollama")
+    assert fitted.startswith("line 0\n")
+    assert fitted.rstrip().endswith("line 99")
+    assert "lines trimmed" in fitted
+    assert len(fitted) <= 190
+
+
+def test_unshrinkable_prompt_raises_locally():
+    with pytest.raises(PromptTooLong) as info:
+        small_budgeter(10).fit(Prompt("x" * 50), "ollama")
+    assert info.value.budget == 9
+
+
+def test_summarize_and_trim_helpers():
+    assert summarize("one line") == "one line"
+    assert summarize("hdr\ndef f():\n    return 1\n") == (
+        "hdr\n[summarized: kept 1 of 2 lines]\ndef f():\n"
+    )
+    assert trim("short", 10) == "short"
+
+
+@pytest.mark.asyncio
+async def test_budgeted_agent_never_sends_over_budget_prompts():
+    inner = EchoAgent()
+    agent = BudgetedAgent(inner, small_budgeter(10))
+    with pytest.raises(PromptTooLong):
+        await agent.execute(Prompt("y" * 100))
+    assert inner.prompts == []
+
+
+@pytest.mark.asyncio
+async def test_budgeted_agent_calibrates_from_usage():
+    budgeter = PromptBudgeter(TokenEstimator({"ollama": 4.0}, smoothing=1.0))
+    agent = BudgetedAgent(EchoAgent(billed_ratio=2.0), budgeter)
+    with record_usage() as usage:
+        await agent.execute("z" * 100)
+    assert budgeter.estimator.ratio("ollama") == 2.0
+    assert usage[0].input_tokens == 50
+
+
+@pytest.mark.asyncio
+async def test_budgeted_agent_calibrates_from_streamed_usage():
+    budgeter = PromptBudgeter(TokenEstimator({"ollama": 4.0}, smoothing=1.0))
+    agent = BudgetedAgent(EchoAgent(billed_ratio=2.0), budgeter)
+    with record_usage() as usage:
+        chunks = [chunk async for chunk in agent.execute_stream("z" * 100)]
+    assert chunks == ["ok"]
+    assert budgeter.estimator.ratio("ollama") == 2.0
+    assert usage[0].input_tokens == 50
+
+
+def test_nim_gets_its_own_window_and_ratio():
+    from crowe_codex.core.nim_agent import NimAgent
+
+    provider = NimAgent().config.provider
+    budgeter = PromptBudgeter()
+    assert budgeter.budget_for(provider, "", 4096) == int(32_768 * 0.95) - 4096
+    assert budgeter.estimator.ratio(provider) == 4.0
+
+
+def test_dispatch_prompt_sections_are_condensable():
+    agent = ClaudeAgent(AgentConfig(name="claude", provider="anthropic", api_key="k"))
+    prompt = agent.build_dispatch_prompt("task", {"stage_2": "code", "stage_3": "review"})
+    assert [s.label for s in prompt.sections if s.policy == SUMMARIZE] == ["stage_2", "stage_3"]
+
+
+@pytest.mark.asyncio
+async def test_engine_fits_prompts_and_reports_usage():
+    budgeter = PromptBudgeter(
+        TokenEstimator({}), windows={"anthropic": 1000, "openai": 1000},
+    )
+    engine = DualEngine(auto_detect=False, budget=budgeter)
+    agents = {
+        "claude": EchoAgent("claude", "anthropic", billed_ratio=4.0),
+        "codex": EchoAgent("codex", "openai", billed_ratio=4.0),
+        "dispatch": EchoAgent("dispatch", "anthropic", billed_ratio=4.0),
+    }
+    for name, agent in agents.items():
+        engine.register_agent(name, agent)
+    # Echoed prompts agree exactly; always merge so dispatch is fitted too.
+    result = await engine.run(Consensus(agreement_threshold=float("inf")), task="t" * 2000)
+    assert all(len(p) < 3500 for p in agents["claude"].prompts)
+    assert result.metadata["usage"]["calls"] == 3
+    assert budgeter.estimator.ratio("openai") == pytest.approx(3.6, abs=0.1)
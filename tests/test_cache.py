@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.cache import CachedAgent, ResponseCache, cache_key
+from crowe_codex.core.claude_agent import ClaudeAgent
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.nim_agent import NimAgent
+from crowe_codex.core.ollama_agent import OllamaAgent
+from crowe_codex.core.ollama_pool import OllamaPool
+
+
+class CountingAgent(Agent):
+    def __init__(self, model="m1"):
+        super().__init__(config=AgentConfig(name="count", provider="test", model=model))
+        self.calls = 0
+
+    async def execute(self, prompt, context=None):
+        self.calls += 1
+        return f"answer to {prompt}"
+
+    async def is_available(self):
+        return True
+
+
+def test_cache_key_depends_on_model_and_prompt():
+    base = cache_key({"provider": "test", "model": "a"}, "hello")
+    assert base == cache_key({"model": "a", "provider": "test"}, "hello")
+    assert base != cache_key({"provider": "test", "model": "b"}, "hello")
+    assert base != cache_key({"provider": "test", "model": "a"}, "hello!")
+
+
+def test_ollama_fingerprint_uses_routed_model():
+    agent = OllamaAgent(config=AgentConfig(name="ollama", provider="ollama"))
+    routed = agent.fingerprint({"task": "simulate particle collision"})
+    assert "Physics" in str(routed["model"])
+    assert agent.fingerprint()["model"] == agent.model
+
+
+def test_fingerprints_include_the_endpoint():
+    def claude(url):
+        return ClaudeAgent(AgentConfig(name="claude", provider="anthropic", base_url=url))
+
+    def ollama(url):
+        return OllamaAgent(AgentConfig(name="ollama", provider="ollama", base_url=url))
+
+    assert claude("http://proxy-a").fingerprint() != claude("http://proxy-b").fingerprint()
+    assert ollama("http://a:11434").fingerprint() != ollama("http://b:11434").fingerprint()
+    assert ollama("").fingerprint() == ollama("http://localhost:11434").fingerprint()
+    pool = OllamaPool(["http://a:11434", "http://b:11434"]).fingerprint()
+    assert pool == OllamaPool(["http://b:11434", "http://a:11434"]).fingerprint()
+    assert pool != OllamaPool(["http://a:11434"]).fingerprint()
+
+
+def test_nim_fallback_not_cacheable():
+    agent = NimAgent()
+    assert agent.is_cacheable("[NIM_UNAVAILABLE] Stage 4 skipped.") is False
+    assert agent.is_cacheable("real output") is True
+
+
+def test_memory_lru_eviction():
+    cache = ResponseCache(max_entries=2, persist=False)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.memory_entries == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    cache = ResponseCache(ttl=10, persist=False)
+    cache.put("k", "v")
+    now = time.time()
+    monkeypatch.setattr("crowe_codex.core.cache.time.time", lambda: now + 60)
+    assert cache.get("k") is None
+    assert cache.stats().expirations == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    first = ResponseCache(directory=tmp_path)
+    first.put("abcd", "persisted")
+
+    second = ResponseCache(directory=tmp_path)
+    assert second.get("abcd") == "persisted"
+    stats = second.stats()
+    assert stats.disk_hits == 1
+    assert stats.disk_bytes > 0
+
+
+def test_disk_size_cap(tmp_path):
+    cache = ResponseCache(directory=tmp_path, max_disk_bytes=300)
+    for i in range(10):
+        cache.put(f"{i:02d}key", "x" * 100)
+    assert cache.stats().disk_bytes <= 300
+    assert len(list(tmp_path.glob("*/*.json"))) < 10
+
+
+@pytest.mark.asyncio
+async def test_cached_agent_serves_repeat_prompts(tmp_path):
+    inner = CountingAgent()
+    agent = CachedAgent(inner, ResponseCache(directory=tmp_path))
+    assert await agent.execute("p") == "answer to p"
+    assert await agent.execute("p") == "answer to p"
+    assert inner.calls == 1
+    await agent.execute("other")
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_exposes_cache_stats(tmp_path):
+    engine = DualEngine(auto_detect=False, cache=ResponseCache(directory=tmp_path))
+    engine.register_agent("claude", CountingAgent())
+    agent = engine._agents["claude"]
+    await agent.execute("same")
+    await agent.execute("same")
+    stats = engine.cache_stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+
+    engine.clear_cache()
+    assert engine.cache_stats().disk_bytes == 0
+
+
+def test_engine_without_cache_reports_empty_stats():
+    engine = DualEngine(auto_detect=False)
+    assert engine.cache is None
+    assert engine.cache_stats().hits == 0
@@ -0,0 +1,111 @@
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.checkpoint import CheckpointStore, checkpointed_run
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.strategies.adversarial import Adversarial
+from crowe_codex.strategies.pipeline_strategy import Pipeline
+
+
+class FlakyAgent(Agent):
+    """Answers with a numbered reply; raises while ``failing`` is set."""
+
+    def __init__(self, name, failing=False):
+        super().__init__(config=AgentConfig(name=name, provider=name))
+        self.failing = failing
+        self.calls = 0
+
+    async def execute(self, prompt, context=None):
+        self.calls += 1
+        if self.failing:
+            raise RuntimeError(f"{self.config.name} is down")
+        return f"{self.config.name} reply {self.calls}"
+
+    async def is_available(self):
+        return True
+
+
+def make_engine(tmp_path, failing=()):
+    engine = DualEngine(auto_detect=False, checkpoints=CheckpointStore(tmp_path))
+    agents = {n: FlakyAgent(n, n in failing) for n in ("claude", "codex", "ollama", "dispatch")}
+    for name, agent in agents.items():
+        engine.register_agent(name, agent)
+    return engine, agents
+
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_without_repeating_finished_stages(tmp_path):
+    engine, agents = make_engine(tmp_path, failing={"dispatch"})
+    with pytest.raises(RuntimeError) as failure:
+        await engine.run(Pipeline(), "build a parser")
+    run_id = checkpointed_run(failure.value)
+    assert run_id in engine.checkpoints.runs()
+
+    agents["dispatch"].failing = False
+    result = await engine.run(Pipeline(), "build a parser", resume=run_id)
+
+    assert [agents[n].calls for n in ("claude", "codex", "ollama")] == [1, 1, 1]
+    assert result.metadata["resumed_stages"] == ["architect", "build", "specialist"]
+    assert result.code == "dispatch reply 2"
+    assert [o.content for o in result.stage_outputs][:2] == ["claude reply 1", "codex reply 1"]
+    # Finished runs leave nothing behind.
+    assert engine.checkpoints.runs() == []
+
+
+@pytest.mark.asyncio
+async def test_resumed_adversarial_rounds_rebuild_their_state(tmp_path):
+    engine, agents = make_engine(tmp_path, failing={"dispatch"})
+    strategy = Adversarial(rounds=2)
+    with pytest.raises(RuntimeError) as failure:
+        await engine.run(strategy, "harden the login")
+    calls = {n: a.calls for n, a in agents.items()}
+
+    agents["dispatch"].failing = False
+    result = await engine.run(strategy, "harden the login", resume=checkpointed_run(failure.value))
+
+    assert {n: a.calls - calls[n] for n, a in agents.items()} == {
+        "claude": 0, "codex": 0, "ollama": 0, "dispatch": 1,
+    }
+    assert "dispatch" not in result.metadata["resumed_stages"]
+    assert result.code.startswith("dispatch reply")
+
+
+@pytest.mark.asyncio
+async def test_resume_checks_the_run_it_continues(tmp_path):
+    engine, _ = make_engine(tmp_path, failing={"dispatch"})
+    with pytest.raises(RuntimeError) as failure:
+        await engine.run(Pipeline(), "task one")
+    run_id = checkpointed_run(failure.value)
+
+    with pytest.raises(ValueError, match="same strategy and task"):
+        await engine.run(Pipeline(), "task two", resume=run_id)
+    with pytest.raises(KeyError):
+        await engine.run(Pipeline(), "task one", resume="../../etc/passwd")
+    with pytest.raises(ValueError, match="checkpoint store"):
+        await DualEngine(auto_detect=False).run(Pipeline(), "task one", resume=run_id)
+
+
+def test_torn_write_is_dropped_and_appends_continue(tmp_path):
+    store = CheckpointStore(tmp_path)
+    checkpoint = store.create("pipeline", "t")
+    checkpoint.record("architect", "claude", "plan")
+    with checkpoint.path.open("a") as f:
+        f.write('{"node": "build", "agent": "co')  # crashed mid-write
+
+    reopened = store.open(checkpoint.run_id)
+    assert reopened.outputs == {"architect": ("claude", "plan")}
+    reopened.record("build", "codex", "code")
+    assert store.open(checkpoint.run_id).outputs == {
+        "architect": ("claude", "plan"), "build": ("codex", "code"),
+    }
+    assert reopened.restore("build", "claude") is None
+
+
+@pytest.mark.asyncio
+async def test_run_that_fails_before_any_stage_leaves_no_checkpoint(tmp_path):
+    engine, _ = make_engine(tmp_path, failing={"claude"})
+    with pytest.raises(RuntimeError) as failure:
+        await engine.run(Pipeline(), "build a parser")
+
+    assert checkpointed_run(failure.value) is None
+    assert engine.checkpoints.runs() == []
@@ -83,6 +83,31 @@ def test_cli_security_audit_help():
     assert "compliance" in result.output
 
 
+def test_cli_security_audit_rejects_resume():
+    runner = CliRunner()
+    result = runner.invoke(main, ["--resume", "run-1", "security-audit", "x = 1"])
+    assert result.exit_code == 2
+    assert "--resume" in result.output
+
+
+def test_cli_security_audit_closes_engine_when_detection_fails(monkeypatch):
+    closed = []
+
+    class FailingEngine:
+        async def detect(self):
+            raise RuntimeError("no providers")
+
+        async def aclose(self):
+            closed.append(True)
+
+    monkeypatch.setattr("crowe_codex.cli._build_engine", lambda stream: FailingEngine())
+    runner = CliRunner()
+    result = runner.invoke(main, ["security-audit", "x = 1"])
+    assert result.exit_code == 0
+    assert "no providers" in result.output
+    assert closed == [True]
+
+
 def test_cli_strategies_list():
     runner = CliRunner()
     result = runner.invoke(main, ["strategies"])
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.coalesce import CoalescingAgent, SingleFlight
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.security.owasp import OWASPScanner
+
+
+class SlowAgent(Agent):
+    def __init__(self, model="m", fail=False):
+        super().__init__(config=AgentConfig(name="slow", provider="test", model=model))
+        self.calls = 0
+        self.fail = fail
+
+    async def execute(self, prompt, context=None):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return f"{self.config.model}:{prompt}"
+
+    async def execute_stream(self, prompt, context=None):
+        self.calls += 1
+        for part in ("a", "b"):
+            await asyncio.sleep(0.01)
+            yield part
+
+    async def is_available(self):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_call():
+    inner = SlowAgent()
+    group = SingleFlight()
+    agent = CoalescingAgent(inner, group)
+    results = await asyncio.gather(*(agent.execute("same") for _ in range(5)))
+    assert results == ["m:same"] * 5
+    assert inner.calls == 1
+    stats = group.stats()
+    assert stats.calls == 5
+    assert stats.executed == 1
+    assert stats.coalesced == 4
+    assert group.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced():
+    inner = SlowAgent()
+    agent = CoalescingAgent(inner, SingleFlight())
+    await agent.execute("p")
+    await agent.execute("p")
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_different_models_are_not_coalesced():
+    group = SingleFlight()
+    a, b = SlowAgent("a"), SlowAgent("b")
+    await asyncio.gather(
+        CoalescingAgent(a, group).execute("p"), CoalescingAgent(b, group).execute("p")
+    )
+    assert a.calls == b.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    inner = SlowAgent(fail=True)
+    agent = CoalescingAgent(inner, SingleFlight())
+    results = await asyncio.gather(
+        agent.execute("p"), agent.execute("p"), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    inner = SlowAgent()
+    agent = CoalescingAgent(inner, SingleFlight())
+    first = asyncio.ensure_future(agent.execute("p"))
+    second = asyncio.ensure_future(agent.execute("p"))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "m:p"
+
+
+@pytest.mark.asyncio
+async def test_stream_followers_receive_joined_result():
+    inner = SlowAgent()
+    agent = CoalescingAgent(inner, SingleFlight())
+
+    async def collect():
+        return [c async for c in agent.execute_stream("p")]
+
+    leader, follower = await asyncio.gather(collect(), collect())
+    assert leader == ["a", "b"]
+    assert follower == ["ab"]
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_audits_coalesce_through_engine():
+    engine = DualEngine(auto_detect=False)
+    inner = SlowAgent()
+    engine.register_agent("codex", inner)
+    scanner = OWASPScanner(engine._agents)
+    await asyncio.gather(scanner.scan("x = 1"), scanner.scan("x = 1"))
+    assert inner.calls == 1
+    assert engine.coalesce_stats().coalesced == 1
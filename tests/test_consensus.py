@@ -1,15 +1,18 @@
 import pytest
 from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.engine import DualEngine
 from crowe_codex.core.result import Stage
 from crowe_codex.strategies.consensus import Consensus
 
 
 class FakeAgent(Agent):
-    def __init__(self, response: str):
-        super().__init__(config=AgentConfig(name="fake", provider="test"))
+    def __init__(self, response: str, provider: str = "test"):
+        super().__init__(config=AgentConfig(name="fake", provider=provider))
         self._response = response
+        self.calls = 0
 
     async def execute(self, prompt, context=None):
+        self.calls += 1
         return self._response
 
     async def is_available(self):
@@ -47,3 +50,51 @@ async def test_consensus_disagreement():
     strategy = Consensus()
     result = await strategy.execute("add two numbers", agents)
     assert result["claude_output"] != result["codex_output"]
+
+
+@pytest.mark.asyncio
+async def test_equivalent_implementations_skip_dispatch():
+    agents = {
+        "claude": FakeAgent("Sure:\n```python\ndef add(a, b):\n    return a + b\n```"),
+        "codex": FakeAgent("def add(x, y): return x + y"),
+        "dispatch": FakeAgent("merged"),
+    }
+    result = await Consensus().execute("add two numbers", agents)
+
+    assert agents["dispatch"].calls == 0
+    assert result["agreement"] == 1.0
+    assert result["skipped_stages"] == ["dispatch"]
+    assert result["agreed_code"] == "def add(a, b):\n    return a + b\n"
+    assert "dispatch_output" not in result
+
+
+@pytest.mark.asyncio
+async def test_divergent_implementations_are_merged():
+    agents = {
+        "claude": FakeAgent("def clamp(x, n): return x if x < n else n"),
+        "codex": FakeAgent("def clamp(x, n): return x if x <= n else n"),
+        "dispatch": FakeAgent("merged"),
+    }
+    result = await Consensus().execute("add two numbers", agents)
+
+    assert agents["dispatch"].calls == 1
+    assert result["agreement"] == 0.0
+    assert result["dispatch_output"] == "merged"
+
+
+@pytest.mark.asyncio
+async def test_engine_reports_measured_agreement():
+    engine = DualEngine(auto_detect=False)
+    engine.register_agent("claude", FakeAgent("def add(a, b): return a + b", "anthropic"))
+    engine.register_agent("codex", FakeAgent("def add(x, y): return x + y", "openai"))
+    engine.register_agent("dispatch", FakeAgent("merged", "anthropic-dispatch"))
+
+    agreed = await engine.run(Consensus(), task="add two numbers")
+    assert agreed.code == "def add(a, b): return a + b"
+    assert agreed.confidence.cross_vendor_agreement == 1.0
+    assert agreed.metadata["skipped_stages"] == ["dispatch"]
+    assert [o.agent_name for o in agreed.stage_outputs] == ["claude", "codex"]
+
+    merged = await engine.run(Consensus(agreement_threshold=float("inf")), task="add two")
+    assert merged.code == "merged"
+    assert merged.confidence.cross_vendor_agreement == 1.0
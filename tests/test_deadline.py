@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.deadline import Deadline, DeadlineExceeded
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.strategies.adversarial import Adversarial
+from crowe_codex.strategies.base import Strategy
+from crowe_codex.strategies.consensus import Consensus
+from crowe_codex.strategies.pipeline_strategy import Pipeline
+
+
+class SlowAgent(Agent):
+    def __init__(self, name, delay=0.0):
+        super().__init__(config=AgentConfig(name=name, provider="test"))
+        self.delay = delay
+        self.cancelled = 0
+
+    async def execute(self, prompt, context=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"{self.config.name} output"
+
+    async def is_available(self):
+        return True
+
+
+def test_deadline_remaining_counts_down():
+    deadline = Deadline.after(10)
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired
+    assert Deadline.after(-1).remaining() == 0.0
+    assert Deadline.after(-1).expired
+
+
+@pytest.mark.asyncio
+async def test_scope_cancels_work():
+    deadline = Deadline.after(0.05)
+    with pytest.raises(DeadlineExceeded):
+        async with deadline.scope():
+            assert deadline.remaining() <= 0.05
+            await asyncio.sleep(1)
+    assert deadline.expired
+
+
+@pytest.mark.asyncio
+async def test_nested_scope_of_same_deadline_is_reentrant():
+    deadline = Deadline.after(0.05)
+    with pytest.raises(DeadlineExceeded):
+        async with deadline.scope():
+            async with deadline.scope():
+                pass
+            await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_returns_completed_stages_on_deadline():
+    agents = {
+        "claude": SlowAgent("claude"),
+        "codex": SlowAgent("codex"),
+        "ollama": SlowAgent("ollama", delay=5),
+        "dispatch": SlowAgent("dispatch"),
+    }
+    result = await Pipeline().execute("task", agents, {"deadline": Deadline.after(0.1)})
+    assert result["partial"] is True
+    assert result["architect_output"] == "claude output"
+    assert result["build_output"] == "codex output"
+    assert result["dispatch_output"] == ""
+    assert agents["ollama"].cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_consensus_keeps_the_faster_implementation():
+    agents = {
+        "claude": SlowAgent("claude"),
+        "codex": SlowAgent("codex", delay=5),
+        "dispatch": SlowAgent("dispatch"),
+    }
+    result = await Consensus().execute("task", agents, {"deadline": Deadline.after(0.1)})
+    assert result["claude_output"] == "claude output"
+    assert result["codex_output"] == ""
+    assert result["deadline_exceeded"] is True
+
+
+@pytest.mark.asyncio
+async def test_engine_run_returns_best_partial_result():
+    engine = DualEngine(auto_detect=False)
+    engine.register_agent("claude", SlowAgent("claude"))
+    engine.register_agent("codex", SlowAgent("codex", delay=5))
+    engine.register_agent("ollama", SlowAgent("ollama"))
+    engine.register_agent("dispatch", SlowAgent("dispatch"))
+
+    result = await engine.run(Adversarial(), task="t", deadline=0.1)
+    assert result.code == "claude output"
+    assert result.metadata["deadline_exceeded"] is True
+    assert "partial" in result.summary
+    # The fuzz stage runs alongside the stalled attack, so it still lands.
+    assert [o.agent_name for o in result.stage_outputs] == ["build", "fuzz"]
+    assert result.metadata["critical_path"] == ["build0", "fuzz0"]
+
+
+@pytest.mark.asyncio
+async def test_engine_run_without_deadline_is_unbounded():
+    engine = DualEngine(auto_detect=False)
+    for name in ("claude", "codex", "dispatch"):
+        engine.register_agent(name, SlowAgent(name, delay=0.01))
+    result = await engine.run(Consensus(agreement_threshold=float("inf")), task="t")
+    assert result.code == "dispatch output"
+    assert "deadline_exceeded" not in result.metadata
+
+
+@pytest.mark.asyncio
+async def test_engine_abandons_strategy_that_ignores_deadline(monkeypatch):
+    monkeypatch.setattr("crowe_codex.core.engine.DEADLINE_GRACE", 0.01)
+
+    class Stubborn(Strategy):
+        name = "stubborn"
+
+        async def execute(self, task, agents, context=None):
+            await asyncio.sleep(5)
+            return {}
+
+    with pytest.raises(DeadlineExceeded):
+        await DualEngine(auto_detect=False).run(Stubborn(), task="t", deadline=0.05)
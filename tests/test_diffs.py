@@ -0,0 +1,133 @@
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.diffs import (
+    DIFF,
+    DIFF_INSTRUCTION,
+    CodeExchange,
+    DiffApplyError,
+    apply_diff,
+    parse_diff,
+)
+from crowe_codex.strategies.adversarial import Adversarial
+from crowe_codex.strategies.verification import VerificationLoop
+
+CODE = "def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n"
+
+PATCH = """```diff
+--- a/code.py
++++ b/code.py
+@@ -4,3 +4,4 @@
+ 
+ def sub(a, b):
+-    return a - b
++    # validated
++    return int(a) - int(b)
+```
+That fixes the coercion issue.
+"""
+
+
+class ScriptedAgent(Agent):
+    def __init__(self, *responses):
+        super().__init__(config=AgentConfig(name="scripted", provider="test"))
+        self.responses = list(responses)
+        self.prompts = []
+
+    async def execute(self, prompt, context=None):
+        self.prompts.append(prompt)
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+    async def is_available(self):
+        return True
+
+
+def test_apply_diff_tolerates_fences_and_trailing_prose():
+    patched = apply_diff(CODE, PATCH)
+    assert patched.endswith("def sub(a, b):\n    # validated\n    return int(a) - int(b)\n")
+    assert patched.startswith("def add(a, b):\n    return a + b\n")
+
+
+def test_apply_diff_finds_shifted_hunks():
+    shifted = "# header\n" + CODE
+    assert "int(a) - int(b)" in apply_diff(shifted, PATCH)
+
+
+def test_apply_diff_rejects_mismatched_context():
+    with pytest.raises(DiffApplyError):
+        apply_diff(CODE.replace("a - b", "b - a"), PATCH)
+
+
+def test_parse_diff_pure_insertion():
+    (hunk,) = parse_diff("@@ -2,0 +3,1 @@\n+    pass\n")
+    assert hunk.old_lines == [] and hunk.new_lines == ["    pass"]
+    assert apply_diff("a\nb\nc\n", "@@ -2,0 +3,1 @@\n+x\n") == "a\nb\nx\nc\n"
+
+
+@pytest.mark.asyncio
+async def test_exchange_applies_diff_locally():
+    agent = ScriptedAgent(PATCH)
+    exchange = CodeExchange(DIFF)
+    revised = await exchange.revise(agent, "Fix it.\n\n", CODE, "Return code.")
+    assert "int(a) - int(b)" in revised
+    assert agent.prompts[0].endswith(DIFF_INSTRUCTION)
+    assert exchange.stats.diffs_applied == 1
+
+
+@pytest.mark.asyncio
+async def test_exchange_falls_back_to_full_text_on_bad_diff():
+    bad = "@@ -1,1 +1,1 @@\n-nonexistent line\n+x\n"
+    agent = ScriptedAgent(bad, "FULL CODE")
+    exchange = CodeExchange(DIFF)
+    assert await exchange.revise(agent, "Fix.\n\n", CODE, "Return code.") == "FULL CODE"
+    assert agent.prompts[1].endswith("Return code.")
+    assert exchange.stats.fallbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_exchange_accepts_full_text_and_empty_diff():
+    exchange = CodeExchange(DIFF)
+    new_code = "def add(a, b):\n    return b + a\n"
+    assert await exchange.revise(ScriptedAgent(new_code), "p", CODE, "r") == new_code
+    fenced = "```python\nadd = sum\n```"
+    assert await exchange.revise(ScriptedAgent(fenced), "p", CODE, "r") == fenced
+    assert await exchange.revise(ScriptedAgent("  "), "p", CODE, "r") == CODE
+    assert exchange.stats.full_text == 2
+
+
+@pytest.mark.asyncio
+async def test_exchange_rerequests_full_text_after_prose():
+    agent = ScriptedAgent("No changes needed.", CODE)
+    exchange = CodeExchange(DIFF)
+    assert await exchange.revise(agent, "Fix.\n\n", CODE, "Return code.") == CODE
+    assert agent.prompts[1].endswith("Return code.")
+    assert exchange.stats.fallbacks == 1 and exchange.stats.full_text == 0
+
+
+def test_unknown_exchange_mode_rejected():
+    with pytest.raises(ValueError):
+        CodeExchange("patch")
+
+
+@pytest.mark.asyncio
+async def test_adversarial_diff_rounds_apply_patches():
+    builder = ScriptedAgent(CODE, PATCH)
+    agents = {
+        "claude": builder,
+        "codex": ScriptedAgent("sub does not coerce"),
+        "ollama": ScriptedAgent("sub('1', 2)"),
+        "dispatch": ScriptedAgent("approved"),
+    }
+    result = await Adversarial(rounds=2, code_exchange=DIFF).execute("t", agents)
+    assert "int(a) - int(b)" in result["build_output"]
+    assert result["code_exchange"] == {"diffs_applied": 1, "full_text": 0, "fallbacks": 0}
+
+
+@pytest.mark.asyncio
+async def test_verification_loop_diff_mode():
+    claude = ScriptedAgent(CODE, "more tests")
+    codex = ScriptedAgent("tests", PATCH)
+    agents = {"claude": claude, "codex": codex, "dispatch": ScriptedAgent("ok")}
+    result = await VerificationLoop(iterations=2, code_exchange=DIFF).execute("t", agents)
+    assert "int(a) - int(b)" in result["code_output"]
+    assert result["code_exchange"]["diffs_applied"] == 1
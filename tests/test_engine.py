@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+
 import pytest
 from crowe_codex.core.agent import AgentConfig
 from crowe_codex.core.engine import DualEngine
@@ -49,3 +53,79 @@ def test_engine_available_stages():
     stages = engine.available_stages()
     assert 1 in stages
     assert 5 in stages
+
+
+def test_auto_detect_defers_sdk_imports(tmp_path):
+    script = (
+        "import sys\n"
+        "from crowe_codex.core.engine import DualEngine\n"
+        "engine = DualEngine()\n"
+        "print(sorted(engine.available_agents()))\n"
+        "print(sorted(m for m in ('anthropic', 'openai', 'ollama') if m in sys.modules))\n"
+    )
+    env = {**os.environ, "ANTHROPIC_API_KEY": "sk-a", "OPENAI_API_KEY": "sk-o"}
+    env.pop("NVIDIA_API_KEY", None)
+    out = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    assert out == ["['claude', 'codex', 'dispatch']", "[]"]
+
+
+@pytest.fixture
+def no_keys(monkeypatch):
+    for key in ("ANTHROPIC_API_KEY", "OPENAI_API_KEY", "NVIDIA_API_KEY", "OLLAMA_HOSTS"):
+        monkeypatch.delenv(key, raising=False)
+
+
+@pytest.mark.asyncio
+async def test_auto_detect_registers_ollama_once_it_answers(no_keys, monkeypatch, stand_in_server):
+    server = stand_in_server(lambda method, path, body: (200, {"models": []}))
+    monkeypatch.setenv("OLLAMA_HOST", server.url)
+
+    engine = DualEngine()
+    assert await engine.detect() == ["ollama"]
+    assert [p for m, p, b in server.requests] == ["/api/tags"]
+    await engine.aclose()
+
+
+@pytest.mark.asyncio
+async def test_auto_detect_skips_unreachable_ollama(no_keys, monkeypatch):
+    monkeypatch.setenv("OLLAMA_HOST", "http://127.0.0.1:9")
+
+    engine = DualEngine()
+    assert await engine.detect() == []
+    assert engine.available_stages() == []
+    await engine.aclose()
+
+
+@pytest.mark.asyncio
+async def test_auto_detect_pools_several_ollama_hosts(no_keys, monkeypatch, stand_in_server):
+    servers = [stand_in_server(lambda m, p, b: (200, {"models": []})) for _ in range(2)]
+    monkeypatch.setenv("OLLAMA_HOSTS", ",".join(s.url for s in servers))
+
+    engine = DualEngine()
+    assert await engine.detect() == ["ollama"]
+    assert all(s.requests for s in servers)
+    await engine.aclose()
+
+
+@pytest.mark.asyncio
+async def test_auto_detected_nim_calls_its_default_model(no_keys, monkeypatch, stand_in_server):
+    from crowe_codex.core import nim_agent
+
+    server = stand_in_server(lambda m, p, body: (200, {
+        "id": "c1", "object": "chat.completion", "created": 0, "model": body["model"],
+        "choices": [{
+            "index": 0, "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "accelerated"},
+        }],
+    }))
+    monkeypatch.setattr(nim_agent, "DEFAULT_BASE_URL", f"{server.url}/v1")
+    monkeypatch.setenv("OLLAMA_HOST", "http://127.0.0.1:9")
+    monkeypatch.setenv("NVIDIA_API_KEY", "nvapi-test")
+
+    engine = DualEngine()
+    assert "nim" in await engine.detect()
+    assert await engine._agents["nim"].execute("optimize this") == "accelerated"
+    assert server.requests[0][2]["model"] == nim_agent.DEFAULT_MODEL
+    await engine.aclose()
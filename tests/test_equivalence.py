@@ -0,0 +1,57 @@
+from crowe_codex.core.equivalence import (
+    agreement,
+    canonical_python,
+    extract_code,
+    token_similarity,
+)
+
+
+def test_renamed_and_reformatted_python_agrees_fully():
+    terse = "def add(a, b): return a + b"
+    verbose = (
+        "Here you go:\n```python\n"
+        "def add(x: int, y: int) -> int:\n"
+        '    """Add two numbers."""\n'
+        "    # plain sum\n"
+        "    return x + y\n"
+        "```\n"
+    )
+    assert agreement(terse, verbose) == 1.0
+
+
+def test_python_that_differs_after_normalizing_disagrees():
+    below = "def first_gap(xs, n):\n    for x in xs:\n        if x < n:\n            return x"
+    assert agreement(below, below.replace("x < n", "x <= n")) == 0.0
+    assert agreement("def f(a): return a", "class Stack:\n    items = []") == 0.0
+
+
+def test_dataclasses_with_different_fields_disagree():
+    two_fields = "@dataclass\nclass User:\n    name: str\n    email: str"
+    one_field = "@dataclass\nclass User:\n    id: int"
+    assert agreement(two_fields, one_field) == 0.0
+    assert agreement(two_fields, two_fields.replace("str", "object")) == 1.0
+    # A bare annotation on a local still normalizes away.
+    assert canonical_python("def f():\n    x: int\n    return 1") == "def f():\n    return 1"
+
+
+def test_locals_are_renamed_per_function():
+    code = "def f(n):\n    total = n * 2\n    return total\n\ndef g(n):\n    return n"
+    assert canonical_python(code) == (
+        "def f(_f0_0):\n    _f0_1 = _f0_0 * 2\n    return _f0_1\n\n"
+        "def g(_f1_0):\n    return _f1_0"
+    )
+    # Globals and attributes keep their names.
+    assert "math.pi" in canonical_python("import math\ndef area(r): return math.pi * r")
+
+
+def test_non_python_falls_back_to_token_similarity():
+    rust_a = "fn add(a: i32, b: i32) -> i32 { a + b }"
+    rust_b = "fn add(x: i32, y: i32) -> i32 { x + y }"
+    assert canonical_python(rust_a) is None
+    assert 0.7 < agreement(rust_a, rust_b) < 1.0
+    assert token_similarity("", "") == 1.0
+
+
+def test_extract_code_joins_fenced_blocks():
+    assert extract_code("a\n```py\nx = 1\n```\nb\n```\ny = 2\n```") == "x = 1\n\ny = 2\n"
+    assert extract_code("x = 1") == "x = 1"
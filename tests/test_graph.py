@@ -0,0 +1,228 @@
+import asyncio
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.cache import ResponseCache
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.graph import StageGraph, memoize_stages
+from crowe_codex.strategies.adversarial import Adversarial
+from crowe_codex.strategies.pipeline_strategy import Pipeline
+
+
+class TimedAgent(Agent):
+    """Answers after ``delay`` and tracks how many of its calls overlap."""
+
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, name, delay=0.05, fail=False):
+        super().__init__(config=AgentConfig(name=name, provider="test"))
+        self.delay = delay
+        self.fail = fail
+        self.prompts = []
+        self.cancelled = 0
+
+    async def execute(self, prompt, context=None):
+        self.prompts.append(str(prompt))
+        TimedAgent.in_flight += 1
+        TimedAgent.peak = max(TimedAgent.peak, TimedAgent.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            TimedAgent.in_flight -= 1
+        if self.fail:
+            raise RuntimeError(f"{self.config.name} failed")
+        return f"{self.config.name} output"
+
+    async def is_available(self):
+        return True
+
+
+@pytest.fixture(autouse=True)
+def reset_peak():
+    TimedAgent.in_flight = TimedAgent.peak = 0
+
+
+@pytest.mark.asyncio
+async def test_ready_nodes_run_concurrently_and_feed_their_dependents():
+    agents = {n: TimedAgent(n) for n in ("a", "b", "c", "d")}
+    graph = StageGraph()
+    graph.add("root", "a", lambda _: "start")
+    graph.add("left", "b", lambda i: f"left of {i['root']}", inputs=("root",))
+    graph.add("right", "c", lambda i: f"right of {i['root']}", inputs=("root",))
+    graph.add("join", "d", lambda i: f"{i['left']} + {i['right']}", inputs=("left", "right"))
+
+    result = {}
+    run = await graph.run(agents, result)
+
+    assert TimedAgent.peak == 2
+    assert agents["d"].prompts == ["b output + c output"]
+    assert run.outputs["join"] == "d output"
+    assert result["critical_path"][0] == "root" and result["critical_path"][-1] == "join"
+    assert set(result["stage_timings"]) == {"root", "left", "right", "join"}
+    assert run.timings["join"].started >= max(
+        run.timings["left"].finished, run.timings["right"].finished
+    )
+
+
+@pytest.mark.asyncio
+async def test_critical_path_follows_the_slowest_input():
+    agents = {"fast": TimedAgent("fast", 0.01), "slow": TimedAgent("slow", 0.1)}
+    graph = StageGraph()
+    graph.add("quick", "fast", lambda _: "q")
+    graph.add("long", "slow", lambda _: "l")
+    graph.add("end", "fast", lambda _: "e", inputs=("quick", "long"))
+
+    run = await graph.run(agents)
+
+    assert run.critical_path() == ["long", "end"]
+
+
+def test_graph_is_declared_in_dependency_order():
+    graph = StageGraph()
+    graph.add("a", "claude", lambda _: "p")
+    with pytest.raises(ValueError, match="undeclared"):
+        graph.add("b", "codex", lambda _: "p", inputs=("later",))
+    with pytest.raises(ValueError, match="Duplicate"):
+        graph.add("a", "codex", lambda _: "p")
+
+
+@pytest.mark.asyncio
+async def test_missing_agent_fails_before_any_call():
+    agents = {"claude": TimedAgent("claude")}
+    graph = StageGraph()
+    graph.add("a", "claude", lambda _: "p")
+    graph.add("b", "codex", lambda _: "p", inputs=("a",))
+
+    with pytest.raises(KeyError, match="codex"):
+        await graph.run(agents)
+    assert agents["claude"].prompts == []
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_siblings():
+    agents = {"bad": TimedAgent("bad", 0.01, fail=True), "slow": TimedAgent("slow", 5)}
+    graph = StageGraph()
+    graph.add("bad", "bad", lambda _: "p")
+    graph.add("slow", "slow", lambda _: "p")
+
+    with pytest.raises(RuntimeError, match="bad failed"):
+        await graph.run(agents)
+    assert agents["slow"].cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_adversarial_attack_and_fuzz_overlap_in_the_engine():
+    engine = DualEngine(auto_detect=False)
+    for name in ("claude", "codex", "ollama", "dispatch"):
+        engine.register_agent(name, TimedAgent(name))
+
+    result = await engine.run(Adversarial(rounds=2), task="t")
+
+    assert TimedAgent.peak == 2
+    path = result.metadata["critical_path"]
+    assert path[0] == "build0" and path[-1] == "dispatch"
+    assert "build1" in path
+    assert set(result.metadata["stage_timings"]) == {
+        "build0", "attack0", "fuzz0", "build1", "attack1", "fuzz1", "dispatch",
+    }
+
+
+class EchoAgent(Agent):
+    """Answers with its prompt, so an output changes exactly when its prompt does."""
+
+    def __init__(self, name):
+        super().__init__(config=AgentConfig(name=name, provider=name))
+        self.prompts = []
+        self.answer = None
+
+    async def execute(self, prompt, context=None):
+        self.prompts.append(str(prompt))
+        return self.answer or f"{self.config.name}: {prompt}"
+
+    async def is_available(self):
+        return True
+
+
+def diamond(left_prompt):
+    graph = StageGraph()
+    graph.add("root", "a", lambda _: "start")
+    graph.add("left", "b", lambda i: left_prompt(i["root"]), inputs=("root",))
+    graph.add("right", "c", lambda i: f"right of {i['root']}", inputs=("root",))
+    graph.add("join", "d", lambda i: f"{i['left']} + {i['right']}", inputs=("left", "right"))
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_memoized_graph_reruns_only_changed_stages_and_their_dependents():
+    agents = {n: EchoAgent(n) for n in "abcd"}
+    cache = ResponseCache(persist=False)
+    with memoize_stages(cache):
+        await diamond(lambda root: f"left of {root}").run(agents)
+        result = {}
+        await diamond(lambda root: f"LEFT of {root}").run(agents, result)
+
+    assert [len(agents[n].prompts) for n in "abcd"] == [1, 2, 1, 2]
+    assert result["memoized_stages"] == ["root", "right"]
+
+    # A reworded prompt that yields the same output leaves dependents alone.
+    agents["b"].answer = "b: LEFT of a: start"
+    with memoize_stages(cache):
+        result = {}
+        await diamond(lambda root: f"left (again) of {root}").run(agents, result)
+    assert set(result["memoized_stages"]) == {"root", "right", "join"}
+
+
+@pytest.mark.asyncio
+async def test_run_nodes_are_memoized_only_with_a_key():
+    agents = {"a": EchoAgent("a")}
+    calls = []
+
+    async def call(agent, inputs):
+        calls.append(agent)
+        return await agent.execute("custom")
+
+    cache = ResponseCache(persist=False)
+    for _ in range(2):
+        graph = StageGraph()
+        graph.add("plain", "a", run=call)
+        graph.add("keyed", "a", run=call, key="full")
+        with memoize_stages(cache):
+            await graph.run(agents)
+
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_engine_with_a_cache_reports_memoized_stages():
+    engine = DualEngine(auto_detect=False, cache=ResponseCache(persist=False))
+    for name in ("claude", "codex", "ollama", "dispatch"):
+        engine.register_agent(name, EchoAgent(name))
+
+    first = await engine.run(Pipeline(), task="t")
+    again = await engine.run(Pipeline(), task="t")
+
+    assert "memoized_stages" not in first.metadata
+    assert again.metadata["memoized_stages"] == ["architect", "build", "specialist", "dispatch"]
+    assert again.code == first.code
+
+
+@pytest.mark.asyncio
+async def test_when_skips_a_node_and_its_dependents():
+    agents = {n: EchoAgent(n) for n in "abcd"}
+    graph = StageGraph()
+    graph.add("root", "a", lambda _: "start")
+    graph.add("gate", "b", lambda _: "p", inputs=("root",), when=lambda i: i["root"] != "a: start")
+    graph.add("after", "c", lambda _: "p", inputs=("gate",))
+    graph.add("other", "d", lambda _: "p", inputs=("root",))
+
+    result = {}
+    run = await graph.run(agents, result)
+
+    assert result["skipped_stages"] == ["gate", "after"]
+    assert set(run.outputs) == {"root", "other"}
+    assert agents["b"].prompts == agents["c"].prompts == []
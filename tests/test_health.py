@@ -0,0 +1,201 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.auth import AuthManager
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.health import HealthMonitor, HealthProbe
+from crowe_codex.core.nim_agent import NIM_UNAVAILABLE_MARKER, NimAgent
+from crowe_codex.core.ollama_agent import OllamaAgent
+from crowe_codex.core.resilience import RetryPolicy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingProbe:
+    def __init__(self, result=True, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+class FlakyAgent(Agent):
+    def __init__(self, name, provider="anthropic"):
+        super().__init__(AgentConfig(name=name, provider=provider))
+        self.fail = True
+        self.probes = 0
+
+    async def execute(self, prompt, context=None):
+        if self.fail:
+            raise ConnectionError("refused")
+        return "ok"
+
+    async def is_available(self):
+        self.probes += 1
+        return not self.fail
+
+
+@pytest.mark.asyncio
+async def test_probe_result_is_cached_for_its_ttl():
+    clock, probe = Clock(), CountingProbe()
+    health = HealthProbe(probe, ttl=30, clock=clock)
+
+    assert all([await health.check() for _ in range(5)])
+    assert probe.calls == 1
+    clock.now = 31
+    assert await health.check()
+    assert probe.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_share_one_probe():
+    probe = CountingProbe(delay=0.05)
+    health = HealthProbe(probe)
+    assert all(await asyncio.gather(*(health.check() for _ in range(10))))
+    assert probe.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_demotion_is_immediate_and_short_lived():
+    clock, probe = Clock(), CountingProbe()
+    health = HealthProbe(probe, ttl=30, failure_ttl=5, clock=clock)
+    assert await health.check()
+
+    health.demote("timeout")
+    assert await health.check() is False
+    assert health.state.error == "timeout" and health.state.demotions == 1
+    clock.now = 6
+    assert await health.check() is True
+    assert probe.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_ollama_availability_does_not_list_models_per_call(stand_in_server):
+    server = stand_in_server(lambda m, p, b: (200, {"models": []}))
+    agent = OllamaAgent(AgentConfig(name="ollama", provider="ollama", base_url=server.url))
+
+    for _ in range(20):
+        assert await agent.is_available()
+    assert [r[1] for r in server.requests] == ["/api/tags"]
+
+
+@pytest.mark.asyncio
+async def test_nim_failure_demotes_and_skips_later_requests():
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        raise ConnectionError("gpu node down")
+
+    agent = NimAgent(AgentConfig(name="nim", provider="nvidia", model="m", api_key="k"))
+    agent._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    with pytest.raises(ConnectionError):
+        await agent.execute("a")
+    second = await agent.execute("b")
+
+    assert second.startswith(NIM_UNAVAILABLE_MARKER)
+    assert len(calls) == 1
+    assert await agent.is_available() is False
+
+
+@pytest.mark.asyncio
+async def test_failed_nim_call_reaches_the_engine():
+    async def create(**kwargs):
+        raise ConnectionError("gpu node down")
+
+    engine = DualEngine(auto_detect=False, retry=RetryPolicy(max_attempts=1))
+    agent = NimAgent(AgentConfig(name="nim", provider="nvidia", model="m", api_key="k"))
+    agent._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    engine.register_agent("nim", agent)
+    assert 4 in engine.available_stages()
+
+    with pytest.raises(ConnectionError):
+        await engine._agents["nim"].execute("a")
+
+    assert 4 not in engine.available_stages()
+
+
+@pytest.mark.asyncio
+async def test_failed_call_drops_stages_and_provider(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk")
+    engine = DualEngine(auto_detect=False, retry=RetryPolicy(max_attempts=1))
+    claude = FlakyAgent("claude")
+    engine.register_agent("claude", claude)
+    auth = AuthManager(health=engine.health)
+    assert 1 in engine.available_stages()
+    assert auth.status().anthropic_available
+
+    with pytest.raises(ConnectionError):
+        await engine._agents["claude"].execute("hi")
+
+    assert 1 not in engine.available_stages()
+    assert not auth.status().anthropic_available
+    assert claude.probes == 0
+
+
+@pytest.mark.asyncio
+async def test_background_reprobe_restores_a_recovered_role():
+    monitor = HealthMonitor(ttl=30, failure_ttl=0.01)
+    agent = FlakyAgent("codex", provider="openai")
+    monitor.watch("codex", agent).demote("refused")
+    agent.fail = False
+
+    monitor.start(interval=0.01)
+    try:
+        for _ in range(100):
+            if monitor.probe_for("codex").known():
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await monitor.stop()
+
+    assert monitor.probe_for("codex").known() is True and agent.probes >= 1
+    assert monitor.is_healthy("codex")
+    assert monitor.provider_healthy("openai") is True
+    assert monitor.provider_healthy("nvidia") is None
+
+
+def test_stale_demotion_counts_as_healthy():
+    clock = Clock()
+    monitor = HealthMonitor(ttl=30, failure_ttl=5, clock=clock)
+    monitor.watch("codex", FlakyAgent("codex", provider="openai")).demote("refused")
+    assert not monitor.is_healthy("codex")
+
+    clock.now = 6
+    assert monitor.is_healthy("codex")
+    assert monitor.provider_healthy("openai") is True
+
+
+class RejectedError(Exception):
+    status_code = 400
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_demote():
+    engine = DualEngine(auto_detect=False, retry=RetryPolicy(max_attempts=1))
+    claude = FlakyAgent("claude")
+    engine.register_agent("claude", claude)
+
+    async def reject(prompt, context=None):
+        raise RejectedError("bad request")
+
+    claude.execute = reject
+    with pytest.raises(RejectedError):
+        await engine._agents["claude"].execute("hi")
+
+    assert engine.health.is_healthy("claude")
+    assert engine.health.probe_for("claude").state is None
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.cache import CachedAgent, ResponseCache
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.hedging import HedgedAgent, HedgePolicy, LatencyTracker, record_hedges
+from crowe_codex.strategies.consensus import Consensus
+
+
+class DelayAgent(Agent):
+    def __init__(self, name, delay, base_url="", fail=False, model="m"):
+        super().__init__(config=AgentConfig(
+            name=name, provider="ollama", model=model, base_url=base_url,
+        ))
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def execute(self, prompt, context=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.config.name} failed")
+        return self.config.name
+
+    async def is_available(self):
+        return True
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker()
+    assert tracker.percentile(0.9) is None
+    for ms in range(1, 11):
+        tracker.observe(ms / 100)
+    assert tracker.percentile(0.5) == 0.06
+    assert tracker.percentile(0.99) == 0.1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_primary_is_fast():
+    primary, backup = DelayAgent("p", 0.001), DelayAgent("b", 0.001)
+    agent = HedgedAgent(primary, [backup], HedgePolicy(initial_delay=0.5))
+    assert await agent.execute("x") == "p"
+    assert backup.calls == 0
+    assert agent.stats().hedges_fired == 0
+
+
+@pytest.mark.asyncio
+async def test_backup_wins_and_primary_is_cancelled():
+    primary, backup = DelayAgent("p", 1.0), DelayAgent("b", 0.01)
+    agent = HedgedAgent(primary, [backup], HedgePolicy(initial_delay=0.02))
+    with record_hedges() as records:
+        assert await agent.execute("x") == "b"
+    # The loser has been reaped, not just told to stop.
+    assert primary.cancelled == 1
+    assert agent.stats().wins == {"b": 1}
+    assert records[0].replica == "b"
+    assert records[0].hedged is True
+    # The cancelled primary still counts: it ran at least this long.
+    assert len(agent.latency) == 1
+    assert agent.latency.percentile(0.5) >= 0.02
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_observed_percentile():
+    primary = DelayAgent("p", 0.001)
+    agent = HedgedAgent(primary, [DelayAgent("b", 0.001)], HedgePolicy(min_samples=3))
+    assert agent.hedge_delay() is None
+    for _ in range(3):
+        await agent.execute("x")
+    assert agent.hedge_delay() is not None
+    assert agent.hedge_delay() < 0.1
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_fails_over_immediately():
+    primary = DelayAgent("p", 0.001, fail=True)
+    backup = DelayAgent("b", 0.001)
+    agent = HedgedAgent(primary, [backup], HedgePolicy(initial_delay=5))
+    assert await agent.execute("x") == "b"
+
+
+@pytest.mark.asyncio
+async def test_all_replicas_failing_raises():
+    agent = HedgedAgent(
+        DelayAgent("p", 0.001, fail=True), [DelayAgent("b", 0.001, fail=True)], HedgePolicy(),
+    )
+    with pytest.raises(RuntimeError):
+        await agent.execute("x")
+
+
+def test_replica_labels_distinguish_hosts():
+    agent = HedgedAgent(
+        DelayAgent("ollama", 0, base_url="http://a:11434"),
+        [DelayAgent("ollama", 0, base_url="http://b:11434")],
+    )
+    assert agent._labels == ["ollama@http://a:11434", "ollama@http://b:11434"]
+
+
+@pytest.mark.asyncio
+async def test_engine_records_answering_replica():
+    engine = DualEngine(auto_detect=False)
+    engine.register_agent(
+        "claude", DelayAgent("slow-claude", 1.0),
+        replicas=[DelayAgent("fast-claude", 0.01)],
+        hedge=HedgePolicy(initial_delay=0.02),
+    )
+    engine.register_agent("codex", DelayAgent("codex", 0.001))
+    engine.register_agent("dispatch", DelayAgent("dispatch", 0.001))
+
+    result = await engine.run(Consensus(), task="add")
+    hedges = result.metadata["hedges"]
+    assert hedges[0]["agent"] == "claude"
+    assert hedges[0]["replica"] == "fast-claude"
+
+
+@pytest.mark.asyncio
+async def test_answer_from_a_different_model_is_not_cached_as_the_primary():
+    primary = DelayAgent("p", 1.0)
+    backup = DelayAgent("b", 0.01, model="other")
+    agent = CachedAgent(
+        HedgedAgent(primary, [backup], HedgePolicy(initial_delay=0.02)),
+        ResponseCache(persist=False),
+    )
+    assert await agent.execute("x") == "b"
+    assert await agent.execute("x") == "b"
+    assert backup.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_answer_from_an_identical_replica_is_cached():
+    primary = DelayAgent("p", 1.0)
+    agent = CachedAgent(
+        HedgedAgent(primary, [DelayAgent("b", 0.01)], HedgePolicy(initial_delay=0.02)),
+        ResponseCache(persist=False),
+    )
+    assert await agent.execute("x") == "b"
+    assert await agent.execute("x") == "b"
+    assert primary.calls == 1
@@ -0,0 +1,76 @@
+import random
+
+from crowe_codex.core.keywords import KeywordMatcher
+from crowe_codex.core.ollama_agent import DEFAULT_MODEL, DOMAIN_KEYWORDS, DeepParallelRouter
+from crowe_codex.strategies.router import TASK_SIGNALS, RoutingHistory
+
+
+def _substring_counts(tables, text):
+    text = text.lower()
+    counts = {}
+    for label, keywords in tables.items():
+        score = sum(1 for kw in dict.fromkeys(k.lower() for k in keywords) if kw in text)
+        if score:
+            counts[label] = score
+    return counts
+
+
+def test_matches_agree_with_substring_search():
+    rng = random.Random(7)
+    words = [kw for table in (DOMAIN_KEYWORDS, TASK_SIGNALS) for kws in table.values() for kw in kws]
+    words += ["the", "a", "fast-ish", "latest", "excellent", "Protein Folding", "x"]
+    domain, signals = KeywordMatcher(DOMAIN_KEYWORDS), KeywordMatcher(TASK_SIGNALS)
+    for _ in range(300):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        assert domain.counts(text) == _substring_counts(DOMAIN_KEYWORDS, text)
+        assert signals.counts(text) == _substring_counts(TASK_SIGNALS, text)
+
+
+def test_overlapping_keywords_all_count():
+    matcher = KeywordMatcher({"bio": ["protein", "protein folding", "fold"], "io": ["in"]})
+    assert matcher.counts("PROTEIN FOLDING in vitro") == {"bio": 3, "io": 1}
+
+
+def test_labels_keep_table_order_and_best_breaks_ties_by_it():
+    matcher = KeywordMatcher({"b": ["beta"], "a": ["alpha"]})
+    assert matcher.labels("alpha beta") == ["b", "a"]
+    assert matcher.best("alpha beta") == "b"
+    assert matcher.best("gamma") is None
+
+
+def test_added_keywords_take_effect_and_reset_the_memo():
+    matcher = KeywordMatcher({"security": ["xss"]})
+    assert matcher.labels("csrf token check") == []
+    matcher.add("security", ["CSRF"])
+    matcher.add("web", ["token"])
+    assert matcher.counts("csrf token check") == {"security": 1, "web": 1}
+
+
+def test_results_are_memoized_per_text():
+    matcher = KeywordMatcher({"a": ["alpha"]}, memo_size=2)
+    first = matcher.counts("alpha")
+    first["a"] = 99
+    assert matcher.counts("alpha") == {"a": 1}
+    matcher.counts("b")
+    matcher.counts("c")
+    assert "alpha" not in matcher._memo
+
+
+def test_large_tables_stay_exact():
+    tables = {f"domain{i}": [f"term{i}x{j}" for j in range(50)] for i in range(100)}
+    matcher = KeywordMatcher(tables)
+    assert matcher.counts("uses term42x7 and term42x8 with term9x49") == {
+        "domain9": 2, "domain42": 2,  # term9x4 is inside term9x49
+    }
+
+
+def test_router_and_history_share_user_extensions(tmp_path):
+    router = DeepParallelRouter()
+    assert router.route("tune the plasma confinement") == DEFAULT_MODEL
+    router.add_domain("fusion", "acme/Fusion", ["plasma", "tokamak"])
+    assert router.route("tune the plasma confinement") == "acme/Fusion"
+
+    matcher = KeywordMatcher(TASK_SIGNALS)
+    matcher.add("security", ["csrf"])
+    history = RoutingHistory(path=tmp_path / "h.json", matcher=matcher)
+    assert history._extract_signals("add csrf protection") == ["security"]
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.limiter import (
+    AdaptiveLimiter,
+    ConcurrencyController,
+    LimitedAgent,
+    is_overload,
+    retry_after,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers=None):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class TrackingAgent(Agent):
+    def __init__(self, fail_with=None):
+        super().__init__(config=AgentConfig(name="t", provider="test"))
+        self.active = 0
+        self.peak = 0
+        self.fail_with = fail_with
+
+    async def execute(self, prompt, context=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if self.fail_with:
+            raise self.fail_with
+        return prompt
+
+    async def is_available(self):
+        return True
+
+
+def test_is_overload_detects_429_and_timeouts():
+    assert is_overload(RateLimitError())
+    assert is_overload(TimeoutError())
+
+    class APITimeoutError(Exception):
+        pass
+
+    assert is_overload(APITimeoutError())
+    assert not is_overload(ValueError("bad request"))
+
+
+def test_retry_after_parsing():
+    assert retry_after(RateLimitError({"retry-after": "3"})) == 3.0
+    assert retry_after(RateLimitError({"retry-after-ms": "250"})) == 0.25
+    assert retry_after(RateLimitError()) is None
+    assert retry_after(ValueError()) is None
+
+
+def test_aimd_window_adjustment():
+    limiter = AdaptiveLimiter(initial_limit=4, min_limit=1, max_limit=8)
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == pytest.approx(4.9, abs=0.1)
+    limiter.on_overload()
+    assert limiter.limit < 2.5
+    for _ in range(10):
+        limiter.on_overload()
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_limited_agent_caps_concurrency():
+    inner = TrackingAgent()
+    agent = LimitedAgent(inner, AdaptiveLimiter(initial_limit=2, max_limit=2))
+    results = await asyncio.gather(*(agent.execute(str(i)) for i in range(8)))
+    assert results == [str(i) for i in range(8)]
+    assert inner.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_overload_shrinks_window_and_honours_retry_after():
+    limiter = AdaptiveLimiter(initial_limit=4)
+    agent = LimitedAgent(TrackingAgent(RateLimitError({"retry-after": "0.1"})), limiter)
+    with pytest.raises(RateLimitError):
+        await agent.execute("x")
+    assert limiter.limit == 2
+    assert limiter.stats().overloads == 1
+
+    ok = LimitedAgent(TrackingAgent(), limiter)
+    start = time.monotonic()
+    await ok.execute("y")
+    assert time.monotonic() - start >= 0.08
+
+
+def test_controller_reports_windows_per_provider():
+    controller = ConcurrencyController(initial_limit=3)
+    controller.limiter_for("anthropic")
+    controller.limiter_for("openai").on_overload()
+    assert controller.windows() == {"anthropic": 3, "openai": 1.5}
+
+
+@pytest.mark.asyncio
+async def test_engine_routes_agents_through_provider_limiter():
+    engine = DualEngine(
+        auto_detect=False,
+        concurrency=ConcurrencyController(initial_limit=1, max_limit=1),
+    )
+    inner = TrackingAgent()
+    engine.register_agent("codex", inner)
+    await asyncio.gather(*(engine._agents["codex"].execute("p") for _ in range(4)))
+    assert inner.peak == 1
+    assert engine.concurrency_windows() == {"test": 1}
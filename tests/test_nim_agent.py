@@ -1,6 +1,10 @@
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 from crowe_codex.core.agent import AgentConfig
 from crowe_codex.core.nim_agent import NimAgent, NIM_ENDPOINTS, NimBatchRequest
+from crowe_codex.core.usage import record_usage
 
 
 def test_nim_agent_instantiation():
@@ -63,3 +67,82 @@ def test_nim_accelerator_prompt():
     prompt = agent.build_accelerator_prompt("def foo(): pass", task="optimize")
     assert "performance" in prompt.lower()
     assert "def foo(): pass" in prompt
+
+
+class _FakeNimCompletions:
+    """Answers after a per-prompt delay, tracking requests in flight."""
+
+    def __init__(self, delays, fail=()):
+        self.delays = delays
+        self.fail = set(fail)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[0]["content"]
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.01))
+        finally:
+            self.in_flight -= 1
+        if prompt in self.fail:
+            raise RuntimeError("boom")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"ok {prompt}"))],
+            usage=SimpleNamespace(prompt_tokens=len(prompt), completion_tokens=2),
+        )
+
+
+def _windowed_agent(completions, batch_size):
+    agent = NimAgent(
+        config=AgentConfig(name="nim", provider="nvidia", model="m", api_key="k"),
+        batch_size=batch_size,
+    )
+    agent._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_nim_window_keeps_requests_in_flight_past_a_slow_one():
+    completions = _FakeNimCompletions({"slow": 0.3})
+    agent = _windowed_agent(completions, batch_size=3)
+    prompts = ["slow"] + [f"p{i}" for i in range(9)]
+
+    order = [index async for index, _ in agent.as_completed(prompts)]
+
+    # Fixed chunks would stall the other prompts behind the slow one.
+    assert order[-1] == 0
+    assert sorted(order) == list(range(10))
+    assert completions.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_nim_batch_run_collects_latency_usage_and_errors():
+    completions = _FakeNimCompletions({"a": 0.05}, fail={"b"})
+    agent = _windowed_agent(completions, batch_size=2)
+
+    with record_usage() as usage:
+        result = await agent.batch_run(["a", "b", "cc"])
+
+    assert result.responses == ["ok a", "NIM error: boom", "ok cc"]
+    assert result.errors == {1: "boom"}
+    assert result.latencies_ms[0] >= 50
+    assert result.usage[1] is None and result.usage[2].input_tokens == 2
+    assert result.total_tokens == (1 + 2) + (2 + 2)
+    assert len(usage) == 2
+    assert result.latency_ms >= max(result.latencies_ms)
+
+
+@pytest.mark.asyncio
+async def test_nim_window_reaps_requests_when_the_consumer_stops_early():
+    completions = _FakeNimCompletions({"slow1": 5, "slow2": 5})
+    agent = _windowed_agent(completions, batch_size=3)
+
+    results = agent.as_completed(["fast", "slow1", "slow2"])
+    async for index, _ in results:
+        assert index == 0
+        break
+    await results.aclose()
+
+    assert completions.in_flight == 0
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from crowe_codex.core.agent import AgentConfig
+from crowe_codex.core.ollama_agent import DOMAIN_MODELS
+from crowe_codex.core.ollama_pool import OllamaPool
+
+PHYSICS = "simulate particle collision dynamics"
+DEAD_HOST = "http://127.0.0.1:1"
+
+
+class OllamaHost:
+    """Stand-in Ollama host; ``loaded`` is what /api/ps reports."""
+
+    def __init__(self, name, loaded=(), delay=0.0):
+        self.name = name
+        self.loaded = set(loaded)
+        self.delay = delay
+        self.chats = 0
+
+    def __call__(self, method, path, body):
+        if path == "/api/ps":
+            return 200, {"models": [{"model": m, "name": m} for m in self.loaded]}
+        if path == "/api/tags":
+            return 200, {"models": []}
+        assert path == "/api/chat"
+        self.chats += 1
+        self.loaded = {body["model"]}
+        time.sleep(self.delay)
+        message = {"role": "assistant", "content": f"{self.name}: {body['model']}"}
+        if body.get("stream"):
+            return 200, json.dumps({"message": message, "done": True}) + "\n"
+        return 200, {"model": body["model"], "created_at": "", "done": True, "message": message}
+
+
+def _pool(*urls):
+    return OllamaPool(list(urls), AgentConfig(name="ollama", provider="ollama", model="general"))
+
+
+@pytest.mark.asyncio
+async def test_prefers_host_with_routed_model_resident(stand_in_server):
+    cold = stand_in_server(OllamaHost("cold"))
+    warm = stand_in_server(OllamaHost("warm", loaded=[DOMAIN_MODELS["physics"]]))
+    pool = _pool(cold.url, warm.url)
+
+    response = await pool.execute("review", {"task": PHYSICS})
+
+    assert response == f"warm: {DOMAIN_MODELS['physics']}"
+    assert not [r for r in cold.requests if r[1] == "/api/chat"]
+
+
+@pytest.mark.asyncio
+async def test_spreads_concurrent_calls_to_least_loaded_hosts(stand_in_server):
+    hosts = [OllamaHost(f"h{i}", delay=0.1) for i in range(3)]
+    pool = _pool(*(stand_in_server(h).url for h in hosts))
+
+    await asyncio.gather(*(pool.execute(f"p{i}") for i in range(6)))
+
+    assert [h.chats for h in hosts] == [2, 2, 2]
+    assert all(s.in_flight == 0 and s.calls == 2 for s in pool.stats())
+
+
+@pytest.mark.asyncio
+async def test_fails_over_from_a_dead_host_and_demotes_it(stand_in_server):
+    live = OllamaHost("live")
+    pool = _pool(DEAD_HOST, stand_in_server(live).url)
+
+    assert await pool.execute("one") == "live: general"
+    assert await pool.execute("two") == "live: general"
+
+    dead, healthy = pool.stats()
+    assert dead.failures == 1 and not dead.healthy
+    assert dead.calls == 1
+    assert healthy.healthy and live.chats == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_token(stand_in_server):
+    live = OllamaHost("live")
+    pool = _pool(DEAD_HOST, stand_in_server(live).url)
+
+    chunks = [c async for c in pool.execute_stream("hi")]
+
+    assert chunks == ["live: general"]
+
+
+@pytest.mark.asyncio
+async def test_raises_when_every_host_is_down():
+    pool = _pool(DEAD_HOST, "http://127.0.0.1:2")
+    with pytest.raises(ConnectionError):
+        await pool.execute("hi")
+    assert await pool.is_available() is False
+    assert all(s.failures == 1 for s in pool.stats())
+
+
+@pytest.mark.asyncio
+async def test_prepare_prefetches_on_one_host_only(stand_in_server):
+    a, b = OllamaHost("a"), OllamaHost("b")
+    servers = [stand_in_server(a), stand_in_server(b)]
+    pool = _pool(*(s.url for s in servers))
+
+    pool.prepare(PHYSICS)
+    await asyncio.gather(*(t for h in pool.hosts for t in h.residency._prefetching.values()))
+
+    generates = [[r for r in s.requests if r[1] == "/api/generate"] for s in servers]
+    assert [len(g) for g in generates] == [1, 0]
+    assert generates[0][0][2]["model"] == DOMAIN_MODELS["physics"]
@@ -0,0 +1,94 @@
+import pytest
+
+from crowe_codex.core.agent import AgentConfig
+from crowe_codex.core.budget import Prompt, Section
+from crowe_codex.core.claude_agent import ClaudeAgent
+from crowe_codex.core.usage import record_usage, total_usage
+from crowe_codex.security.compliance import ComplianceMapper
+from crowe_codex.security.owasp import OWASPScanner
+from crowe_codex.security.threat_model import ThreatModelEngine
+
+CODE = "def login(user, pw):\n    return db.query(f'SELECT * FROM u WHERE n={user}')\n"
+
+
+class CachingMessagesAPI:
+    """Stand-in for /v1/messages that emulates Anthropic prompt caching."""
+
+    def __init__(self):
+        self.cached: set[str] = set()
+
+    def __call__(self, method, path, body):
+        assert path == "/v1/messages"
+        read = created = uncached = 0
+        content = body["messages"][0]["content"]
+        blocks = content if isinstance(content, list) else [{"text": content}]
+        for block in blocks:
+            tokens = len(block["text"]) // 4
+            if "cache_control" not in block:
+                uncached += tokens
+            elif block["text"] in self.cached:
+                read += tokens
+            else:
+                self.cached.add(block["text"])
+                created += tokens
+        return 200, {
+            "id": "msg_1", "type": "message", "role": "assistant", "model": body["model"],
+            "content": [{"type": "text", "text": "NO_VULNERABILITIES_FOUND"}],
+            "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {
+                "input_tokens": uncached, "output_tokens": 3,
+                "cache_read_input_tokens": read, "cache_creation_input_tokens": created,
+            },
+        }
+
+
+def _claude(server):
+    return ClaudeAgent(AgentConfig(
+        name="claude", provider="anthropic", api_key="k", base_url=server.url,
+    ))
+
+
+def test_prompt_split_after_last_cache_section():
+    prompt = Prompt(Section("code\n", cache=True), "ask A")
+    assert prompt.split_cached() == ("code\n", "ask A")
+    assert Prompt("plain").split_cached() == ("", "plain")
+
+
+def test_security_prompts_share_a_cacheable_prefix():
+    owasp = OWASPScanner({})._build_scan_prompt(CODE, "web app")
+    stride = ThreatModelEngine({})._build_analysis_prompt(CODE, "web app")
+    soc2 = ComplianceMapper({})._build_assessment_prompt(CODE, "soc2", "web app")
+    prefixes = {p.split_cached()[0] for p in (owasp, stride, soc2)}
+    assert len(prefixes) == 1
+    (prefix,) = prefixes
+    assert CODE in prefix and "web app" in prefix
+    assert "OWASP" not in prefix and "STRIDE" not in prefix
+
+
+@pytest.mark.asyncio
+async def test_claude_marks_prefix_and_reports_cache_tokens(stand_in_server):
+    api = CachingMessagesAPI()
+    server = stand_in_server(api)
+    agents = {"claude": _claude(server)}
+
+    with record_usage() as usage:
+        await OWASPScanner(agents).scan(CODE)
+        await ThreatModelEngine(agents).analyze(CODE)
+        await ComplianceMapper(agents).assess(CODE, frameworks=["soc2", "hipaa"])
+
+    first = server.requests[0][2]["messages"][0]["content"]
+    assert first[0]["cache_control"] == {"type": "ephemeral"}
+    assert CODE in first[0]["text"] and CODE not in first[1]["text"]
+
+    assert usage[0].cache_creation_tokens > 0 and usage[0].cache_read_tokens == 0
+    assert all(u.cache_read_tokens == usage[0].cache_creation_tokens for u in usage[1:])
+    totals = total_usage(usage)
+    assert totals["calls"] == 4
+    assert totals["cache_read_tokens"] == 3 * totals["cache_creation_tokens"]
+
+
+@pytest.mark.asyncio
+async def test_plain_prompts_are_sent_as_text(stand_in_server):
+    server = stand_in_server(CachingMessagesAPI())
+    await _claude(server).execute("hello")
+    assert server.requests[0][2]["messages"][0]["content"] == "hello"
@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from crowe_codex.core.agent import AgentConfig
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.ollama_agent import DOMAIN_MODELS, OllamaAgent
+from crowe_codex.core.residency import HOT_AFTER, PIN_KEEP_ALIVE
+from crowe_codex.strategies.pipeline_strategy import Pipeline
+
+PHYSICS = "simulate particle collision dynamics"
+LIFESCI = "analyze gene expression in RNA sequencing data"
+
+
+class OllamaHost:
+    """Stand-in Ollama host that loads one model at a time."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.loaded: set[str] = set()
+        self.chats: list[str] = []
+
+    def __call__(self, method, path, body):
+        if path == "/api/ps":
+            return 200, {"models": [{"model": m, "name": m} for m in self.loaded]}
+        if path == "/api/generate":
+            self.loaded = {body["model"]}
+            return 200, {"model": body["model"], "created_at": "", "response": "", "done": True}
+        assert path == "/api/chat"
+        self.loaded = {body["model"]}
+        self.chats.append(body["model"])
+        time.sleep(self.delay)
+        return 200, {
+            "model": body["model"], "created_at": "", "done": True,
+            "message": {"role": "assistant", "content": f"reviewed by {body['model']}"},
+            "keep_alive_seen": body.get("keep_alive"),
+        }
+
+
+class FakeAgent:
+    def __init__(self, name):
+        self.config = AgentConfig(name=name, provider="test")
+
+    async def execute(self, prompt, context=None):
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    async def is_available(self):
+        return True
+
+
+def _ollama(server, **residency):
+    agent = OllamaAgent(AgentConfig(name="ollama", provider="ollama", base_url=server.url))
+    for key, value in residency.items():
+        setattr(agent.residency, key, value)
+    return agent
+
+
+def _chat_models(server):
+    return [b["model"] for m, p, b in server.requests if p == "/api/chat"]
+
+
+@pytest.mark.asyncio
+async def test_interleaved_calls_are_grouped_by_model(stand_in_server):
+    server = stand_in_server(OllamaHost())
+    agent = _ollama(server)
+    tasks = [PHYSICS, LIFESCI, PHYSICS, LIFESCI, PHYSICS]
+
+    await asyncio.gather(*(agent.execute("review", {"task": t}) for t in tasks))
+
+    physics, lifesci = DOMAIN_MODELS["physics"], DOMAIN_MODELS["lifesci"]
+    assert _chat_models(server) == [physics] * 3 + [lifesci] * 2
+    assert agent.residency.stats().switches == 1
+
+
+@pytest.mark.asyncio
+async def test_waiting_models_get_a_turn_after_max_group(stand_in_server):
+    server = stand_in_server(OllamaHost())
+    agent = _ollama(server, max_group=2)
+    physics, lifesci = DOMAIN_MODELS["physics"], DOMAIN_MODELS["lifesci"]
+
+    calls = []
+    for task in [PHYSICS, LIFESCI, PHYSICS, PHYSICS, LIFESCI]:
+        calls.append(asyncio.create_task(agent.execute("review", {"task": task})))
+        await asyncio.sleep(0)
+    await asyncio.gather(*calls)
+
+    assert _chat_models(server) == [physics, physics, lifesci, lifesci, physics]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_loads_routed_model_once(stand_in_server):
+    host = OllamaHost()
+    server = stand_in_server(host)
+    agent = _ollama(server)
+
+    agent.prepare(PHYSICS)
+    agent.prepare(PHYSICS)
+    await asyncio.gather(*agent.residency._prefetching.values())
+    agent.residency._listed_at = None
+    agent.prepare(PHYSICS)
+
+    paths = [p for m, p, b in server.requests]
+    assert paths.count("/api/generate") == 1
+    assert host.loaded == {DOMAIN_MODELS["physics"]}
+    assert await agent.residency.resident() == {DOMAIN_MODELS["physics"]}
+
+
+@pytest.mark.asyncio
+async def test_hot_models_are_pinned_with_a_long_keep_alive(stand_in_server):
+    server = stand_in_server(OllamaHost(delay=0))
+    agent = _ollama(server)
+    for _ in range(HOT_AFTER + 1):
+        await agent.execute("review", {"task": PHYSICS})
+
+    keep_alives = [b["keep_alive"] for m, p, b in server.requests if p == "/api/chat"]
+    assert keep_alives[0] != PIN_KEEP_ALIVE
+    assert keep_alives[-1] == PIN_KEEP_ALIVE
+
+
+@pytest.mark.asyncio
+async def test_engine_prefetches_and_routes_the_specialist(stand_in_server):
+    server = stand_in_server(OllamaHost(delay=0))
+    engine = DualEngine(auto_detect=False)
+    for name in ("claude", "codex", "dispatch"):
+        engine.register_agent(name, FakeAgent(name))
+    engine.register_agent("ollama", _ollama(server))
+
+    result = await engine.run(Pipeline(), task=PHYSICS)
+
+    paths = [p for m, p, b in server.requests]
+    assert paths.index("/api/generate") < paths.index("/api/chat")
+    assert _chat_models(server) == [DOMAIN_MODELS["physics"]]
+    assert any("Physics" in o.content for o in result.stage_outputs)
@@ -0,0 +1,169 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.resilience import (
+    BreakerAgent,
+    BreakerRegistry,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryingAgent,
+    RetryPolicy,
+    is_retryable,
+)
+from crowe_codex.strategies.consensus import Consensus
+
+FAST = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+
+class APIStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class FlakyAgent(Agent):
+    def __init__(self, failures, error=None, name="flaky", provider="anthropic"):
+        super().__init__(config=AgentConfig(name=name, provider=provider))
+        self.failures = failures
+        self.error = error or APIStatusError(503)
+        self.calls = 0
+
+    async def execute(self, prompt, context=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return f"{self.config.name} ok"
+
+    async def is_available(self):
+        return True
+
+
+def test_retryable_classification():
+    assert is_retryable(APIStatusError(429))
+    assert is_retryable(APIStatusError(529))
+    assert is_retryable(ConnectionResetError())
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(APIStatusError(400))
+    assert not is_retryable(ValueError())
+    assert not is_retryable(CircuitOpenError("x", 1))
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+    delays = [policy.delay(5) for _ in range(50)]
+    assert all(0 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.delay(1, APIStatusError(429, {"retry-after": "3"})) >= 3
+
+
+@pytest.mark.asyncio
+async def test_retry_recovers_from_transient_errors():
+    inner = FlakyAgent(failures=2)
+    assert await RetryingAgent(inner, FAST).execute("x") == "flaky ok"
+    assert inner.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up_on_client_errors():
+    inner = FlakyAgent(failures=5, error=APIStatusError(400))
+    with pytest.raises(APIStatusError):
+        await RetryingAgent(inner, FAST).execute("x")
+    assert inner.calls == 1
+
+
+def test_breaker_opens_and_half_opens(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("crowe_codex.core.resilience.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("anthropic", failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] += 11
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_short_circuits_to_fallback():
+    breaker = CircuitBreaker("anthropic", failure_threshold=1, reset_timeout=60)
+    inner = FlakyAgent(failures=10)
+    agent = BreakerAgent(inner, breaker, fallback=FlakyAgent(0, name="fallback"))
+    with pytest.raises(APIStatusError):
+        await agent.execute("x")
+    assert await agent.execute("x") == "fallback ok"
+    assert inner.calls == 1
+    assert agent.is_cacheable("fallback ok") is False
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_frees_the_probe_slot(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("crowe_codex.core.resilience.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("anthropic", failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    now[0] += 11
+
+    class Hanging(FlakyAgent):
+        async def execute(self, prompt, context=None):
+            await asyncio.sleep(10)
+
+    probe = asyncio.ensure_future(BreakerAgent(Hanging(0), breaker).execute("x"))
+    await asyncio.sleep(0)
+    assert not breaker.allow()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert await BreakerAgent(FlakyAgent(0), breaker).execute("x") == "flaky ok"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_without_fallback_raises():
+    breaker = CircuitBreaker("openai", failure_threshold=1)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        await BreakerAgent(FlakyAgent(0), breaker).execute("x")
+
+
+@pytest.mark.asyncio
+async def test_engine_survives_transient_dispatch_failure():
+    engine = DualEngine(auto_detect=False, retry=FAST)
+    engine.register_agent("claude", FlakyAgent(0, name="claude"))
+    engine.register_agent("codex", FlakyAgent(0, name="codex", provider="openai"))
+    dispatch = FlakyAgent(1, name="dispatch")
+    engine.register_agent("dispatch", dispatch)
+
+    result = await engine.run(Consensus(), task="add")
+    assert result.code == "dispatch ok"
+    assert dispatch.calls == 2
+    assert engine.breaker_states()["anthropic"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_engine_breaker_is_shared_per_provider():
+    engine = DualEngine(
+        auto_detect=False,
+        retry=RetryPolicy(max_attempts=1),
+        breakers=BreakerRegistry(failure_threshold=1),
+    )
+    engine.register_agent("claude", FlakyAgent(10, name="claude"))
+    healthy = FlakyAgent(0, name="dispatch")
+    engine.register_agent("dispatch", healthy)
+
+    with pytest.raises(APIStatusError):
+        await engine._agents["claude"].execute("x")
+    with pytest.raises(CircuitOpenError):
+        await engine._agents["dispatch"].execute("y")
+    assert healthy.calls == 0
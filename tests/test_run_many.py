@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.resilience import RetryPolicy
+from crowe_codex.strategies.base import Strategy
+
+
+class EchoAgent(Agent):
+    """Sleeps for the number of hundredths in the prompt, e.g. "t3" -> 0.03s."""
+
+    def __init__(self, provider="test"):
+        super().__init__(config=AgentConfig(name="claude", provider=provider))
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute(self, prompt, context=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(int(prompt[1:]) / 100)
+        finally:
+            self.in_flight -= 1
+        if prompt.startswith("x"):
+            raise ValueError(f"bad task {prompt}")
+        return f"done {prompt}"
+
+    async def is_available(self):
+        return True
+
+
+class Echo(Strategy):
+    name = "echo"
+
+    async def execute(self, task, agents, context=None):
+        return {"dispatch_output": await agents["claude"].execute(task)}
+
+
+def _engine(agent):
+    engine = DualEngine(auto_detect=False, retry=RetryPolicy(max_attempts=1))
+    engine.register_agent("claude", agent)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_results_arrive_in_completion_order():
+    engine = _engine(EchoAgent())
+    results = [r async for r in engine.run_many(Echo(), ["t9", "t1", "t5"])]
+
+    assert [r.code for r in results] == ["done t1", "done t5", "done t9"]
+    assert [(r.metadata["task"], r.metadata["task_index"]) for r in results] == [
+        ("t1", 1), ("t5", 2), ("t9", 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_a_failing_task_does_not_abort_the_rest():
+    engine = _engine(EchoAgent())
+    results = {r.metadata["task"]: r async for r in engine.run_many(Echo(), ["t1", "x1", "t2"])}
+
+    assert results["t1"].code == "done t1" and results["t2"].code == "done t2"
+    assert results["x1"].code == ""
+    assert results["x1"].metadata["error"] == "ValueError: bad task x1"
+    assert "failed" in results["x1"].summary
+
+
+@pytest.mark.asyncio
+async def test_global_and_provider_limits_bound_concurrency():
+    agent = EchoAgent(provider="anthropic")
+    engine = _engine(agent)
+    tasks = [f"t{i % 3 + 1}" for i in range(30)]
+
+    results = [r async for r in engine.run_many(Echo(), tasks, concurrency=8)]
+    assert len(results) == 30
+    assert agent.peak <= 8
+
+    agent.peak = 0
+    limited = engine.run_many(Echo(), tasks, concurrency=8, provider_limits={"anthropic": 2})
+    assert len([r async for r in limited]) == 30
+    assert agent.peak <= 2
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_applies_backpressure_and_early_exit_cancels():
+    pulled = []
+
+    def tickets():
+        for i in range(1000):
+            pulled.append(i)
+            yield "t1"
+
+    engine = _engine(EchoAgent())
+    batch = engine.run_many(Echo(), tickets(), concurrency=4)
+    first = await anext(batch)
+    await asyncio.sleep(0.1)
+
+    assert first.code == "done t1"
+    # Bounded by the task queue, the workers, the result queue, the result
+    # handed out and the task the feeder is waiting to queue.
+    bound = 4 * 3 + 2
+    assert len(pulled) <= bound
+    await batch.aclose()
+    await asyncio.sleep(0.05)
+    assert len(pulled) <= bound
+
+
+@pytest.mark.asyncio
+async def test_accepts_an_async_task_source():
+    async def tickets():
+        for task in ("t2", "t1"):
+            yield task
+
+    engine = _engine(EchoAgent())
+    codes = [r.code async for r in engine.run_many(Echo(), tickets(), concurrency=2)]
+    assert codes == ["done t1", "done t2"]
@@ -0,0 +1,123 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from crowe_codex.cli import main
+from crowe_codex.client import ServerClient, ServerUnavailable
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.server import CodexServer
+
+
+class WordAgent(Agent):
+    def __init__(self, name, delay=0.0):
+        super().__init__(config=AgentConfig(name=name, provider=name))
+        self.delay = delay
+        self.cancelled = threading.Event()
+
+    async def execute(self, prompt, context=None):
+        return "".join([c async for c in self.execute_stream(prompt, context)])
+
+    async def execute_stream(self, prompt, context=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        for word in (self.config.name, "says", "ok"):
+            yield word + " "
+
+    async def is_available(self):
+        return True
+
+
+@pytest.fixture
+def served(tmp_path):
+    """A CodexServer running on its own loop in a background thread."""
+    engine = DualEngine(auto_detect=False, on_token=CodexServer._route_token)
+    agents = {name: WordAgent(name) for name in ("claude", "codex", "dispatch")}
+    for name, agent in agents.items():
+        engine.register_agent(name, agent)
+    server = CodexServer(engine, path=tmp_path / "serve.sock")
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server.agents = agents
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def test_ping_reports_the_warm_engine(served):
+    status = ServerClient(served.path).ping()
+    assert status["event"] == "pong"
+    assert status["agents"] == ["claude", "codex", "dispatch"]
+
+
+def test_run_streams_tokens_and_stages_then_the_result(served):
+    events = list(ServerClient(served.path).run("consensus", "add two numbers"))
+
+    kinds = [e["event"] for e in events]
+    assert kinds[-1] == "result" and "error" not in kinds
+    stages = [e["name"] for e in events if e["event"] == "stage"]
+    assert sorted(stages[:2]) == ["claude", "codex"] and stages[2] == "dispatch"
+    tokens = [e for e in events if e["event"] == "token"]
+    assert {t["agent"] for t in tokens} == {"claude", "codex", "dispatch"}
+    result = events[-1]["result"]
+    assert result["code"] == "dispatch says ok "
+    assert result["confidence"]["score"] >= 0
+
+    quiet = list(ServerClient(served.path).run("consensus", "again", stream=False))
+    assert not any(e["event"] == "token" for e in quiet)
+    assert served.runs == 2
+
+
+def test_disconnecting_client_cancels_its_run(served):
+    served.agents["codex"].delay = 5
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(str(served.path))
+        sock.sendall(b'{"op": "run", "strategy": "consensus", "task": "t"}\n')
+        sock.recv(1)  # wait for the first event
+    assert served.agents["codex"].cancelled.wait(2)
+
+
+def test_bad_requests_get_an_error_event(served):
+    unknown = list(ServerClient(served.path).request({"op": "reboot"}))
+    assert [e["event"] for e in unknown] == ["error"]
+    bad_options = {"op": "run", "strategy": "consensus", "task": "t", "options": ["x"]}
+    events = list(ServerClient(served.path).request(bad_options))
+    assert [e["event"] for e in events] == ["error"]
+    assert events[0]["error"].startswith("TypeError")
+    assert served.runs == 0
+
+
+def test_socket_is_owner_only(served):
+    assert served.path.stat().st_mode & 0o777 == 0o600
+
+
+def test_client_without_a_server(tmp_path):
+    client = ServerClient(tmp_path / "missing.sock")
+    assert client.ping() is None
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(stale))  # bound but never listening
+    with pytest.raises(ServerUnavailable):
+        next(ServerClient(stale).run("consensus", "t"))
+
+
+def test_cli_forwards_to_a_running_daemon(served, monkeypatch):
+    monkeypatch.setenv("CROWE_CODEX_SOCKET", str(served.path))
+    result = CliRunner().invoke(main, ["consensus", "add two numbers"])
+
+    assert result.exit_code == 0, result.output
+    assert "Confidence Report" in result.output
+    assert "dispatch says ok" in result.output
+    assert served.runs == 1
+
+    CliRunner().invoke(main, ["--local", "--no-stream", "consensus", "t"])
+    assert served.runs == 1
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("pydantic", "asyncio", "anthropic", "openai", "ollama", "httpx", "crowe_codex.core")
+
+
+def _imported_by(*argv):
+    script = (
+        "import sys\n"
+        "from crowe_codex.cli import main\n"
+        "sys.argv = ['crowe-codex', *sys.argv[1:]]\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(' '.join(sorted(sys.modules)), file=sys.stderr)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script, *argv], capture_output=True, text=True, check=True,
+    )
+    modules = proc.stderr.split()
+    return {heavy for heavy in HEAVY if any(m == heavy or m.startswith(heavy + ".") for m in modules)}
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["pipeline", "--help"], ["strategies"]])
+def test_cli_starts_without_engine_or_sdks(argv):
+    assert _imported_by(*argv) == set()
+
+
+def test_marketplace_skips_engine_and_strategies():
+    assert _imported_by("marketplace") == set()
+
+
+def test_package_exports_are_lazy():
+    script = (
+        "import sys, crowe_codex, crowe_codex.strategies as s\n"
+        "print('crowe_codex.core.engine' in sys.modules, 'Pipeline' in dir(s))\n"
+        "from crowe_codex import DualEngine\n"
+        "print(DualEngine.__module__, s.Pipeline.__name__)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    assert out == ["False True", "crowe_codex.core.engine Pipeline"]
@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+import pytest
+
+from crowe_codex.core.agent import Agent, AgentConfig
+from crowe_codex.core.cache import CachedAgent, ResponseCache
+from crowe_codex.core.claude_agent import ClaudeAgent
+from crowe_codex.core.codex_agent import CodexAgent
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.nim_agent import NimAgent
+from crowe_codex.core.streaming import StreamingAgent
+from crowe_codex.core.usage import record_usage
+
+
+class ChunkAgent(Agent):
+    def __init__(self, chunks):
+        super().__init__(config=AgentConfig(name="chunky", provider="test"))
+        self.chunks = chunks
+        self.streams = 0
+
+    async def execute(self, prompt, context=None):
+        return "".join(self.chunks)
+
+    async def execute_stream(self, prompt, context=None):
+        self.streams += 1
+        for c in self.chunks:
+            yield c
+
+    async def is_available(self):
+        return True
+
+
+class PlainAgent(Agent):
+    async def execute(self, prompt, context=None):
+        return "whole"
+
+    async def is_available(self):
+        return True
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class _FakeAnthropicStream:
+    def __init__(self, texts):
+        self._texts = texts
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for t in self._texts:
+            yield t
+
+    async def get_final_message(self):
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=3, output_tokens=2))
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_default_stream_yields_whole_completion():
+    agent = PlainAgent(config=AgentConfig(name="p", provider="test"))
+    assert await _collect(agent.execute_stream("x")) == ["whole"]
+
+
+@pytest.mark.asyncio
+async def test_claude_stream_uses_text_stream():
+    agent = ClaudeAgent(AgentConfig(name="claude", provider="anthropic", api_key="k"))
+    agent._client = SimpleNamespace(
+        messages=SimpleNamespace(stream=lambda **kw: _FakeAnthropicStream(["de", "f"]))
+    )
+    assert await _collect(agent.execute_stream("x")) == ["de", "f"]
+
+
+@pytest.mark.asyncio
+async def test_codex_stream_skips_empty_deltas_and_reports_usage():
+    def chunk(text):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None,
+        )
+
+    final = SimpleNamespace(choices=[], usage=SimpleNamespace(
+        prompt_tokens=5, completion_tokens=2, prompt_tokens_details=None,
+    ))
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        assert kwargs["stream_options"] == {"include_usage": True}
+        return _aiter([chunk("a"), chunk(None), chunk("b"), final])
+
+    agent = CodexAgent(AgentConfig(name="codex", provider="openai", api_key="k"))
+    agent._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    with record_usage() as usage:
+        assert await _collect(agent.execute_stream("x")) == ["a", "b"]
+    assert [(u.input_tokens, u.output_tokens) for u in usage] == [(5, 2)]
+
+
+@pytest.mark.asyncio
+async def test_nim_stream_falls_back_when_unavailable():
+    chunks = await _collect(NimAgent().execute_stream("x"))
+    assert len(chunks) == 1
+    assert "NIM_UNAVAILABLE" in chunks[0]
+
+
+@pytest.mark.asyncio
+async def test_streaming_agent_reports_tokens_and_returns_text():
+    seen = []
+    agent = StreamingAgent(ChunkAgent(["he", "llo"]), lambda n, c: seen.append((n, c)), "claude")
+    assert await agent.execute("x") == "hello"
+    assert seen == [("claude", "he"), ("claude", "llo")]
+
+
+@pytest.mark.asyncio
+async def test_cached_stream_replays_from_cache():
+    inner = ChunkAgent(["a", "b"])
+    agent = CachedAgent(inner, ResponseCache(persist=False))
+    assert await _collect(agent.execute_stream("x")) == ["a", "b"]
+    assert await _collect(agent.execute_stream("x")) == ["ab"]
+    assert inner.streams == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_on_token_wraps_agents():
+    seen = []
+    engine = DualEngine(auto_detect=False, on_token=lambda n, c: seen.append(n))
+    engine.register_agent("codex", ChunkAgent(["x", "y"]))
+    assert await engine._agents["codex"].execute("p") == "xy"
+    assert seen == ["codex", "codex"]
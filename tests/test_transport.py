@@ -0,0 +1,81 @@
+import pytest
+
+from crowe_codex.core.agent import AgentConfig
+from crowe_codex.core.codex_agent import CodexAgent
+from crowe_codex.core.engine import DualEngine
+from crowe_codex.core.ollama_agent import OllamaAgent
+from crowe_codex.core.transport import TransportManager
+
+
+def _chat_completion(method, path, body):
+    return 200, {
+        "id": "c1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": body["model"],
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "pooled"},
+        }],
+    }
+
+
+def test_client_is_shared_per_base_url():
+    manager = TransportManager(http2=False)
+    a = manager.client("http://example.test/")
+    b = manager.client("http://example.test")
+    c = manager.client("http://other.test")
+    assert a is b
+    assert a is not c
+    assert set(manager.stats()) == {"http://example.test", "http://other.test"}
+
+
+def test_client_kwargs_share_one_transport():
+    manager = TransportManager(http2=False)
+    first = manager.client_kwargs("http://localhost:11434")
+    second = manager.client_kwargs("http://localhost:11434")
+    assert first["transport"] is second["transport"]
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(stand_in_server):
+    server = stand_in_server(lambda m, p, b: (200, {"ok": True}))
+    manager = TransportManager(max_connections=4, http2=False)
+    client = manager.client(server.url)
+    for _ in range(3):
+        response = await client.get(f"{server.url}/ping")
+        assert response.status_code == 200
+
+    stats = manager.stats()[server.url]
+    assert stats.requests == 3
+    assert stats.in_flight == 0
+    assert stats.connections == 1
+    assert len(server.connections) == 1
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_engine_binds_agents_to_shared_transport(stand_in_server):
+    server = stand_in_server(_chat_completion)
+    engine = DualEngine(auto_detect=False, transport=TransportManager(http2=False))
+    for name in ("codex", "dispatch"):
+        engine.register_agent(name, CodexAgent(AgentConfig(
+            name=name, provider="openai", api_key="k", base_url=f"{server.url}/v1",
+        )))
+
+    assert await engine._agents["codex"].execute("a") == "pooled"
+    assert await engine._agents["dispatch"].execute("b") == "pooled"
+
+    stats = engine.pool_stats()[f"{server.url}/v1"]
+    assert stats.requests == 2
+    assert len(server.connections) == 1
+    await engine.aclose()
+
+
+def test_ollama_agent_uses_pooled_transport():
+    manager = TransportManager(http2=False)
+    agent = OllamaAgent(AgentConfig(name="ollama", provider="ollama"))
+    agent.bind_transport(manager)
+    client = agent._get_client()
+    assert client._client._transport is manager.client_kwargs("http://localhost:11434")["transport"]